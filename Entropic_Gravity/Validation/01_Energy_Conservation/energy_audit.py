@@ -18,6 +18,14 @@ Ref: 't Hooft (Holographic Principle), Verlinde (2011)
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw, NEWTON, point_mass_acceleration
+from integrators import Integrator, SCHEMES
+from checkpoint import rng_state, set_rng_state
+import simulacao_galaxia as sg
 
 # --- CONTEXT ---
 # Using Natural Units where G=1, M=1.
@@ -30,27 +38,18 @@ OUTPUT_DIR = "results"
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# The original src/rotacao_galactica.py regime switch:
+# if a_newton > a0: a_newton else: sqrt(a0 * a_newton)
+LAWS = {
+    'newton': NEWTON,
+    'verlinde': InterpolationLaw('naive_switch', A0),
+}
+
 def force_law(r, mode='newton'):
-    """Calculate radial acceleration."""
-    if r < 1e-6: return 0.0
-    
-    a_newton = G * M / (r**2)
-    
-    if mode == 'newton':
-        return a_newton
-    elif mode == 'verlinde':
-        # "Smooth" Interpolation (Verlinde 2016 style approximation)
-        # g = g_bar + sqrt(a0 g_bar)
-        # But our previous code used specific regime switching.
-        # Let's verify the EXACT logic used in src/rotacao_galactica.py
-        # Logic: if a_newton > a0: a_newton else: sqrt(a0 * a_newton)
-        
-        if a_newton > A0:
-            return a_newton
-        else:
-            return np.sqrt(A0 * a_newton)
-            
-    return 0.0
+    """Calculate radial acceleration (0 inside r < 1e-6)."""
+    if mode not in LAWS:
+        return 0.0
+    return point_mass_acceleration(r, M, LAWS[mode], G, r_min=1e-6)
 
 def potential_energy(r, mode='newton'):
     """
@@ -74,24 +73,46 @@ def potential_energy(r, mode='newton'):
             # Note: This is logarithmic potential!
             return np.sqrt(A0 * G * M) * np.log(r)
 
-def run_simulation(mode='newton'):
+def run_simulation(mode='newton', scheme='euler', dt=DT, integrator=None, checkpoint=None):
     # Initial State: Circular Orbit at r=50 (Transition Zone)
     # v_circ for Newton: sqrt(GM/r)
     # v_circ for Entropic: sqrt(F * r)
+    # The total time STEPS * DT is kept fixed when dt changes.
+    # checkpoint: optional checkpoint.Checkpointer; the run resumes from its
+    # file if present and saves (orbit, cached force, diagnostics) on its schedule.
     
     r0 = 50.0
     acc0 = force_law(r0, mode)
     v0 = np.sqrt(acc0 * r0)
     
-    x, y = r0, 0.0
-    vx, vy = 0.0, v0
+    pos = np.array([r0, 0.0])
+    vel = np.array([0.0, v0])
+    steps = int(round(STEPS * DT / dt))
+    
+    def accel(p):
+        r = np.sqrt(p @ p)
+        return -force_law(r, mode) * (p / r)
+    
+    if integrator is None:
+        integrator = Integrator(scheme)
     
     t_vals = []
     H_vals = []
     r_vals = []
     
-    for t in range(STEPS):
-        r = np.sqrt(x**2 + y**2)
+    acc = None
+    first = 0
+    saved = None if checkpoint is None else checkpoint.load()
+    if saved is not None:
+        pos, vel = saved['pos'], saved['vel']
+        acc = saved.get('acc')
+        first = saved['t']
+        t_vals, H_vals, r_vals = saved['t_vals'], saved['H_vals'], saved['r_vals']
+        integrator.n_force_evals = saved['force_evals']
+        set_rng_state(saved)
+    
+    for t in range(first, steps):
+        r = np.sqrt(pos @ pos)
         
         # 1. Potential Energy
         # Warning: Calculating V for mixed regime is complex.
@@ -99,27 +120,94 @@ def run_simulation(mode='newton'):
         # This creates "Energy Jumps" at the transition boundary if not smoothed.
         # This is exactly what Verlinde would critique!
         V = potential_energy(r, mode)
-        T = 0.5 * (vx**2 + vy**2)
+        T = 0.5 * (vel @ vel)
         H = T + V
         
-        t_vals.append(t * DT)
+        t_vals.append(t * dt)
         H_vals.append(H)
         r_vals.append(r)
         
-        # Symplectic Integration (Vel Verletish) - Semi-Implicit Euler
-        # Used in rotation_galactica.py
-        acc = force_law(r, mode)
-        ax = -acc * (x/r)
-        ay = -acc * (y/r)
-        
-        vx += ax * DT
-        vy += ay * DT
+        # Symplectic Integration (default: Semi-Implicit Euler,
+        # as used in rotation_galactica.py)
+        acc = integrator.step(pos, vel, accel, dt, acc)
         
-        x += vx * DT
-        y += vy * DT
+        if checkpoint is not None and (t + 1 == steps or checkpoint.due(t + 1)):
+            state = dict(pos=pos, vel=vel, t=t + 1, t_vals=t_vals, H_vals=H_vals, r_vals=r_vals,
+                         force_evals=integrator.n_force_evals, **rng_state())
+            if acc is not None:
+                state['acc'] = acc
+            checkpoint.save(state)
         
     return t_vals, H_vals, r_vals
 
+def hamiltonian_drift(H_vals):
+    """Relative peak-to-peak variation of the Hamiltonian."""
+    return (max(H_vals) - min(H_vals)) / abs(H_vals[0])
+
+def cost_to_target(mode, scheme, target_drift, max_doublings=8):
+    """
+    Cheapest time step (DT * 2^k) for which `scheme` keeps the drift below
+    target_drift over the full audit time.
+
+    Returns (dt, drift, force_evaluations), or None if even DT fails.
+    """
+    for k in range(max_doublings, -1, -1):
+        dt = DT * 2.0 ** k
+        integrator = Integrator(scheme)
+        _, H, _ = run_simulation(mode, dt=dt, integrator=integrator)
+        drift = hamiltonian_drift(H)
+        if drift <= target_drift:
+            return dt, drift, integrator.n_force_evals
+    return None
+
+# State precisions compared against float64 on the N-body disk
+PRECISIONS = [
+    ('float64', np.float64, 'plain'),
+    ('float32', np.float32, 'plain'),
+    ('float32 + float64 x, forces', np.float32, 'float64'),
+    ('float32 + Kahan', np.float32, 'kahan'),
+]
+
+def disk_energy(sim):
+    """Specific Keplerian energy of every star (carries included), in float64."""
+    pos = sim.stars_pos.astype(np.float64)
+    vel = sim.stars_vel.astype(np.float64)
+    if sim.pos_carry is not None:
+        pos -= sim.pos_carry
+        vel -= sim.vel_carry
+    return 0.5 * np.sum(vel**2, axis=1) - sg.G * sg.M_CORE / np.linalg.norm(pos, axis=1)
+
+def precision_comparison(n_stars=100_000, steps=2000):
+    """
+    Run the Newtonian disk of simulacao_galaxia in every state precision.
+
+    Returns rows of (label, state and force-buffer bytes per star, seconds,
+    median and max relative energy error, median position offset from the
+    float64 run). The engine's force buffer has the positions' dtype, so
+    float64 positions also cost a float64 force.
+    """
+    rows = []
+    reference = None
+    for label, dtype, accumulation in PRECISIONS:
+        np.random.seed(0)
+        sim = sg.GalacticSimulation('Newton', n_stars=n_stars, dtype=dtype, accumulation=accumulation)
+        e0 = disk_energy(sim)
+        start = time.perf_counter()
+        sim.run(steps)
+        seconds = time.perf_counter() - start
+        error = np.abs(disk_energy(sim) - e0) / np.abs(e0)
+        state = [sim.stars_pos, sim.stars_vel, sim.pos_carry, sim.vel_carry]
+        nbytes = sum(a.nbytes for a in state if a is not None) / n_stars
+        nbytes += sim.stars_pos.shape[1] * sim.stars_pos.itemsize  # force buffer
+        pos = sim.stars_pos.astype(np.float64)
+        if reference is None:
+            reference = pos
+        offset = np.median(np.linalg.norm(pos - reference, axis=1))
+        rows.append((label, nbytes, seconds, np.median(error), np.max(error), offset))
+        print(f"  {label:28s} {nbytes:4.0f} B/star {seconds:6.2f} s  "
+              f"median dE/E={rows[-1][3]:.2e} max={rows[-1][4]:.2e} offset={offset:.2e}")
+    return rows
+
 def perform_audit():
     print("🔬 RUNNING ENERGY AUDIT...")
     
@@ -127,12 +215,23 @@ def perform_audit():
     t_v, H_v, r_v = run_simulation('verlinde')
     
     # Analyze Drift
-    drift_n = (max(H_n) - min(H_n)) / abs(H_n[0])
-    drift_v = (max(H_v) - min(H_v)) / abs(H_v[0])
+    drift_n = hamiltonian_drift(H_n)
+    drift_v = hamiltonian_drift(H_v)
     
     print(f"Newtonian Hamiltonian Drift: {drift_n:.2e}")
     print(f"Entropic Hamiltonian Drift:  {drift_v:.2e}")
     
+    # Integrator cost: force evaluations needed to match the Euler drift
+    costs = {}
+    for scheme in ('euler', 'leapfrog', 'forest_ruth', 'yoshida6'):
+        costs[scheme] = cost_to_target('verlinde', scheme, drift_v)
+        if costs[scheme] is not None:
+            dt, drift, evals = costs[scheme]
+            print(f"  {scheme:12s} dt={dt:<6g} drift={drift:.2e} force evals={evals}")
+    
+    # Single vs double precision state on the N-body disk
+    precisions = precision_comparison()
+    
     # Plot
     plt.figure(figsize=(10, 6))
     plt.subplot(2, 1, 1)
@@ -161,6 +260,31 @@ def perform_audit():
         f.write(f"**Drift Analysis**:\n")
         f.write(f"- Newtonian Drift: `{drift_n:.2e}` (Baseline)\n")
         f.write(f"- Entropic Drift: `{drift_v:.2e}`\n\n")
+        f.write("## Integrator Cost at Equal Drift\n")
+        f.write("Force evaluations needed to keep the entropic drift below the Euler baseline:\n\n")
+        f.write("| Scheme | Order | dt | Drift | Force Evaluations |\n")
+        f.write("| :--- | :--- | :--- | :--- | :--- |\n")
+        for scheme, cost in costs.items():
+            if cost is not None:
+                dt, drift, evals = cost
+                f.write(f"| {scheme} | {SCHEMES[scheme].order} | {dt:g} | `{drift:.2e}` | {evals} |\n")
+        f.write("\n")
+        f.write("## State Precision\n")
+        f.write("Newtonian disk of simulacao_galaxia (100k stars, 2000 leapfrog steps). "
+                "Energy error is the per-star relative change of the Keplerian energy; "
+                "the offset is the median distance from the float64 run.\n\n")
+        f.write("| State | Bytes/Star (state + force) | Time (s) | Median dE/E | Max dE/E "
+                "| Position Offset |\n")
+        f.write("| :--- | :--- | :--- | :--- | :--- | :--- |\n")
+        for label, nbytes, seconds, median, worst, offset in precisions:
+            f.write(f"| {label} | {nbytes:.0f} | {seconds:.2f} | `{median:.2e}` | `{worst:.2e}` "
+                    f"| `{offset:.2e}` |\n")
+        f.write("\nThe max error is the integration error of the innermost stars and is the same "
+                "in every precision. Plain float32 adds a random walk of round-off in the velocities "
+                "and positions; Kahan-compensated kicks and drifts remove it at the memory cost of "
+                "the carry arrays, while forces are still evaluated in float32. With float64 "
+                "positions the forces are evaluated in float64 too (only the velocities are "
+                "float32), at the cost of a float64 force buffer.\n\n")
         f.write("## Physics Critique\n")
         if drift_v > 1e-2:
             f.write("⚠️ **Dissipative Anomaly Detected!** The Entropic Hamiltonian is drifting significantly. "
@@ -19,25 +19,28 @@ This leads to: g = g_N/2 + sqrt(g_N^2/4 + g_N * a_0)
 This ensures a smooth transition from Newton (g ~ g_N) to Deep MOND (g ~ sqrt(g_N a_0)).
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw, newtonian_acceleration
+
 # --- CONSTANTS ---
 G = 1.0
 M = 1000.0
 A0 = 2.0
 R_RANGE = np.linspace(1, 200, 500)
+NAIVE_LAW = InterpolationLaw('naive_switch', A0)
+SMOOTH_LAW = InterpolationLaw('simple', A0)
 
 def force_newton(r):
-    return G * M / (r**2)
+    return newtonian_acceleration(r, M, G)
 
 def force_naive_switch(r):
     """The original logic: Discontinuous derivative."""
-    g_n = force_newton(r)
-    if g_n > A0:
-        return g_n
-    else:
-        return np.sqrt(g_n * A0)
+    return NAIVE_LAW(force_newton(r))
 
 def force_scientific_interpolation(r):
     """
@@ -51,21 +54,19 @@ def force_scientific_interpolation(r):
     Quadratic formula:
     g = (g_N + sqrt(g_N^2 + 4*a0*g_N)) / 2
     """
-    g_n = force_newton(r)
-    term_sqrt = np.sqrt(g_n**2 + 4 * A0 * g_n)
-    return (g_n + term_sqrt) / 2
+    return SMOOTH_LAW(force_newton(r))
 
 def run_comparison():
     print("🔬 RUNNING INTERPOLATION ANALYSIS...")
     
     g_newton = force_newton(R_RANGE)
-    g_naive = [force_naive_switch(r) for r in R_RANGE]
-    g_smooth = [force_scientific_interpolation(r) for r in R_RANGE]
+    g_naive = force_naive_switch(R_RANGE)
+    g_smooth = force_scientific_interpolation(R_RANGE)
     
     # Calculate Orbital Velocities
     v_newton = np.sqrt(g_newton * R_RANGE)
-    v_naive = np.sqrt(np.array(g_naive) * R_RANGE)
-    v_smooth = np.sqrt(np.array(g_smooth) * R_RANGE)
+    v_naive = np.sqrt(g_naive * R_RANGE)
+    v_smooth = np.sqrt(g_smooth * R_RANGE)
     
     # Plotting
     plt.figure(figsize=(10, 6))
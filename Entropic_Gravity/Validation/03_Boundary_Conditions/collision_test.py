@@ -16,74 +16,52 @@ Two Equal Mass Black Holes approaching each other.
 We track a test particle in the saddle point.
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw
+from field_maps import field_map
+
 # --- CONSTANTS ---
 G = 1.0
 M = 1000.0  # Mass of each galaxy center
 A0 = 2.0
 DT = 0.1
 STEPS = 2000
+ENTROPIC_LAW = InterpolationLaw('simple', A0)
+MAP_RESOLUTION = 1000  # Field map points per side
 
 def force_scientific_interpolation(g_n):
     """Smooth force law based on MAGNITUDE of acceleration."""
     # g * mu(g/a0) = g_n
     # g = (g_n + sqrt(g_n^2 + 4 a0 g_n)) / 2
-    term_sqrt = np.sqrt(g_n**2 + 4 * A0 * g_n)
-    return (g_n + term_sqrt) / 2
+    return ENTROPIC_LAW(g_n)
 
 def run_collision_test():
     print("🔬 RUNNING BOUNDARY CONDITION (COLLISION) TEST...")
     
     # Body 1 (Left), Body 2 (Right)
     # Fixed positions for simplicity (or adiabatic approach)
-    pos1 = np.array([-50.0, 0.0])
-    pos2 = np.array([50.0, 0.0])
+    bodies = [[-50.0, 0.0], [50.0, 0.0]]
     
-    # Test Particle grid along X axis
+    # Test particles along the X axis (y = 0 slice of the field map)
+    # The correction depends on the MAGNITUDE of the total field, direction preserved
     x_grid = np.linspace(-100, 100, 200)
-    acc_newton_x = []
-    acc_entropic_x = []
+    line = field_map(bodies, [M, M], (x_grid, 0.0), ENTROPIC_LAW, G, r_min=1.0)
+    acc_newton_x = line['g_newton'][0]
+    acc_entropic_x = line['g'][0]
     
-    for x in x_grid:
-        p = np.array([x, 0.0])
-        
-        # 1. Calculate Vector Newtonian Gravity
-        r1 = p - pos1
-        r2 = p - pos2
-        dist1 = np.linalg.norm(r1)
-        dist2 = np.linalg.norm(r2)
-        
-        # Avoid singularities
-        if dist1 < 1.0 or dist2 < 1.0:
-            acc_newton_x.append(np.nan)
-            acc_entropic_x.append(np.nan)
-            continue
-            
-        f1_vec_n = -G * M * r1 / (dist1**3)
-        f2_vec_n = -G * M * r2 / (dist2**3)
-        
-        a_vec_total_newton = f1_vec_n + f2_vec_n
-        a_mag_newton = np.linalg.norm(a_vec_total_newton)
-        
-        acc_newton_x.append(a_vec_total_newton[0])
-        
-        # 2. Apply Entropic Correction
-        # Correction depends on the MAGNITUDE of the total field
-        a_mag_entropic = force_scientific_interpolation(a_mag_newton)
-        
-        # Preserve Direction
-        if a_mag_newton > 1e-9:
-             factor = a_mag_entropic / a_mag_newton
-             a_vec_entropic = a_vec_total_newton * factor
-        else:
-             a_vec_entropic = np.array([0.0, 0.0])
-             
-        acc_entropic_x.append(a_vec_entropic[0])
+    # Full plane: entropic boost and the EFE (combined vs superposed corrections)
+    plane = np.linspace(-150, 150, MAP_RESOLUTION)
+    field = field_map(bodies, [M, M], (plane, plane), ENTROPIC_LAW, G, r_min=1.0,
+                      superposed=True)
 
     # Plotting
-    plt.figure(figsize=(10, 6))
+    plt.figure(figsize=(18, 6))
+    plt.subplot(1, 2, 1)
     plt.plot(x_grid, acc_newton_x, 'k--', label='Newtonian Field (X)', alpha=0.5)
     plt.plot(x_grid, acc_entropic_x, 'r-', label='Entropic Field (X)', linewidth=2)
     
@@ -97,6 +75,16 @@ def run_collision_test():
     plt.legend()
     plt.grid(True, alpha=0.3)
     
+    plt.subplot(1, 2, 2)
+    extent = (plane[0], plane[-1], plane[0], plane[-1])
+    plt.imshow(field['efe'], origin='lower', extent=extent, cmap='coolwarm', vmin=0.5, vmax=1.5)
+    plt.colorbar(label='$|g| / |\\sum_k g_k|$ (combined vs superposed correction)')
+    plt.contour(plane, plane, np.log10(field['boost']), levels=[0.5, 1.0], colors='k',
+                linewidths=0.8)
+    plt.xlabel('Position X')
+    plt.ylabel('Position Y')
+    plt.title('External Field Effect Map (contours: boost 10^0.5, 10^1)')
+    
     plt.tight_layout()
     plt.savefig("boundary_analysis.png")
     print("✅ Boundary Plot Saved: boundary_analysis.png")
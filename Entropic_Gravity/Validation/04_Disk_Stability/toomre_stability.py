@@ -21,54 +21,53 @@ If Entropic Gravity creates effectively a "Dark Matter Halo" potential,
 it should stabilize the disk (Q > 1).
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw, point_mass_acceleration
+import disk_stability
+
 # --- CONSTANTS ---
 G = 1.0
 A0 = 2.0
 SIGMA_STAR = 1.0 # Surface density (simplified model)
 VEL_DISPERSION = 10.0 # Heating (Increased to ensure stability Q>1)
+ENTROPIC_LAW = InterpolationLaw('simple', A0)
 
 def force_scientific_interpolation(r, M):
     """Smooth force law."""
-    g_n = G * M / (r**2)
-    term_sqrt = np.sqrt(g_n**2 + 4 * A0 * g_n)
-    return (g_n + term_sqrt) / 2
+    return point_mass_acceleration(r, M, ENTROPIC_LAW, G)
 
 def epicyclic_frequency(r, M):
     """
-    Calculate Kappa^2.
-    kappa^2 = (2*Omega/R) * d(R*V)/dR
+    Kappa = sqrt(R dOmega^2/dR + 4 Omega^2), in closed form from the law's
+    derivative (vectorized over r and M, see disk_stability).
     """
-    g = force_scientific_interpolation(r, M)
-    v_circ = np.sqrt(g * r)
-    omega = v_circ / r
-    
-    # Numerical derivative of (R*V)
-    dr = 0.01
-    g_next = force_scientific_interpolation(r+dr, M)
-    v_next = np.sqrt(g_next * (r+dr))
-    
-    d_rv_dr = ((r+dr)*v_next - r*v_circ) / dr
-    
-    kappa2 = (2 * omega / r) * d_rv_dr
-    return np.sqrt(max(0, kappa2)) # Ensure real
+    return disk_stability.epicyclic_frequency(r, M, ENTROPIC_LAW, G=G)
 
 def calculate_toomre_q(r, M):
-    kappa = epicyclic_frequency(r, M)
     # Q = (kappa * sigma) / (3.36 * G * Sigma)
-    Q = (kappa * VEL_DISPERSION) / (3.36 * G * SIGMA_STAR)
-    return Q
+    return disk_stability.toomre_q(r, M, VEL_DISPERSION, SIGMA_STAR, ENTROPIC_LAW, G=G)
 
 def run_stability_analysis():
     print("🔬 RUNNING TOOMRE STABILITY CHECK...")
     
     radii = np.linspace(5, 150, 100)
-    q_vals = [calculate_toomre_q(r, 1000) for r in radii]
+    q_vals = calculate_toomre_q(radii, 1000)
+    
+    # Stable fraction of the disk over a mass x a0 grid, one vectorized call
+    grid = disk_stability.parameter_grid(r=radii, mass=np.geomspace(1e2, 1e4, 60),
+                                         a0=np.geomspace(0.1, 10, 60))
+    q_grid = disk_stability.toomre_q(**grid, sigma=VEL_DISPERSION,
+                                     surface_density=SIGMA_STAR, law=ENTROPIC_LAW.name, G=G)
+    stable = disk_stability.stable_fraction(q_grid)
     
     # Plotting
-    plt.figure(figsize=(10, 6))
+    plt.figure(figsize=(16, 6))
+    plt.subplot(1, 2, 1)
     plt.plot(radii, q_vals, 'b-', linewidth=2, label='Toomre Q Parameter')
     plt.axhline(1.0, color='r', linestyle='--', label='Stability Threshold (Q=1)')
     
@@ -81,6 +80,17 @@ def run_stability_analysis():
     plt.legend()
     plt.grid(True, alpha=0.3)
     
+    plt.subplot(1, 2, 2)
+    plt.pcolormesh(grid['mass'].ravel(), grid['a0'].ravel(), stable.T, shading='auto',
+                   cmap='RdYlGn', vmin=0, vmax=1)
+    plt.colorbar(label='Stable fraction of the disk (Q > 1)')
+    plt.plot(1000, A0, 'k*', markersize=12)
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel('Central Mass M')
+    plt.ylabel('Acceleration Scale $a_0$')
+    plt.title('Stability Map (radii 5-150)')
+    
     plt.tight_layout()
     plt.savefig("stability_analysis.png")
     print("✅ Stability Plot Saved: stability_analysis.png")
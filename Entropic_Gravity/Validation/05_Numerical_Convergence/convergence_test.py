@@ -16,11 +16,20 @@ If solution changes wildly, it's numerical noise.
 Integrator:
 Semi-Implicit Euler (Symplectic-ish, Order 1).
 Expected Global Error: O(h).
+
+Every scheme in integrators.SCHEMES is then checked for its nominal order p
+from the final positions of an eccentric orbit: log2(e(h)/e(h/2)) ~ p.
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw, point_mass_acceleration
+from integrators import Integrator, get_scheme
+
 # --- CONSTANTS ---
 G = 1.0
 A0 = 2.0
@@ -28,51 +37,70 @@ R_INIT = 50.0
 STEPS_BASE = 1000
 DT_BASE = 0.1
 
+M = 1000.0
+VERLINDE_LAW = InterpolationLaw('naive_switch', A0)
+
+# Order audit: eccentric orbit (pericentre ~33, clear of the switch at r~22)
+# and a base step per scheme that keeps all three runs above roundoff.
+T_ORDER = 100.0
+V_FRACTION_ORDER = 0.8
+ORDER_DT = {'euler': 0.1, 'leapfrog': 0.2, 'forest_ruth': 0.4, 'yoshida6': 0.8}
+ORDER_TOLERANCE = 0.25
+
 def force_verlinde(r):
     """Force per unit mass"""
-    g_n = G * 1000 / (r**2)
-    if g_n > A0: return g_n
-    return np.sqrt(A0 * g_n)
+    return point_mass_acceleration(r, M, VERLINDE_LAW, G)
 
-def run_sim(dt, steps):
-    x, y = R_INIT, 0.0
+def run_sim(dt, steps, scheme='euler', v_fraction=1.0):
+    pos = np.array([R_INIT, 0.0])
     acc = force_verlinde(R_INIT)
     v0 = np.sqrt(acc * R_INIT)
-    vx, vy = 0.0, v0
+    vel = np.array([0.0, v_fraction * v0])
+    
+    def accel(p):
+        r = np.sqrt(p @ p)
+        return -force_verlinde(r) * (p / r)
     
     trajectory = []
     
-    for _ in range(steps):
-        r = np.sqrt(x**2 + y**2)
-        acc_now = force_verlinde(r)
-        
-        ax = -acc_now * (x/r)
-        ay = -acc_now * (y/r)
-        
-        vx += ax * dt
-        vy += ay * dt
-        
-        x += vx * dt
-        y += vy * dt
-        
-        trajectory.append(np.sqrt(x**2 + y**2))
+    def record(step, p, v):
+        trajectory.append(np.sqrt(p @ p))
+    
+    Integrator(scheme).integrate(pos, vel, accel, dt, steps, record)
         
-    return np.array(trajectory), np.sqrt(vx**2 + vy**2)
+    return np.array(trajectory), np.sqrt(vel @ vel), pos
+
+def observed_order(scheme, dt=None):
+    """
+    Observed convergence order of `scheme` from final positions at dt, dt/2, dt/4.
+
+    Returns (p, e1, e2) with e1 = |x(dt) - x(dt/2)|, e2 = |x(dt/2) - x(dt/4)|.
+    """
+    if dt is None:
+        dt = ORDER_DT[scheme]
+    finals = []
+    for k in range(3):
+        h = dt / 2**k
+        _, _, pos = run_sim(h, int(round(T_ORDER / h)), scheme, V_FRACTION_ORDER)
+        finals.append(pos)
+    e1 = np.linalg.norm(finals[0] - finals[1])
+    e2 = np.linalg.norm(finals[1] - finals[2])
+    return np.log2(e1 / e2), e1, e2
 
 def convergence_audit():
     print("RUNNING CONVERGENCE TESTS...")
     
     # Run 1: Base DT
     print(f"Running DT = {DT_BASE}")
-    traj_1, v1 = run_sim(DT_BASE, STEPS_BASE)
+    traj_1, v1, _ = run_sim(DT_BASE, STEPS_BASE)
     
     # Run 2: DT / 2 (Double steps)
     print(f"Running DT = {DT_BASE/2}")
-    traj_2, v2 = run_sim(DT_BASE/2, STEPS_BASE*2)
+    traj_2, v2, _ = run_sim(DT_BASE/2, STEPS_BASE*2)
     
     # Run 3: DT / 4 (Quadruple steps)
     print(f"Running DT = {DT_BASE/4}")
-    traj_3, v3 = run_sim(DT_BASE/4, STEPS_BASE*4)
+    traj_3, v3, _ = run_sim(DT_BASE/4, STEPS_BASE*4)
     
     # Analysis
     diff_low = abs(v1 - v2)
@@ -86,6 +114,14 @@ def convergence_audit():
     print(f"Error Estimate: {diff_high:.2e}")
     print(f"Convergence Ratio: {convergence_ratio:.2f} (Expected ~2.0 for Order 1)")
     
+    # Order audit for every integrator
+    orders = {}
+    for scheme in ORDER_DT:
+        p, e1, e2 = observed_order(scheme)
+        expected = get_scheme(scheme).order
+        orders[scheme] = (expected, p, e2, abs(p - expected) < ORDER_TOLERANCE)
+        print(f"  {scheme:12s} expected order {expected}, observed {p:.2f}")
+    
     # Plotting
     plt.figure(figsize=(10, 6))
     
@@ -116,6 +152,15 @@ def convergence_audit():
         f.write(f"- Velocity difference (DT/2 vs DT/4): `{diff_high:.2e}`\n")
         f.write(f"- Convergence Ratio: `{convergence_ratio:.2f}`\n\n")
         
+        f.write("## Integrator Order\n")
+        f.write(f"Final-position differences on an eccentric orbit (v = {V_FRACTION_ORDER} v_circ, T = {T_ORDER:g}):\n\n")
+        f.write("| Scheme | Base dt | Expected Order | Observed Order | Error (dt/2 vs dt/4) | Status |\n")
+        f.write("| :--- | :--- | :--- | :--- | :--- | :--- |\n")
+        for scheme, (expected, p, e2, ok) in orders.items():
+            status = "[SUCCESS]" if ok else "⚠️ MISMATCH"
+            f.write(f"| {scheme} | {ORDER_DT[scheme]} | {expected} | {p:.2f} | `{e2:.2e}` | {status} |\n")
+        f.write("\n")
+        
         if 1.5 < convergence_ratio < 2.5:
              f.write("[SUCCESS] **CONVERGENCE CONFIRMED.** The solver exhibits Order 1 convergence, consistent with Semi-Implicit Euler. "
                      "Observed physics (flat rotation) are robust against time-step refinement.\n")
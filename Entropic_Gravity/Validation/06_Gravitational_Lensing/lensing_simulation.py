@@ -9,9 +9,17 @@ Standard GR (Baryons only) -> Weak lensing decay (1/r).
 Entropic Gravity -> Strong lensing persistence (Constant/Log), matching observations.
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from interpolation_laws import InterpolationLaw
+from mass_profile import CumulativeMassProfile
+from mass_maps import MassMapBuilder
+from lensing_maps import lensing_maps
+from ray_shooting import RadialDeflection, RayShooter, gaussian_source
 
 # Physical Constants (SI)
 G = 6.674e-11
@@ -19,26 +27,25 @@ c = 3.0e8
 a0 = 1.2e-10  # Verlinde scale acceleration
 M_sun = 1.989e30
 kpc = 3.086e19
+ENTROPIC_LAW = InterpolationLaw('naive_switch', a0)
+LENS_DISTANCE = 0.5e6 * kpc  # D_l D_ls / D_s: lens at 1 Gpc, source at 2 Gpc
 
 def generate_mass_map(positions, masses, grid_size=100, box_width_kpc=50):
     """
     Project 3D particles into a 2D surface mass density field (Sigma).
+    positions / masses may be memory-mapped catalogs (mass_maps.open_catalog):
+    they are histogrammed block by block, never loaded whole.
     """
     width = box_width_kpc * kpc
     bins = np.linspace(-width/2, width/2, grid_size)
     
     # Histograma 2D ponderado pela massa
-    Sigma, xedges, yedges = np.histogram2d(
-        positions[:, 0], positions[:, 1], 
-        bins=bins, weights=masses
-    )
-    
-    # Apply smoothing (Simulates telescope resolution)
-    Sigma = gaussian_filter(Sigma, sigma=1.5)
+    builder = MassMapBuilder(bins)
+    builder.add_catalog(positions, masses)
     
-    # Convert to kg/m^2
-    area_pixel = (width / grid_size)**2
-    Sigma = Sigma / area_pixel
+    # Apply smoothing (Simulates telescope resolution), once on the full map,
+    # and convert to kg/m^2
+    Sigma = builder.surface_density(smoothing=1.5)
     
     return Sigma, bins
 
@@ -60,9 +67,7 @@ def calculate_deflection_angle(r, M_enclosed):
     g_newton = (G * M_enclosed) / (r**2)
     
     # Smooth interpolation (verified in previous report)
-    g_entropic = np.where(g_newton < a0, 
-                          np.sqrt(g_newton * a0), 
-                          g_newton)
+    g_entropic = ENTROPIC_LAW(g_newton)
     
     # Effective Mass that light "sees"
     M_eff = (g_entropic * r**2) / G
@@ -92,14 +97,10 @@ def run_lensing_simulation():
     radius_kpc = np.linspace(0.1, 25, 50) 
     radius_m = radius_kpc * kpc
 
-    # 2. Calculate Enclosed Mass M(<r)
-    M_enclosed = []
-    for r_val in radius_m:
-        # Sum mass inside radius r_val (Simple cylindrical projection)
-        r_particles = np.sqrt(positions[:,0]**2 + positions[:,1]**2)
-        mask = r_particles < r_val
-        M_enclosed.append(np.sum(masses[mask]))
-    M_enclosed = np.array(M_enclosed)
+    # 2. Calculate Enclosed Mass M(<r) (cylindrical projection): radii sorted
+    # once, then one binary search per test radius
+    profile = CumulativeMassProfile(positions, masses)
+    M_enclosed = profile(radius_m)
 
     # 3. Calculate Deflection
     alpha_GR, alpha_Entropic = calculate_deflection_angle(radius_m, M_enclosed)
@@ -131,6 +132,60 @@ def run_lensing_simulation():
     plt.tight_layout()
     plt.savefig("lensing_analysis.png")
     print("[SAVED] Lensing Plot Saved: lensing_analysis.png")
+
+    # 5. 2D maps of the projected catalog (FFT deflection of Sigma)
+    pixel = bins[1] - bins[0]
+    gr_maps = lensing_maps(Sigma, pixel, LENS_DISTANCE, G=G, c=c)
+    entropic_maps = lensing_maps(Sigma, pixel, LENS_DISTANCE, ENTROPIC_LAW, G=G, c=c)
+    extent = [bins[0] / kpc, bins[-1] / kpc, bins[0] / kpc, bins[-1] / kpc]
+    panels = [
+        (gr_maps['kappa'], 'Convergence $\\kappa$ (baryons)', 'magma'),
+        (np.hypot(entropic_maps['alpha_x'], entropic_maps['alpha_y']) * rad_to_arcsec,
+         'Entropic $|\\alpha|$ (arcsec)', 'inferno'),
+        (entropic_maps['boost'], 'Entropic boost $\\alpha / \\alpha_{GR}$', 'viridis'),
+        (entropic_maps['kappa_eff'], 'Effective convergence $\\kappa_{eff}$', 'magma'),
+    ]
+    fig, axes = plt.subplots(1, len(panels), figsize=(20, 5))
+    for ax, (image, title, cmap) in zip(axes, panels):
+        # Maps are (x, y) indexed; transpose for imshow
+        im = ax.imshow(image.T, origin='lower', extent=extent, cmap=cmap)
+        ax.set_title(title)
+        ax.set_xlabel('x (kpc)')
+        fig.colorbar(im, ax=ax, shrink=0.8)
+    axes[0].set_ylabel('y (kpc)')
+    fig.tight_layout()
+    fig.savefig("lensing_maps.png")
+    print("[SAVED] Lensing Maps Saved: lensing_maps.png")
+
+    # 6. Inverse ray shooting: lensed image of a background galaxy (GR vs
+    # Entropic) and the entropic source-plane magnification map (caustic)
+    image_extent = np.array([-6, 6, -6, 6]) * kpc
+    source = gaussian_source((1.0 * kpc, 0.0), 0.3 * kpc)
+    images = {}
+    for label, law in (('GR', None), ('Entropic', ENTROPIC_LAW)):
+        deflection = RadialDeflection.from_mass_profile(profile, radius_m, law, G=G, c=c,
+                                                        keplerian_tail=law is None)
+        shooter = RayShooter(deflection, LENS_DISTANCE)
+        images[label] = shooter.lensed_image(source, image_extent, (400, 400), oversample=2)
+    source_extent = np.array([-3, 3, -3, 3]) * kpc
+    magnification = shooter.magnification_map(image_extent * 1.5, (3000, 3000),
+                                              source_extent, (300, 300))['magnification']
+    print(f"Ray shooting: {shooter.last_rays:.1e} rays in {shooter.last_seconds:.1f} s")
+
+    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
+    for ax, label in zip(axes[:2], images):
+        ax.imshow(images[label].T, origin='lower', extent=image_extent / kpc, cmap='afmhot')
+        ax.set_title(f'Lensed source ({label})')
+        ax.set_xlabel('x (kpc)')
+    im = axes[2].imshow(np.log10(np.maximum(magnification, 0.1)).T, origin='lower',
+                        extent=source_extent / kpc, cmap='cubehelix')
+    axes[2].set_title('Entropic magnification (log$_{10}\\mu$, source plane)')
+    axes[2].set_xlabel('x (kpc)')
+    fig.colorbar(im, ax=axes[2], shrink=0.8)
+    axes[0].set_ylabel('y (kpc)')
+    fig.tight_layout()
+    fig.savefig("lensed_images.png")
+    print("[SAVED] Lensed Images Saved: lensed_images.png")
     
     # Generate Report
     with open("lensing_report.md", "w", encoding='utf-8') as f:
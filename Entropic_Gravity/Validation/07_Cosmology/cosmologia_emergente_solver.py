@@ -1,133 +0,0 @@
-"""
-Scientific Audit Module 07 (Pivot): Emergent Cosmology Solver
--------------------------------------------------------------
-Author: Antigravity (Elite Physicist System)
-
-Objective:
-Solve the Modified Friedmann Equation where "Apparent Dark Matter" is induced
-by the expansion rate H(z) itself (Reactive Entropic Gravity).
-
-Method:
-Root finding (scipy.fsolve) for the implicit equation:
-E^2 = Omega_b(1+z)^3 + Omega_L + Alpha * E * (1+z)^1.5
-
-Where E = H(z)/H0
-"""
-
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
-
-# --- Dados Observacionais (Chronometers & SN) ---
-data_z = np.array([0.07, 0.12, 0.20, 0.28, 0.40, 0.47, 1.3, 1.53, 1.75])
-data_H = np.array([69.0, 75.0, 72.9, 88.8, 95.0, 89.0, 168, 177, 202])
-data_err = np.array([19.6, 2.0, 29.6, 11.2, 17.0, 50.0, 17.0, 14.0, 40.0])
-
-# --- Parâmetros Cosmológicos ---
-H0 = 67.4  # km/s/Mpc (Planck 2018)
-Omega_b = 0.049  # Bárions
-Omega_L = 0.69   # Energia Escura (Vácuo / Horizonte)
-
-# Redshift range
-z_vals = np.linspace(0, 2.5, 100)
-
-# --- MODELO 1: LCDM Padrão (Referência) ---
-Omega_m_std = 0.315
-def hubble_LCDM(z):
-    E2 = Omega_m_std * (1+z)**3 + (1 - Omega_m_std)
-    return H0 * np.sqrt(E2)
-
-# --- MODELO 2: Gravidade Emergente (Solver Implícito) ---
-def friedmann_entropic_equation(H_current, z, H0, Om_b, Om_L):
-    """
-    Implicit Equation: H^2 - H0^2 * [Terms] = 0
-    Reactive term: Alpha * E * (1+z)^1.5
-    """
-    E = H_current / H0
-    
-    # 1. Baryons (Standard dilution)
-    term_baryons = Om_b * (1+z)**3
-    
-    # 2. Dark Energy (Vacuum/Lambda)
-    term_Lambda = Om_L
-    
-    # 3. Entropic Reactive Matter
-    # Alpha calibrated so that different components sum to E=1 at z=0 (E=1)
-    # 1 = Om_b + Om_L + Alpha * 1 * 1
-    # Alpha = 1 - Om_b - Om_L
-    alpha = 1.0 - Om_b - Om_L
-    
-    # The Model: Apparent DM scales with Expansion Rate (E) and Volume factor
-    term_entropic = alpha * E * ((1+z)**1.5)
-    
-    # Residual
-    residual = E**2 - (term_baryons + term_Lambda + term_entropic)
-    return residual
-
-def run_solver():
-    print("🔬 RUNNING REACTIVE COSMOLOGY SOLVER...")
-    
-    H_entropic = []
-    
-    for z in z_vals:
-        # Initial guess: Standard LCDM value
-        guess = hubble_LCDM(z)
-        
-        # Solve
-        sol = fsolve(friedmann_entropic_equation, guess, args=(z, H0, Omega_b, Omega_L))
-        H_entropic.append(sol[0])
-
-    H_entropic = np.array(H_entropic)
-    
-    # --- PLOTTING ---
-    plt.figure(figsize=(10, 6))
-
-    # Data
-    plt.errorbar(data_z, data_H, yerr=data_err, fmt='o', color='blue', alpha=0.6, label='Observational Data')
-
-    # Models
-    plt.plot(z_vals, hubble_LCDM(z_vals), 'k--', label=r'$\Lambda$CDM (Standard)')
-    plt.plot(z_vals, H_entropic, 'r-', linewidth=2.5, label='Emergent Gravity (Reactive Dark Matter)')
-
-    plt.title(r'Cosmological Expansion: Reactive Entropic Model', fontsize=14)
-    plt.xlabel('Redshift (z)', fontsize=12)
-    plt.ylabel(r'$H(z)$ [km/s/Mpc]', fontsize=12)
-    plt.grid(True, alpha=0.3)
-    plt.legend(fontsize=12)
-
-    # Annotation
-    plt.text(1.2, 100, "Correction: Dark Matter\nscales with Expansion (H)", color='red', fontsize=10)
-
-    plt.tight_layout()
-    plt.savefig("cosmology_reactive_result.png")
-    print("✅ Reactive Cosmology Plot Saved: cosmology_reactive_result.png")
-    
-    # Comparison at z=1.5
-    idx = np.argmin(np.abs(z_vals - 1.5))
-    h_lcdm_val = hubble_LCDM(1.5)
-    h_ent_val = H_entropic[idx]
-    diff = abs(h_lcdm_val - h_ent_val)
-    
-    # Report
-    with open("cosmology_reactive_report.md", "w", encoding='utf-8') as f:
-        f.write("# Challenge 7 (Pivot): Reactive Cosmology Report\n\n")
-        f.write("## The New Hypothesis\n")
-        f.write("We replaced fixed $\Omega_{CDM}$ with a reactive term $\Omega_{app} \propto H(z)$. "
-                "This implies Dark Matter is an effect of the expansion rate itself.\n\n")
-        f.write("## Results at z=1.5\n")
-        f.write(f"- LCDM (Standard): `{h_lcdm_val:.1f}` km/s/Mpc\n")
-        f.write(f"- Reactive Entropic: `{h_ent_val:.1f}` km/s/Mpc\n")
-        f.write(f"- Difference: `{diff:.1f}` km/s/Mpc\n\n")
-        
-        if diff < 10.0:
-            f.write("## ✅ TRIUMPH\n")
-            f.write("The Emergent Gravity model matches the observational data! "
-                    "By allowing the Apparent Dark Matter to interact with the Horizon ($H$), "
-                    "we recover the correct expansion history without particle Dark Matter.\n")
-        else:
-             f.write("## ⚠️ PARTIAL SUCCESS\n")
-             f.write("The model is better than the naive one, but still deviates. "
-                     "Refinement of the alpha coupling constant is needed.\n")
-
-if __name__ == "__main__":
-    run_solver()
@@ -1,22 +1,28 @@
 """
-Scientific Audit Module 07 (Pivot): Emergent Cosmology Solver
--------------------------------------------------------------
+Scientific Audit Module 07: Cosmological Expansion and Emergent Cosmology Solver
+-------------------------------------------------------------------------------
 Author: Antigravity (Elite Physicist System)
 
 Objective:
-Solve the Modified Friedmann Equation where "Apparent Dark Matter" is induced
-by the expansion rate H(z) itself (Reactive Entropic Gravity).
+1. Naive test: Friedmann equation with baryons only (Omega_b instead of Omega_m).
+2. Pivot: Solve the Modified Friedmann Equation where "Apparent Dark Matter"
+   is induced by the expansion rate H(z) itself (Reactive Entropic Gravity).
 
 Method:
-Root finding (scipy.fsolve) for the implicit equation:
+The implicit equation
 E^2 = Omega_b(1+z)^3 + Omega_L + Alpha * E * (1+z)^1.5
 
-Where E = H(z)/H0
+Where E = H(z)/H0, is a quadratic in E: its positive root is evaluated in
+closed form on the whole redshift array (src/cosmology.py).
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from cosmology import hubble_lcdm, hubble_reactive
 
 # --- Observational Data (Chronometers & SN) ---
 data_z = np.array([0.07, 0.12, 0.20, 0.28, 0.40, 0.47, 1.3, 1.53, 1.75])
@@ -34,50 +40,75 @@ z_vals = np.linspace(0, 2.5, 100)
 # --- MODEL 1: Standard LCDM (Reference) ---
 Omega_m_std = 0.315
 def hubble_LCDM(z):
-    E2 = Omega_m_std * (1+z)**3 + (1 - Omega_m_std)
-    return H0 * np.sqrt(E2)
+    return hubble_lcdm(z, H0, Omega_m_std)
+
+# --- MODEL 2: Naive Entropic (Baryons Only) ---
+def hubble_naive(z):
+    """
+    User hypothesis: H^2 ~ H0^2 [ Omega_b(1+z)^3 + (1-Omega_b) ]
+    """
+    return hubble_lcdm(z, H0, Omega_b)
 
-# --- MODEL 2: Emergent Gravity (Implicit Solver) ---
-def friedmann_entropic_equation(H_current, z, H0, Om_b, Om_L):
+# --- MODEL 3: Emergent Gravity (Reactive Dark Matter) ---
+def hubble_entropic(z):
     """
-    Implicit Equation: H^2 - H0^2 * [Terms] = 0
-    Reactive term: Alpha * E * (1+z)^1.5
+    Reactive term: Alpha * E * (1+z)^1.5, with Alpha = 1 - Om_b - Om_L
+    calibrated so that the components sum to E=1 at z=0.
+    The Model: Apparent Dark Matter scales with Expansion Rate (E) and Volume factor
     """
-    E = H_current / H0
+    return hubble_reactive(z, H0, omega_b=Omega_b, omega_l=Omega_L)
+
+def run_cosmology_test():
+    print("RUNNING COSMOLOGY EXPANSION TEST...")
     
-    # 1. Baryons (Standard dilution)
-    term_baryons = Om_b * (1+z)**3
+    H_lcdm = hubble_LCDM(z_vals)
+    H_ent = hubble_naive(z_vals)
+
+    # Plot
+    plt.figure(figsize=(10, 6))
+    plt.plot(z_vals, H_lcdm, 'k--', label=r'$\Lambda$CDM (Standard - Has Dark Matter)')
+    plt.plot(z_vals, H_ent, 'r-', linewidth=2, label='Entropic Cosmology (Baryons Only)')
+    plt.errorbar(data_z, data_H, yerr=data_err, fmt='o', color='blue', label='Data', alpha=0.6)
     
-    # 2. Dark Energy (Vacuum/Lambda)
-    term_Lambda = Om_L
+    plt.xlabel('Redshift (z)')
+    plt.ylabel('H(z) [km/s/Mpc]')
+    plt.title('Expansion History: The Final Test')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
     
-    # 3. Entropic Reactive Matter
-    # Alpha calibrated so that different components sum to E=1 at z=0 (E=1)
-    # 1 = Om_b + Om_L + Alpha * 1 * 1
-    # Alpha = 1 - Om_b - Om_L
-    alpha = 1.0 - Om_b - Om_L
+    plt.tight_layout()
+    plt.savefig("cosmology_analysis.png")
+    print("[SAVED] Cosmology Plot Saved: cosmology_analysis.png")
     
-    # The Model: Apparent Dark Matter scales with Expansion Rate (E) and Volume factor
-    term_entropic = alpha * E * ((1+z)**1.5)
+    # Calculate Discrepancy at z=1.5
+    idx = np.argmin(np.abs(z_vals - 1.5))
+    diff = H_lcdm[idx] - H_ent[idx]
     
-    # Residual
-    residual = E**2 - (term_baryons + term_Lambda + term_entropic)
-    return residual
+    with open("cosmology_report.md", "w", encoding='utf-8') as f:
+        f.write("# Challenge 7: Cosmological Expansion (The Boss Battle)\n\n")
+        f.write("## Hypothesis Test\n")
+        f.write("We tested the Entropic universe using **only Baryons** ($\\Omega_b = 0.049$) against the Standard Model ($\\Omega_m = 0.315$).\n\n")
+        f.write("## Results\n")
+        f.write(f"- At z=1.5, H_LCDM = `{H_lcdm[idx]:.1f}`\n")
+        f.write(f"- At z=1.5, H_Entropic = `{H_ent[idx]:.1f}`\n")
+        f.write(f"- Discrepancy: `{diff:.1f}` km/s/Mpc\n\n")
+        
+        if diff > 20:
+            f.write("## [FAIL] CRITICAL FAILURE\n")
+            f.write("The Naive Entropic model **fails** to reproduce the expansion history. Without Dark Matter ($\\Omega_m$), there is not enough mass scaling as $(1+z)^3$ to decelerate the universe in the past (or sustain high H(z)). The curve is too flat.\n\n")
+            f.write("### Scientific Implications\n")
+            f.write("1. **Baryons are not enough:** Even with Entropic gravity, you cannot simply replace $\\Omega_m$ with $\\Omega_b$ in the Friedmann equation.\n")
+            f.write("2. **Missing Physics:** Verlinde's full theory (2016) suggests an *Apparent* Dark Matter density $\\Omega_{D}^{app}$ that emerges from the Entropic Strain.\n")
+            f.write("3. **Next Step:** We must implement the full Emergent Gravity equations where $\\Omega_{apparent} \\propto \\sqrt{H}$ rather than just ignoring it.\n")
+        else:
+            f.write("## [SUCCESS] SUCCESS\n")
+            f.write("The expansion history matches!\n")
 
 def run_solver():
     print("RUNNING REACTIVE COSMOLOGY SOLVER...")
     
-    H_entropic = []
-    
-    for z in z_vals:
-        # Initial guess: Standard LCDM value
-        guess = hubble_LCDM(z)
-        
-        # Solve
-        sol = fsolve(friedmann_entropic_equation, guess, args=(z, H0, Omega_b, Omega_L))
-        H_entropic.append(sol[0])
-
-    H_entropic = np.array(H_entropic)
+    # Closed-form root on the whole redshift array
+    H_entropic = hubble_entropic(z_vals)
     
     # --- PLOTTING ---
     plt.figure(figsize=(10, 6))
@@ -98,7 +129,6 @@ def run_solver():
     # Annotation
     plt.text(1.2, 100, "Correction: Dark Matter\nscales with Expansion (H)", color='red', fontsize=10)
 
-    plt.tight_layout()
     plt.tight_layout()
     plt.savefig("cosmology_reactive_result.png")
     print("[SAVED] Reactive Cosmology Plot Saved: cosmology_reactive_result.png")
@@ -131,4 +161,5 @@ def run_solver():
                      "Refinement of the alpha coupling constant is needed.\n")
 
 if __name__ == "__main__":
+    run_cosmology_test()
     run_solver()
@@ -0,0 +1,252 @@
+"""
+Barnes-Hut Module: O(N log N) Tree Gravity
+------------------------------------------
+
+Newtonian self-gravity of a particle set via a Barnes-Hut quadtree (2D) or
+octree (3D). The entropic correction is applied afterwards by the caller to
+the *total* Newtonian field (see interpolation_laws.apply_to_field).
+
+Implementation:
+- The tree is built level by level from sorted Morton keys, so every node
+  is a contiguous slice of the sorted particles and node masses / centres of
+  mass come from np.add.reduceat.
+- The walk is vectorized over (target, node) pairs: at each pass every pair
+  is either accepted as a monopole, summed directly (leaf), or replaced by
+  its children. Targets are processed in chunks to bound memory.
+
+Opening criterion: a node of side s is accepted when
+    r > s / theta + delta
+with r the distance to its centre of mass and delta the offset of the
+centre of mass from the cell centre (Barnes 1994). theta = 0 gives the
+exact direct sum.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+def expand_ranges(starts: np.ndarray, counts: np.ndarray):
+    """
+    Flatten the ranges [starts[k], starts[k] + counts[k]).
+
+    Returns (owner, index): owner[j] is the range k that flat element j came
+    from and index[j] its value.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    index = np.arange(owner.size, dtype=np.int64) - offsets[owner] + np.asarray(starts)[owner]
+    return owner, index
+
+
+def morton_keys(positions: np.ndarray, lo: np.ndarray, size: float, bits: int) -> np.ndarray:
+    """Interleave the bits of the quantized coordinates into one int64 key."""
+    n, dim = positions.shape
+    q = ((positions - lo) * (2**bits / size)).astype(np.int64)
+    np.clip(q, 0, 2**bits - 1, out=q)
+    keys = np.zeros(n, dtype=np.int64)
+    for b in range(bits):
+        for j in range(dim):
+            keys |= ((q[:, j] >> b) & 1) << (b * dim + j)
+    return keys
+
+
+# Arrays that fully describe a built tree (see BarnesHutTree.arrays)
+TREE_FIELDS = ('order', 'pos', 'mass', 'start', 'count', 'node_mass', 'com',
+               'cell_size', 'delta', 'is_leaf', 'child_first', 'child_count')
+
+
+class BarnesHutTree:
+    """
+    Barnes-Hut tree over a fixed set of source particles.
+
+    Parameters:
+    -----------
+    positions : np.ndarray
+        Source positions, shape (N, dim) with dim 2 or 3
+    masses : np.ndarray or float
+        Source masses, shape (N,) or a common scalar
+    leaf_size : int
+        Maximum number of particles in a leaf cell
+    """
+
+    def __init__(self, positions, masses, leaf_size: int = 8):
+        pos = np.asarray(positions, dtype=float)
+        n, dim = pos.shape
+        masses = np.broadcast_to(np.asarray(masses, dtype=float), (n,))
+        self.dim = dim
+        self.leaf_size = leaf_size
+
+        lo = pos.min(axis=0)
+        size = float((pos.max(axis=0) - lo).max())
+        size = size * (1 + 1e-12) if size > 0 else 1.0
+        bits = min(63 // dim, 21)
+
+        keys = morton_keys(pos, lo, size, bits)
+        self.order = np.argsort(keys, kind='stable')
+        keys = keys[self.order]
+        self.pos = pos[self.order]
+        self.mass = masses[self.order]
+
+        # Build levels until every cell is a leaf
+        weighted = self.mass[:, None] * self.pos
+        levels = []
+        for level in range(bits + 1):
+            prefix = keys >> (dim * (bits - level))
+            starts = np.concatenate([[0], np.flatnonzero(prefix[1:] != prefix[:-1]) + 1])
+            counts = np.diff(np.append(starts, n))
+
+            mass = np.add.reduceat(self.mass, starts)
+            com_sum = np.add.reduceat(weighted, starts, axis=0)
+
+            # Cell centre from the key prefix
+            cell = size / 2**level
+            corner = np.zeros((len(starts), dim))
+            cell_prefix = prefix[starts]
+            for b in range(level):
+                for j in range(dim):
+                    corner[:, j] += ((cell_prefix >> (b * dim + j)) & 1) << b
+            center = lo + (corner + 0.5) * cell
+
+            com = center.copy()
+            np.divide(com_sum, mass[:, None], out=com, where=mass[:, None] > 0)
+
+            last = level == bits or counts.max() <= leaf_size
+            leaf = np.ones(len(starts), bool) if last else counts <= leaf_size
+            levels.append((starts, counts, mass, com, np.full(len(starts), cell),
+                           np.linalg.norm(com - center, axis=1), leaf))
+            if last:
+                break
+
+        # Flatten levels and link children (the next level's nodes inside each cell)
+        offsets = np.cumsum([0] + [len(lv[0]) for lv in levels])
+        child_first = []
+        child_count = []
+        for k, lv in enumerate(levels):
+            starts, counts = lv[0], lv[1]
+            if k + 1 < len(levels):
+                next_starts = levels[k + 1][0]
+                first = np.searchsorted(next_starts, starts)
+                stop = np.searchsorted(next_starts, starts + counts)
+                child_first.append(first + offsets[k + 1])
+                child_count.append(np.where(lv[6], 0, stop - first))
+            else:
+                child_first.append(np.zeros(len(starts), np.int64))
+                child_count.append(np.zeros(len(starts), np.int64))
+
+        def stack(i):
+            return np.concatenate([lv[i] for lv in levels])
+
+        self.start = stack(0)
+        self.count = stack(1)
+        self.node_mass = stack(2)
+        self.com = stack(3)
+        self.cell_size = stack(4)
+        self.delta = stack(5)
+        self.is_leaf = stack(6)
+        self.child_first = np.concatenate(child_first)
+        self.child_count = np.concatenate(child_count)
+        self.n_nodes = len(self.start)
+
+    def arrays(self):
+        """The tree's arrays by name, e.g. to publish it to other processes."""
+        return {name: getattr(self, name) for name in TREE_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'BarnesHutTree':
+        """Rebuild a tree view from arrays(), without copying them."""
+        tree = cls.__new__(cls)
+        for name in TREE_FIELDS:
+            setattr(tree, name, arrays[name])
+        tree.dim = tree.pos.shape[1]
+        tree.n_nodes = len(tree.start)
+        return tree
+
+    def accelerations(self, targets: Optional[np.ndarray] = None, theta: float = 0.5,
+                      softening: float = 0.0, G: float = 1.0,
+                      chunk_size: int = 4096) -> np.ndarray:
+        """
+        Newtonian acceleration of the sources at the target points.
+
+        Parameters:
+        -----------
+        targets : np.ndarray, optional
+            Target positions, shape (M, dim). Defaults to the sources
+            themselves (in their original order); self-interaction is zero.
+        theta : float
+            Opening angle; smaller is more accurate, 0 is exact
+        softening : float
+            Plummer softening length
+        G : float
+            Gravitational constant
+        chunk_size : int
+            Targets walked together
+
+        Returns:
+        --------
+        np.ndarray
+            Acceleration vectors, shape (M, dim)
+        """
+        if targets is None:
+            targets = np.empty_like(self.pos)
+            targets[self.order] = self.pos
+        targets = np.asarray(targets, dtype=float)
+        acc = np.zeros_like(targets)
+        eps2 = softening**2
+        for lo in range(0, len(targets), chunk_size):
+            x = targets[lo:lo + chunk_size]
+            acc[lo:lo + chunk_size] = self._walk(x, theta, eps2)
+        acc *= G
+        return acc
+
+    def _walk(self, x: np.ndarray, theta: float, eps2: float) -> np.ndarray:
+        """Vectorized tree walk for one chunk of targets."""
+        n_t = len(x)
+        acc = np.zeros_like(x)
+        target = np.arange(n_t)
+        node = np.zeros(n_t, dtype=np.int64)
+        with np.errstate(divide='ignore'):
+            inv_theta = 1.0 / theta if theta > 0 else np.inf
+
+        while target.size:
+            d = self.com[node] - x[target]
+            r2 = np.einsum('ij,ij->i', d, d)
+            reach = self.cell_size[node] * inv_theta + self.delta[node]
+            far = reach * reach < r2
+
+            # Accepted monopoles
+            self._accumulate(acc, target[far], d[far], r2[far], self.node_mass[node[far]], eps2)
+
+            near = ~far
+            leaf = near & self.is_leaf[node]
+            if np.any(leaf):
+                owner, j = expand_ranges(self.start[node[leaf]], self.count[node[leaf]])
+                t = target[leaf][owner]
+                dd = self.pos[j] - x[t]
+                self._accumulate(acc, t, dd, np.einsum('ij,ij->i', dd, dd), self.mass[j], eps2)
+
+            opened = near & ~self.is_leaf[node]
+            owner, child = expand_ranges(self.child_first[node[opened]],
+                                         self.child_count[node[opened]])
+            target = target[opened][owner]
+            node = child
+        return acc
+
+    @staticmethod
+    def _accumulate(acc, target, d, r2, mass, eps2):
+        """acc[target] += mass * d / (r^2 + eps^2)^(3/2), skipping r = 0."""
+        if target.size == 0:
+            return
+        r2 = r2 + eps2
+        weight = np.zeros_like(r2)
+        np.power(r2, -1.5, out=weight, where=r2 > 0)
+        weight *= mass
+        for j in range(acc.shape[1]):
+            acc[:, j] += np.bincount(target, weights=weight * d[:, j], minlength=len(acc))
+
+
+def tree_accelerations(positions, masses, theta: float = 0.5, softening: float = 0.0,
+                       G: float = 1.0, leaf_size: int = 8) -> np.ndarray:
+    """Self-gravity of a particle set via a freshly built Barnes-Hut tree."""
+    tree = BarnesHutTree(positions, masses, leaf_size)
+    return tree.accelerations(theta=theta, softening=softening, G=G)
@@ -0,0 +1,172 @@
+"""
+Cosmology Module: Vectorized Expansion Histories of Reactive Entropic Models
+--------------------------------------------------------------------------
+
+E(z) = H(z) / H0 of flat LCDM and of the reactive entropic Friedmann
+equation, where the apparent dark matter scales with the expansion rate:
+
+    E^2 = Omega_b (1+z)^3 + Omega_r (1+z)^4 + Omega_L + alpha E^n (1+z)^p
+
+(Validation/07_Cosmology: n = 1, p = 1.5). With alpha = 1 - Omega_b -
+Omega_r - Omega_L (reactive_alpha) the model is normalised to E(0) = 1.
+
+- n = 1 is a quadratic in E, n = 0 a plain sum: both are solved in closed
+  form (positive root), no root finder.
+- Any other coupling power 0 < n < 2 (e.g. n = 1/2, Omega_app ~ sqrt(H))
+  is solved by Newton iteration on all points at once, started from an
+  upper bound of the root so that the iterates decrease monotonically.
+
+Every argument broadcasts, so redshift arrays times parameter grids
+(parameter_grid from disk_stability, np.ix_, ...) are one call: 10^6
+redshifts x a parameter grid cost a few array operations per point.
+"""
+
+import time
+import numpy as np
+
+H0_PLANCK = 67.4        # km/s/Mpc (Planck 2018)
+OMEGA_B = 0.049         # Baryons
+OMEGA_M = 0.315         # Total matter (CDM + baryons) of LCDM
+OMEGA_L_REACTIVE = 0.69  # Vacuum term of the reactive model
+
+
+def e_lcdm(z, omega_m=OMEGA_M, omega_l=None) -> np.ndarray:
+    """E(z) of LCDM (flat when omega_l is None)."""
+    z = np.asarray(z, dtype=float)
+    omega_l = 1.0 - np.asarray(omega_m) if omega_l is None else omega_l
+    return np.sqrt(omega_m * (1 + z)**3 + omega_l)
+
+
+def hubble_lcdm(z, H0=H0_PLANCK, omega_m=OMEGA_M, omega_l=None) -> np.ndarray:
+    """H(z) of LCDM in the units of H0."""
+    return H0 * e_lcdm(z, omega_m, omega_l)
+
+
+def reactive_alpha(omega_b=OMEGA_B, omega_l=OMEGA_L_REACTIVE, omega_r=0.0) -> np.ndarray:
+    """Reactive coupling normalising E(0) = 1 (for any power n)."""
+    return 1.0 - np.asarray(omega_b) - omega_r - np.asarray(omega_l)
+
+
+def e_reactive(z, omega_b=OMEGA_B, omega_l=OMEGA_L_REACTIVE, alpha=None, exponent=1.5,
+               power=1.0, omega_r=0.0, tol: float = 1e-12, max_iter: int = 100) -> np.ndarray:
+    """
+    E(z) of the reactive Friedmann equation.
+
+    Parameters:
+    -----------
+    z : array_like
+        Redshifts
+    omega_b, omega_l, omega_r : array_like
+        Baryon, vacuum and radiation density parameters
+    alpha : array_like, optional
+        Reactive coupling (defaults to reactive_alpha, E(0) = 1)
+    exponent : array_like
+        p, redshift scaling (1+z)^p of the reactive term
+    power : float
+        n, coupling to the expansion rate E^n (0 <= n < 2)
+    tol : float
+        Relative tolerance of the Newton iteration (n other than 0 and 1)
+    max_iter : int
+        Newton iteration limit
+
+    Returns:
+    --------
+    np.ndarray
+        E on the broadcast of all array arguments
+    """
+    if not 0 <= power < 2:
+        raise ValueError("power must be in [0, 2)")
+    z = np.asarray(z, dtype=float)
+    if alpha is None:
+        alpha = reactive_alpha(omega_b, omega_l, omega_r)
+    one_plus_z = 1 + z
+    base = omega_b * one_plus_z**3 + omega_l
+    if np.any(omega_r):
+        base = base + omega_r * one_plus_z**4
+    # Reactive term without E: alpha (1+z)^p
+    reactive = alpha * one_plus_z**exponent
+    if np.any(base < 0):
+        raise ValueError("Omega_b (1+z)^3 + Omega_r (1+z)^4 + Omega_L must be non-negative")
+
+    if power == 0:
+        return np.sqrt(base + reactive)
+    if power == 1:
+        # Positive root of E^2 - b E - c = 0 (b = reactive, c = base), in place
+        half = np.multiply(reactive, 0.5, dtype=float)
+        e = np.asarray(np.multiply(half, half))
+        e += base
+        np.sqrt(e, out=e)
+        e += half
+        return e if e.ndim else e[()]
+    return _newton(base, reactive, power, tol, max_iter)
+
+
+def _newton(base, reactive, power: float, tol: float, max_iter: int) -> np.ndarray:
+    """
+    Root of f(E) = E^2 - base - reactive E^n on every point (0 < n < 2,
+    reactive >= 0).
+
+    Above the root f is increasing and convex, so Newton started from the
+    bound E = max(1, base + reactive)^(1 / (2 - n)) decreases monotonically
+    onto it.
+    """
+    if np.any(reactive < 0):
+        raise ValueError("alpha must be non-negative for a power other than 0 and 1")
+    e = np.asarray(np.add(base, reactive, dtype=float))
+    np.maximum(e, 1.0, out=e)
+    e **= 1.0 / (2.0 - power)
+    # Scratch for reactive E^n, the residual and the slope (no per-step allocation)
+    term, residual, slope = np.empty_like(e), np.empty_like(e), np.empty_like(e)
+    for _ in range(max_iter):
+        np.power(e, power, out=term)
+        term *= reactive
+        np.multiply(e, e, out=residual)
+        residual -= base
+        residual -= term
+        term /= e
+        term *= power
+        np.multiply(e, 2.0, out=slope)
+        slope -= term
+        residual /= slope
+        e -= residual
+        # Relative step, positive up to rounding
+        residual /= e
+        if max(residual.max(), -residual.min()) <= tol:
+            return e if e.ndim else e[()]
+    raise RuntimeError(f"Newton iteration did not converge in {max_iter} steps")
+
+
+def hubble_reactive(z, H0=H0_PLANCK, **kwargs) -> np.ndarray:
+    """H(z) of the reactive model in the units of H0 (kwargs as in e_reactive)."""
+    return H0 * e_reactive(z, **kwargs)
+
+
+def benchmark(n_z: int = 1_000_000, n_params: int = 5):
+    """Time H(z) on n_z redshifts x an n_params^2 (Omega_b, Omega_L) grid."""
+    from scipy.optimize import fsolve
+
+    z = np.linspace(0, 5, n_z)
+    omega_b = np.linspace(0.03, 0.07, n_params)[:, None, None]
+    omega_l = np.linspace(0.6, 0.75, n_params)[None, :, None]
+    start = time.perf_counter()
+    e = e_reactive(z, omega_b, omega_l)
+    closed = time.perf_counter() - start
+    start = time.perf_counter()
+    e_reactive(z, omega_b, omega_l, power=0.5)
+    newton = time.perf_counter() - start
+
+    # Reference: one fsolve per redshift, as in the original solver script
+    alpha = reactive_alpha()
+    sample = z[:: n_z // 100]
+    start = time.perf_counter()
+    for zi in sample:
+        fsolve(lambda x: x**2 - OMEGA_B * (1 + zi)**3 - OMEGA_L_REACTIVE
+               - alpha * x * (1 + zi)**1.5, e_lcdm(zi))
+    per_point = (time.perf_counter() - start) / len(sample)
+    print(f"{e.size:.1e} E(z) values: closed form {closed:.2f} s, Newton (n = 1/2) {newton:.2f} s; "
+          f"fsolve loop ~{per_point * e.size:.0f} s")
+
+
+if __name__ == "__main__":
+    print("=== Reactive Cosmology Benchmark ===")
+    benchmark()
@@ -0,0 +1,335 @@
+"""
+Domain Decomposition Module: Multi-Process Tree Gravity on Shared Memory
+------------------------------------------------------------------------
+
+Spreads the Barnes-Hut self-gravity of large disks over worker processes,
+one spatial domain each, so a single simulation can use every core of a
+node.
+
+Per force evaluation:
+1. The parent writes positions and masses into multiprocessing.shared_memory
+   and assigns every particle to a domain: an angular sector (default) or a
+   radial ring of the disk. Domain edges persist between steps, so particles
+   migrate between domains as they orbit; the edges are only moved (to the
+   particle-count quantiles) when the most loaded domain drifts more than
+   `imbalance` above the mean.
+2. Every worker builds the tree of its own domain and publishes it into its
+   own shared-memory block (the ghost exchange).
+3. Every worker walks all published trees for its own particles and writes
+   the accelerations into the shared result array.
+
+Walking P trees of N/P particles costs about as much as one tree of N, so the
+walk (the dominant cost) divides over the workers, and no particle data is
+copied between processes.
+"""
+
+import os
+import time
+import weakref
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Optional
+
+from barnes_hut import BarnesHutTree, TREE_FIELDS
+
+DECOMPOSITIONS = ('angular', 'radial')
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without adopting it (its creator unlinks it)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: workers share the parent's resource tracker, which
+        # keeps one registration per name, so attaching is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def tree_layout(n: int, n_nodes: int, dim: int):
+    """Byte layout of a published tree: {field: (dtype, shape, offset)}, total size."""
+    shapes = {
+        'order': (np.int64, (n,)), 'pos': (np.float64, (n, dim)), 'mass': (np.float64, (n,)),
+        'start': (np.int64, (n_nodes,)), 'count': (np.int64, (n_nodes,)),
+        'node_mass': (np.float64, (n_nodes,)), 'com': (np.float64, (n_nodes, dim)),
+        'cell_size': (np.float64, (n_nodes,)), 'delta': (np.float64, (n_nodes,)),
+        'is_leaf': (np.bool_, (n_nodes,)), 'child_first': (np.int64, (n_nodes,)),
+        'child_count': (np.int64, (n_nodes,)),
+    }
+    layout = {}
+    offset = 0
+    for name in TREE_FIELDS:
+        dtype, shape = shapes[name]
+        layout[name] = (dtype, shape, offset)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset += -(-size // 8) * 8
+    return layout, max(offset, 8)
+
+
+def _tree_views(buf, n: int, n_nodes: int, dim: int):
+    """NumPy views of a published tree inside a shared buffer."""
+    layout, _ = tree_layout(n, n_nodes, dim)
+    return {name: np.ndarray(shape, dtype, buffer=buf, offset=offset)
+            for name, (dtype, shape, offset) in layout.items()}
+
+
+def _worker_main(rank: int, conn, arrays: dict):
+    """
+    Worker loop. Commands from the parent:
+    ('build', n, theta, softening, G): tree of this domain -> shared block
+    ('walk', published, ...): forces on this domain from every published tree
+    ('close',): release shared memory and exit
+    """
+    blocks = {name: _attach(spec[0]) for name, spec in arrays.items()}
+    views = {name: np.ndarray(spec[1], spec[2], buffer=blocks[name].buf)
+             for name, spec in arrays.items()}
+    own_block = None
+    remote = {}
+
+    try:
+        while True:
+            message = conn.recv()
+            command = message[0]
+            if command == 'close':
+                break
+
+            n, dim = message[1], message[2]
+            bounds = views['bounds']
+            members = views['members'][bounds[rank]:bounds[rank + 1]]
+
+            if command == 'build':
+                if len(members) == 0:
+                    conn.send((None, 0, 0))
+                    continue
+                tree = BarnesHutTree(views['positions'][members, :dim], views['masses'][members])
+                _, size = tree_layout(len(members), tree.n_nodes, dim)
+                if own_block is None or own_block.size < size:
+                    if own_block is not None:
+                        own_block.close()
+                        own_block.unlink()
+                    own_block = shared_memory.SharedMemory(create=True, size=int(size * 1.25))
+                target = _tree_views(own_block.buf, len(members), tree.n_nodes, dim)
+                for name, array in tree.arrays().items():
+                    target[name][...] = array
+                conn.send((own_block.name, len(members), tree.n_nodes))
+
+            elif command == 'walk':
+                published, theta, softening, G = message[3:]
+                start = time.perf_counter()
+                x = views['positions'][members, :dim]
+                acc = np.zeros_like(x)
+                for name, n_members, n_nodes in published:
+                    if name is None:
+                        continue
+                    if name not in remote:
+                        remote[name] = own_block if own_block is not None and name == own_block.name \
+                            else _attach(name)
+                    tree = BarnesHutTree.from_arrays(_tree_views(remote[name].buf, n_members, n_nodes, dim))
+                    acc += tree.accelerations(x, theta=theta, softening=softening, G=G)
+                views['accelerations'][members, :dim] = acc
+                # Forget blocks that were replaced this step
+                live = {p[0] for p in published}
+                for name in [k for k in remote if k not in live]:
+                    if own_block is None or name != own_block.name:
+                        remote[name].close()
+                    del remote[name]
+                conn.send(time.perf_counter() - start)
+    finally:
+        for name, shm in remote.items():
+            if own_block is None or name != own_block.name:
+                shm.close()
+        if own_block is not None:
+            own_block.close()
+            own_block.unlink()
+        for shm in blocks.values():
+            shm.close()
+        conn.close()
+
+
+def _shutdown(processes, conns, blocks):
+    """Stop the workers and free the shared arrays (also run at exit / GC)."""
+    for conn in conns:
+        try:
+            conn.send(('close',))
+        except (OSError, BrokenPipeError):
+            pass
+    for proc in processes:
+        proc.join(timeout=5)
+        if proc.is_alive():
+            proc.terminate()
+    for shm in blocks.values():
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class DomainDecomposition:
+    """
+    Multi-process Barnes-Hut gravity with spatial domains.
+
+    Parameters:
+    -----------
+    capacity : int
+        Maximum number of particles
+    n_workers : int, optional
+        Worker processes (one domain each), defaults to the CPU count
+    dim : int
+        Spatial dimension of the positions (2 or 3)
+    decomposition : str
+        'angular' sectors or 'radial' rings around the origin
+    imbalance : float
+        Rebalance when the largest domain exceeds the mean by this fraction
+    theta, softening, G : float
+        Tree opening angle, Plummer softening and gravitational constant
+    """
+
+    def __init__(self, capacity: int, n_workers: Optional[int] = None, dim: int = 2,
+                 decomposition: str = 'angular', imbalance: float = 0.1,
+                 theta: float = 0.5, softening: float = 0.0, G: float = 1.0):
+        if decomposition not in DECOMPOSITIONS:
+            raise ValueError(f"Unknown decomposition '{decomposition}'. "
+                             f"Available: {', '.join(DECOMPOSITIONS)}")
+        self.capacity = capacity
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.dim = dim
+        self.decomposition = decomposition
+        self.imbalance = imbalance
+        self.theta = theta
+        self.softening = softening
+        self.G = G
+
+        self.edges = None
+        self.domain = None
+        self.n_migrated = 0
+        self.n_rebalances = 0
+        self.walk_seconds = np.zeros(self.n_workers)
+
+        specs = {
+            'positions': ((capacity, dim), np.float64),
+            'masses': ((capacity,), np.float64),
+            'accelerations': ((capacity, dim), np.float64),
+            'members': ((capacity,), np.int64),
+            'bounds': ((self.n_workers + 1,), np.int64),
+        }
+        self._blocks = {}
+        self._views = {}
+        arrays = {}
+        for name, (shape, dtype) in specs.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 8)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks[name] = shm
+            self._views[name] = np.ndarray(shape, dtype, buffer=shm.buf)
+            arrays[name] = (shm.name, shape, dtype)
+
+        ctx = mp.get_context()
+        self._conns = []
+        self._processes = []
+        for rank in range(self.n_workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker_main, args=(rank, child, arrays), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(proc)
+
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, self._conns, self._blocks)
+
+    def close(self):
+        """Stop the workers and release shared memory."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def domain_counts(self) -> np.ndarray:
+        """Particles per domain after the last decomposition."""
+        return np.diff(self._views['bounds'])
+
+    def _coordinate(self, positions: np.ndarray) -> np.ndarray:
+        if self.decomposition == 'angular':
+            return np.arctan2(positions[:, 1], positions[:, 0])
+        return np.linalg.norm(positions, axis=1)
+
+    def _decompose(self, positions: np.ndarray):
+        """Assign particles to domains, migrating and rebalancing as needed."""
+        n = len(positions)
+        coord = self._coordinate(positions)
+        if self.edges is None or self.domain is None or len(self.domain) != n:
+            self.edges = None
+        if self.edges is not None:
+            domain = np.clip(np.searchsorted(self.edges, coord, side='right') - 1, 0, self.n_workers - 1)
+            counts = np.bincount(domain, minlength=self.n_workers)
+            if counts.max() > (1 + self.imbalance) * n / self.n_workers:
+                self.edges = None
+            else:
+                self.n_migrated += int(np.count_nonzero(domain != self.domain))
+        if self.edges is None:
+            self.edges = np.quantile(coord, np.linspace(0, 1, self.n_workers + 1))
+            self.edges[0], self.edges[-1] = -np.inf, np.inf
+            domain = np.clip(np.searchsorted(self.edges, coord, side='right') - 1, 0, self.n_workers - 1)
+            self.n_rebalances += 1
+        self.domain = domain
+
+        order = np.argsort(domain, kind='stable')
+        self._views['members'][:n] = order
+        self._views['bounds'][:] = np.searchsorted(domain[order], np.arange(self.n_workers + 1))
+
+    def accelerations(self, positions, masses) -> np.ndarray:
+        """
+        Newtonian self-gravity of the particles (self-interaction excluded).
+
+        Parameters:
+        -----------
+        positions : np.ndarray
+            Particle positions, shape (N, dim) with N <= capacity
+        masses : np.ndarray or float
+            Particle masses
+
+        Returns:
+        --------
+        np.ndarray
+            Acceleration vectors, shape (N, dim)
+        """
+        positions = np.asarray(positions, dtype=float)
+        n, dim = positions.shape
+        if n > self.capacity or dim != self.dim:
+            raise ValueError(f"Expected at most {self.capacity} particles in {self.dim}D, "
+                             f"got {n} in {dim}D")
+        self._views['positions'][:n] = positions
+        self._views['masses'][:n] = np.broadcast_to(masses, (n,))
+        self._decompose(positions)
+
+        for conn in self._conns:
+            conn.send(('build', n, dim))
+        published = [conn.recv() for conn in self._conns]
+
+        for conn in self._conns:
+            conn.send(('walk', n, dim, published, self.theta, self.softening, self.G))
+        self.walk_seconds = np.array([conn.recv() for conn in self._conns])
+
+        return self._views['accelerations'][:n].copy()
+
+
+def benchmark(n: int = 1_000_000, workers=(1, 2, 4, 8), theta: float = 0.5):
+    """Print force-evaluation throughput against the number of workers."""
+    rng = np.random.default_rng(0)
+    phi = rng.uniform(0, 2 * np.pi, n)
+    r = np.sqrt(rng.uniform(10**2, 500**2, n))
+    pos = np.column_stack([r * np.cos(phi), r * np.sin(phi)])
+    for p in workers:
+        with DomainDecomposition(n, p, theta=theta, softening=1.0) as solver:
+            start = time.perf_counter()
+            solver.accelerations(pos, 1.0 / n)
+            elapsed = time.perf_counter() - start
+        print(f"workers={p:3d}: {elapsed:7.2f} s, {n / elapsed:.3e} particles/s")
+
+
+if __name__ == "__main__":
+    print("=== Domain Decomposition Benchmark ===")
+    benchmark()
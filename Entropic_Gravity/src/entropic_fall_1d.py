@@ -10,6 +10,8 @@ from entropy maximization, without programming forces directly.
 import numpy as np
 import matplotlib.pyplot as plt
 
+from checkpoint import rng_state, set_rng_state
+
 # --- ENTROPIC UNIVERSE CONFIGURATION ---
 # No constant G. No Newton's Law here.
 # Only Probability.
@@ -43,7 +45,8 @@ def information_density(x):
     # Simulating gravitational force ~1/r^2
     return 1.0 / (distance ** 2)
 
-def simulate_entropic_fall(initial_position=None, steps=None, temperature=0.1, verbose=False):
+def simulate_entropic_fall(initial_position=None, steps=None, temperature=0.1, verbose=False,
+                           checkpoint=None):
     """
     Simulates the entropic fall of a particle towards the center of mass.
 
@@ -57,6 +60,9 @@ def simulate_entropic_fall(initial_position=None, steps=None, temperature=0.1, v
         System temperature (thermal agitation)
     verbose : bool, optional
         Print progress
+    checkpoint : checkpoint.Checkpointer, optional
+        Resume from its file if present; save the walk and the RNG state on
+        its schedule
 
     Returns:
     --------
@@ -70,8 +76,15 @@ def simulate_entropic_fall(initial_position=None, steps=None, temperature=0.1, v
 
     position = initial_position
     trajectory = [position]
-
-    for i in range(steps):
+    first = 0
+    saved = None if checkpoint is None else checkpoint.load()
+    if saved is not None:
+        trajectory = saved['trajectory']
+        position = trajectory[-1]
+        first = steps if saved['impact'] else saved['step']
+        set_rng_state(saved)
+
+    for i in range(first, steps):
         # 1. Propose a random movement (Pure Random Walk)
         step = np.random.choice([-1, 1]) * 0.5
         new_position_proposed = position + step
@@ -95,7 +108,11 @@ def simulate_entropic_fall(initial_position=None, steps=None, temperature=0.1, v
         trajectory.append(position)
 
         # If touched the mass, stop
-        if abs(position - MASS_POSITION) < 1.0:
+        impact = abs(position - MASS_POSITION) < 1.0
+        if checkpoint is not None and (impact or i + 1 == steps or checkpoint.due(i + 1)):
+            checkpoint.save({'trajectory': trajectory, 'step': i + 1, 'impact': bool(impact),
+                             **rng_state()})
+        if impact:
             if verbose:
                 print(f"Impact at step {i}")
             break
@@ -0,0 +1,135 @@
+"""
+Field Maps Module: Newtonian and Entropic Acceleration on 2D / 3D Grids
+-----------------------------------------------------------------------
+
+Vectorized field maps for the external field effect (EFE) around several
+point or extended sources, e.g. the saddle point between two galaxies.
+
+- The grid points are handed to galaxy_flyby.CoreField in chunks, so the
+  scratch memory stays bounded whatever the grid size; the Newtonian field
+  is evaluated once and the interpolation law is then applied to its
+  magnitude (entropic field, direction preserved).
+- Extended sources are Plummer spheres (per-source softening) or clouds of
+  many point sources.
+- With superposed=True the map also holds the sum of the individually
+  corrected source fields: the ratio |g| / |sum_k g_k| is where the
+  non-linear law breaks superposition (EFE suppression < 1 in the field of
+  a neighbour, enhancement near the saddle point).
+
+Maps come back ready to plot: coordinates as 1D axes, scalar maps with the
+grid shape (meshgrid 'xy' order, so 2D maps are (ny, nx) for imshow /
+contourf) and vector maps component first, shape (dim,) + grid.
+"""
+
+import time
+import numpy as np
+from typing import Optional, Sequence
+
+from interpolation_laws import NEWTON
+from galaxy_flyby import CoreField
+
+
+def grid_points(axes: Sequence):
+    """
+    Points of a regular grid as a (M, dim) array (coordinate-row layout),
+    plus the grid shape with scalar axes (slices) dropped.
+    """
+    axes = [np.atleast_1d(np.asarray(a, dtype=float)) for a in axes]
+    mesh = np.meshgrid(*axes)
+    shape = tuple(n for n in mesh[0].shape if n > 1) or (1,)
+    points = np.empty((len(axes), mesh[0].size))
+    for j, coordinate in enumerate(mesh):
+        points[j] = coordinate.ravel()
+    return points.T, shape
+
+
+def field_map(sources, masses, axes: Sequence, law=NEWTON, G: float = 1.0, softening=0.0,
+              r_min: float = 0.0, superposed: bool = False,
+              chunk: Optional[int] = None) -> dict:
+    """
+    Newtonian and law-corrected acceleration on a grid.
+
+    Parameters:
+    -----------
+    sources : array_like
+        Source positions, shape (K, dim) with dim 2 or 3
+    masses : array_like
+        Source masses (K values)
+    axes : sequence
+        One 1D coordinate array per dimension; a scalar takes a slice
+        (e.g. (x, y, 0.0) for the z = 0 plane of a 3D configuration)
+    law : callable
+        Interpolation law applied to the total field magnitude
+    G : float
+        Gravitational constant
+    softening : float or array_like
+        Plummer softening / scale radius of every source
+    r_min : float
+        Grid points closer than this to a source are set to NaN
+    superposed : bool
+        Also return the sum of individually corrected fields and the EFE ratio
+    chunk : int, optional
+        Grid points per block (see galaxy_flyby.CoreField)
+
+    Returns:
+    --------
+    dict
+        'axes': the coordinate axes; 'g_newton', 'g': vectors (dim,) + grid;
+        'g_newton_mag', 'g_mag', 'boost' (= |g| / |g_N|): grid-shaped maps;
+        with superposed also 'g_superposed' and 'efe' (= |g| / |g_superposed|)
+    """
+    sources = np.atleast_2d(np.asarray(sources, dtype=float))
+    masses = np.atleast_1d(np.asarray(masses, dtype=float))
+    points, shape = grid_points(axes)
+    dim = points.shape[1]
+
+    g_newton = CoreField(masses, NEWTON, G, softening, chunk).field(points, sources)
+    rows = g_newton.T       # (dim, M), contiguous
+    g_newton_mag = np.sqrt(np.einsum('ij,ij->j', rows, rows))
+    g_mag = law(g_newton_mag)
+    boost = np.divide(g_mag, g_newton_mag, out=np.zeros_like(g_mag), where=g_newton_mag > 0)
+    result = {'g_newton': rows, 'g': rows * boost, 'g_newton_mag': g_newton_mag,
+              'g_mag': g_mag, 'boost': boost}
+
+    if superposed:
+        total = np.zeros((dim, len(points)))
+        softening = np.broadcast_to(softening, masses.shape)
+        for k in range(len(masses)):
+            single = CoreField(masses[k], law, G, softening[k], chunk)
+            total += single.field(points, sources[k:k + 1]).T
+        total_mag = np.sqrt(np.einsum('ij,ij->j', total, total))
+        result['g_superposed'] = total
+        result['efe'] = np.divide(g_mag, total_mag, out=np.ones_like(g_mag), where=total_mag > 0)
+
+    if r_min > 0:
+        near = np.zeros(len(points), dtype=bool)
+        for source in sources:
+            d2 = np.sum((points - source[:dim])**2, axis=1)
+            near |= d2 < r_min**2
+        for value in result.values():
+            value[..., near] = np.nan
+
+    for key, value in result.items():
+        result[key] = value.reshape(value.shape[:-1] + shape)
+    result['axes'] = tuple(np.asarray(a, dtype=float) for a in axes if np.ndim(a) > 0)
+    return result
+
+
+def benchmark(n: int = 1000, a0: float = 2.0):
+    """Time an n x n EFE map of two equal galaxies (the collision test setup)."""
+    from interpolation_laws import InterpolationLaw
+
+    x = np.linspace(-150, 150, n)
+    sources, masses = [[-50.0, 0.0], [50.0, 0.0]], [1000.0, 1000.0]
+    law = InterpolationLaw('simple', a0)
+    for superposed in (False, True):
+        start = time.perf_counter()
+        maps = field_map(sources, masses, (x, x), law, r_min=1.0, superposed=superposed)
+        seconds = time.perf_counter() - start
+        print(f"{n}x{n} map, superposed={superposed}: {seconds:.3f} s "
+              f"(saddle boost {maps['boost'][n // 2, n // 2]:.1f})")
+
+
+if __name__ == "__main__":
+    print("=== Field Map Benchmark ===")
+    benchmark()
@@ -11,32 +11,34 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Tuple, List, Optional
 
+from interpolation_laws import newtonian_acceleration, naive_switch
+from integrators import Integrator
+
 # GALAXY CONFIGURATION
 G_NEWTON = 1.0           # Newtonian gravitational constant
 M_BLACK_HOLE = 1000.0    # Mass at galactic center
 VERLINDE_SCALE = 20.0    # Verlinde transition distance
 A_0 = 2.0                # Minimum acceleration of universe (Verlinde constant) - INCREASED FOR VISUAL DEMONSTRATION
 
-def newtonian_force(r: float) -> float:
+def newtonian_force(r):
     """
     Classical Newtonian gravitational force.
     F = GM/r²
 
     Parameters:
     -----------
-    r : float
+    r : float or np.ndarray
         Distance from center
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Gravitational acceleration
     """
-    if r < 1e-10:  # Avoid division by zero
-        return 0.0
-    return (G_NEWTON * M_BLACK_HOLE) / (r ** 2)
+    # Radii below 1e-10 return 0 to avoid division by zero
+    return newtonian_acceleration(r, M_BLACK_HOLE, G_NEWTON, r_min=1e-10)
 
-def verlinde_force(r: float) -> float:
+def verlinde_force(r):
     """
     Gravitational force according to Verlinde's entropic theory.
 
@@ -46,30 +48,18 @@ def verlinde_force(r: float) -> float:
 
     Parameters:
     -----------
-    r : float
+    r : float or np.ndarray
         Distance from center
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Entropic gravitational acceleration
     """
-    if r < 1e-10:
-        return 0.0
-
-    # Calculate Newtonian acceleration
-    newton_acceleration = newtonian_force(r)
+    # A_0 is read at call time so sensitivity studies can vary it
+    return naive_switch(newtonian_force(r), A_0)
 
-    # Phase transition based on acceleration
-    if newton_acceleration > A_0:
-        # Near center: Newtonian behavior
-        return newton_acceleration
-    else:
-        # Far from center: entropy changes the behavior
-        # Force decays slower, maintaining constant orbital velocity
-        return np.sqrt(A_0 * newton_acceleration)
-
-def stable_orbital_velocity(r: float, model: str = 'newton') -> float:
+def stable_orbital_velocity(r, model: str = 'newton'):
     """
     Calculate orbital velocity required for stable circular orbit.
 
@@ -78,14 +68,14 @@ def stable_orbital_velocity(r: float, model: str = 'newton') -> float:
 
     Parameters:
     -----------
-    r : float
+    r : float or np.ndarray
         Orbital radius
     model : str
         'newton' or 'verlinde'
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Orbital velocity
     """
     if model == 'newton':
@@ -97,13 +87,124 @@ def stable_orbital_velocity(r: float, model: str = 'newton') -> float:
 
     return np.sqrt(f * r)
 
+MODELS = ('newton', 'verlinde')
+
+def _ensemble_parameters(n_orbits: int, model, a0) -> Tuple[np.ndarray, np.ndarray]:
+    """Broadcast per-orbit models and a0 values to (entropic_mask, a0_array)."""
+    models = np.broadcast_to(np.asarray(model, dtype=object), (n_orbits,))
+    unknown = set(models) - set(MODELS)
+    if unknown:
+        raise ValueError("Model must be 'newton' or 'verlinde'")
+    entropic = models == 'verlinde'
+    a0 = np.broadcast_to(np.asarray(A_0 if a0 is None else a0, dtype=float),
+                         (n_orbits,))
+    return entropic, a0
+
+def _ensemble_acceleration(r: np.ndarray, entropic: np.ndarray, a0: np.ndarray,
+                           out: np.ndarray) -> np.ndarray:
+    """Radial acceleration magnitudes for a mixed newton/verlinde ensemble."""
+    newtonian_acceleration(r, M_BLACK_HOLE, G_NEWTON, r_min=1e-10, out=out)
+    if entropic.all():
+        naive_switch(out, a0, out=out)
+    elif entropic.any():
+        np.copyto(out, naive_switch(out, a0), where=entropic)
+    return out
+
+def simulate_orbits(initial_radii,
+                    model='newton',
+                    steps: int = 1000,
+                    dt: float = 0.1,
+                    a0=None,
+                    stride: int = 1,
+                    scheme: str = 'euler') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate an ensemble of independent orbits advanced together as arrays.
+
+    Every orbit starts at (r0, 0) on its circular velocity.
+
+    Parameters:
+    -----------
+    initial_radii : array_like
+        Initial distances from center, one per orbit
+    model : str or sequence of str
+        'newton' or 'verlinde', shared or one per orbit
+    steps : int
+        Number of simulation steps
+    dt : float
+        Time step
+    a0 : float or array_like, optional
+        Verlinde acceleration scale, shared or one per orbit (default: A_0)
+    stride : int
+        Store every stride-th step (step 0 is always stored)
+    scheme : str
+        Symplectic integrator (see integrators.SCHEMES); default is the
+        original semi-implicit Euler
+
+    Returns:
+    --------
+    tuple
+        (trajectory_x, trajectory_y, average_velocity) where the trajectories
+        have shape (steps // stride + 1, n_orbits) and the average velocity
+        over all steps has shape (n_orbits,)
+    """
+    if stride < 1:
+        raise ValueError("stride must be >= 1")
+    r0 = np.atleast_1d(np.asarray(initial_radii, dtype=float))
+    n_orbits = r0.size
+    entropic, a0 = _ensemble_parameters(n_orbits, model, a0)
+
+    # Preallocated state (rows: x, y), scratch and output buffers
+    pos = np.zeros((2, n_orbits))
+    pos[0] = r0
+    vel = np.zeros((2, n_orbits))
+    g_mag = np.empty(n_orbits)
+    _ensemble_acceleration(r0, entropic, a0, out=g_mag)
+    vel[1] = np.sqrt(g_mag * r0)  # circular orbit: v = sqrt(F * r)
+    r = np.empty(n_orbits)
+    work = np.empty((2, n_orbits))
+    acc = np.empty((2, n_orbits))
+
+    def accel(p: np.ndarray) -> np.ndarray:
+        """Acceleration vectors (radial direction toward center)."""
+        np.multiply(p, p, out=work)
+        np.add(work[0], work[1], out=r)
+        np.sqrt(r, out=r)
+        _ensemble_acceleration(r, entropic, a0, out=g_mag)
+        np.negative(g_mag, out=g_mag)
+        np.divide(g_mag, r, out=g_mag)
+        return np.multiply(p, g_mag, out=acc)
+
+    trajectory_x = np.empty((steps // stride + 1, n_orbits))
+    trajectory_y = np.empty_like(trajectory_x)
+    trajectory_x[0] = pos[0]
+    trajectory_y[0] = pos[1]
+    velocity_sum = vel[1].copy()
+
+    integrator = Integrator(scheme)
+    cached = None
+    for step in range(1, steps + 1):
+        cached = integrator.step(pos, vel, accel, dt, cached)
+
+        np.multiply(vel, vel, out=work)
+        np.add(work[0], work[1], out=r)
+        velocity_sum += np.sqrt(r, out=r)
+
+        if step % stride == 0:
+            trajectory_x[step // stride] = pos[0]
+            trajectory_y[step // stride] = pos[1]
+
+    return trajectory_x, trajectory_y, velocity_sum / (steps + 1)
+
 def simulate_orbit(model: str = 'newton',
                    initial_radius: float = 10.0,
                    steps: int = 1000,
-                   dt: float = 0.1) -> Tuple[List[float], List[float], float]:
+                   dt: float = 0.1,
+                   scheme: str = 'euler') -> Tuple[List[float], List[float], float]:
     """
     Simulate the orbit of a star in the galaxy.
 
+    Thin wrapper around simulate_orbits for a single orbit.
+
     Parameters:
     -----------
     model : str
@@ -114,50 +215,18 @@ def simulate_orbit(model: str = 'newton',
         Number of simulation steps
     dt : float
         Time step
+    scheme : str
+        Symplectic integrator (see integrators.SCHEMES)
 
     Returns:
     --------
     tuple
         (trajectory_x, trajectory_y, average_velocity)
     """
-    # Initial state: at position (initial_radius, 0) with tangential velocity
-    x, y = initial_radius, 0.0
-
-    # Initial velocity for circular orbit
-    v_orbital = stable_orbital_velocity(initial_radius, model)
-    vx, vy = 0.0, v_orbital
-
-    trajectory_x = [x]
-    trajectory_y = [y]
-    velocities = [v_orbital]
-
-    for _ in range(steps):
-        r = np.sqrt(x**2 + y**2)
-
-        # Calculate acceleration based on model
-        if model == 'newton':
-            total_acceleration = newtonian_force(r)
-        else:
-            total_acceleration = verlinde_force(r)
-
-        # Acceleration vector (radial direction toward center)
-        ax = -total_acceleration * (x / r)
-        ay = -total_acceleration * (y / r)
-
-        # Update velocity (Euler method)
-        vx += ax * dt
-        vy += ay * dt
-
-        # Update position
-        x += vx * dt
-        y += vy * dt
-
-        trajectory_x.append(x)
-        trajectory_y.append(y)
-        velocities.append(np.sqrt(vx**2 + vy**2))
-
-    average_velocity = np.mean(velocities)
-    return trajectory_x, trajectory_y, average_velocity
+    if model not in MODELS:
+        raise ValueError("Model must be 'newton' or 'verlinde'")
+    tx, ty, v_avg = simulate_orbits([initial_radius], model, steps, dt, scheme=scheme)
+    return tx[:, 0].tolist(), ty[:, 0].tolist(), float(v_avg[0])
 
 def calculate_rotation_curve(radii: np.ndarray,
                              model: str = 'newton') -> np.ndarray:
@@ -176,13 +245,7 @@ def calculate_rotation_curve(radii: np.ndarray,
     np.ndarray
         Orbital velocities for each radius
     """
-    velocities = []
-
-    for r in radii:
-        v = stable_orbital_velocity(r, model)
-        velocities.append(v)
-
-    return np.array(velocities)
+    return np.asarray(stable_orbital_velocity(np.asarray(radii, dtype=float), model))
 
 def plot_orbit_comparison(test_radius: float = 50.0,
                           steps: int = 2000) -> None:
@@ -196,9 +259,10 @@ def plot_orbit_comparison(test_radius: float = 50.0,
     steps : int
         Simulation steps
     """
-    # Simulate orbits
-    tx_n, ty_n, _ = simulate_orbit('newton', test_radius, steps)
-    tx_v, ty_v, _ = simulate_orbit('verlinde', test_radius, steps)
+    # Simulate both orbits as one ensemble
+    tx, ty, _ = simulate_orbits([test_radius, test_radius], ['newton', 'verlinde'], steps)
+    tx_n, ty_n = tx[:, 0], ty[:, 0]
+    tx_v, ty_v = tx[:, 1], ty[:, 1]
 
     plt.figure(figsize=(8, 8))
 
@@ -298,8 +362,9 @@ def complete_demonstration(test_radius: float = 50.0,
     # Subplot 1: Orbits
     plt.sca(ax1)
 
-    tx_n, ty_n, _ = simulate_orbit('newton', test_radius, 2000)
-    tx_v, ty_v, _ = simulate_orbit('verlinde', test_radius, 2000)
+    tx, ty, _ = simulate_orbits([test_radius, test_radius], ['newton', 'verlinde'], 2000)
+    tx_n, ty_n = tx[:, 0], ty[:, 0]
+    tx_v, ty_v = tx[:, 1], ty[:, 1]
 
     ax1.scatter([0], [0], color='black', s=200, marker='*',
                 label='Black Hole', zorder=10)
@@ -0,0 +1,312 @@
+"""
+Galaxy Flyby Module: Restricted Three-Body Encounters under an Entropic Law
+---------------------------------------------------------------------------
+
+Toomre & Toomre (1972) style galaxy interactions: a few massive cores move
+on their mutual orbit and carry disks of massless test particles, so tidal
+bridges and tails can be followed with 10^5 particles in minutes.
+
+- CoreField is the force: the Newtonian field of K softened point-mass
+  cores on M targets is evaluated as a (K x chunk) block per chunk of
+  targets (coordinate differences, w = 1 / (r^2 + eps^2)^(3/2), then one
+  matrix-vector product per coordinate), so the scratch memory is bounded
+  by the chunk size whatever M is and no per-step allocation grows with M.
+- The entropic law acts on the MAGNITUDE of the total field at every
+  target, direction preserved (as in interpolation_laws.apply_to_field):
+  near the saddle point between two galaxies the fields cancel and the
+  correction sees the combined, not the per-core, acceleration (external
+  field effect). Cores feel the corrected field of the other cores.
+- Cores and particles share one ParticleStore (cores in the first rows), so
+  the particle_engine integrators, iter_steps streaming and checkpoints
+  work unchanged.
+
+Initial conditions: parabolic_encounter() places two cores on a Newtonian
+parabolic orbit with a given pericentre; core_disks() adds a disk of
+circular orbits (in the core's own softened, law-corrected field) around
+every core, prograde or retrograde and, in 3D, inclined.
+"""
+
+import time
+import numpy as np
+from typing import Optional, Sequence, Union
+
+from interpolation_laws import NEWTON
+from integrators import Integrator
+from particle_engine import ParticleStore, ParticleEngine, disk_positions, circular_velocities
+
+CHUNK_ELEMENTS = 1 << 16   # Sources x targets per block: (dim + 2) x 2^16 floats of scratch
+SOURCE_BLOCK = 256         # Most sources per block; more are summed block by block
+
+
+class CoreField:
+    """
+    Field of K Plummer-softened point masses, entropic law on the total
+    field magnitude.
+
+    The sources are usually galaxy cores; a per-source softening turns them
+    into Plummer spheres and many sources can sample an extended mass
+    distribution (sources beyond SOURCE_BLOCK are summed block by block).
+    Used as an engine force, positions[:K] are the cores themselves and the
+    remaining rows are test particles.
+
+    Parameters:
+    -----------
+    masses : array_like
+        Source masses (K values)
+    law : callable
+        Interpolation law g = law(g_N) (see interpolation_laws)
+    G : float
+        Gravitational constant
+    softening : float or array_like
+        Plummer softening length (or scale radius) of the sources
+    chunk : int, optional
+        Targets per block, defaults to CHUNK_ELEMENTS / min(K, SOURCE_BLOCK)
+    """
+
+    def __init__(self, masses, law=NEWTON, G: float = 1.0, softening=1.0,
+                 chunk: Optional[int] = None):
+        self.masses = np.atleast_1d(np.asarray(masses, dtype=float))
+        self.n_cores = len(self.masses)
+        self.law = law
+        self.G = G
+        self.softening = softening
+        self.source_block = min(self.n_cores, SOURCE_BLOCK)
+        self.chunk = chunk or max(256, CHUNK_ELEMENTS // self.source_block)
+        self._ws = None
+        self.last_pairs = 0
+        self.last_seconds = 0.0
+
+    @property
+    def pairs_per_second(self) -> float:
+        """Source-target interactions per second of the last call."""
+        return self.last_pairs / self.last_seconds if self.last_seconds > 0 else 0.0
+
+    def _workspace(self, dim: int, dtype):
+        """(diff, r2, weight, G m, eps^2, magnitude, corrected) buffers, allocated once."""
+        ws = self._ws
+        if ws is None or ws[0].shape[0] != dim or ws[0].dtype != dtype:
+            k, c = self.source_block, self.chunk
+            eps2 = np.broadcast_to(np.asarray(self.softening, dtype=float)**2, (self.n_cores,))
+            ws = self._ws = (np.empty((dim, k, c), dtype), np.empty((k, c), dtype),
+                             np.empty((k, c), dtype), (self.G * self.masses).astype(dtype),
+                             eps2.astype(dtype)[:, None], np.empty(c, dtype), np.empty(c, dtype))
+        return ws
+
+    def _correct(self, g: np.ndarray, mag: np.ndarray, corrected: np.ndarray):
+        """Rescale the vectors g (n, dim) in place to law(|g|) along g."""
+        np.multiply(g[:, 0], g[:, 0], out=mag)
+        for j in range(1, g.shape[1]):
+            np.multiply(g[:, j], g[:, j], out=corrected)
+            mag += corrected
+        np.sqrt(mag, out=mag)
+        self.law(mag, out=corrected)
+        np.divide(corrected, mag, out=corrected, where=mag > 0)
+        corrected[mag == 0] = 0.0
+        for j in range(g.shape[1]):
+            g[:, j] *= corrected
+
+    def field(self, targets: np.ndarray, cores: np.ndarray,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Acceleration at arbitrary points.
+
+        Parameters:
+        -----------
+        targets : np.ndarray
+            Points, shape (M, dim)
+        cores : np.ndarray
+            Source positions, shape (K, dim)
+        out : np.ndarray, optional
+            Result buffer, shape (M, dim)
+
+        Returns:
+        --------
+        np.ndarray
+            Law-corrected acceleration vectors, shape (M, dim)
+        """
+        m, dim = targets.shape
+        if out is None:
+            out = np.empty((dim, m), targets.dtype).T
+        diff_buf, r2_buf, w_buf, gm, eps2, mag_buf, cor_buf = self._workspace(dim, targets.dtype)
+        start = time.perf_counter()
+        for lo in range(0, m, self.chunk):
+            hi = min(lo + self.chunk, m)
+            n = hi - lo
+            g = out[lo:hi]
+            for s in range(0, self.n_cores, self.source_block):
+                e = min(s + self.source_block, self.n_cores)
+                diff, r2, w = diff_buf[:, :e - s, :n], r2_buf[:e - s, :n], w_buf[:e - s, :n]
+
+                np.copyto(r2, eps2[s:e])
+                for j in range(dim):
+                    np.subtract(cores[s:e, j, None], targets[lo:hi, j], out=diff[j])
+                    np.multiply(diff[j], diff[j], out=w)
+                    r2 += w
+
+                # w = 1 / r^3, left at 0 for a target sitting on an unsoftened source
+                np.sqrt(r2, out=w)
+                w *= r2
+                np.divide(1.0, w, out=w, where=w > 0)
+
+                # g_j = sum_k G m_k w_k d_kj: one matrix-vector product per coordinate
+                for j in range(dim):
+                    diff[j] *= w
+                    if s == 0:
+                        np.matmul(gm[s:e], diff[j], out=g[:, j])
+                    else:
+                        np.matmul(gm[s:e], diff[j], out=cor_buf[:n])
+                        g[:, j] += cor_buf[:n]
+            if self.law is not NEWTON:
+                self._correct(g, mag_buf[:n], cor_buf[:n])
+        self.last_seconds = time.perf_counter() - start
+        self.last_pairs = m * self.n_cores
+        return out
+
+    def core_accelerations(self, cores: np.ndarray) -> np.ndarray:
+        """Law-corrected field of the other cores on every core, shape (K, dim)."""
+        diff = cores[None, :, :] - cores[:, None, :]
+        r2 = np.sum(diff * diff, axis=-1) + np.asarray(self.softening, dtype=float)**2
+        np.fill_diagonal(r2, np.inf)
+        g = np.einsum('ij,ijk->ik', self.G * self.masses[None, :] / (r2 * np.sqrt(r2)), diff)
+        if self.law is not NEWTON:
+            self._correct(g, np.empty(len(g)), np.empty(len(g)))
+        return g
+
+    def __call__(self, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Engine force: cores in positions[:K], test particles after them."""
+        k = self.n_cores
+        if out is None:
+            out = np.empty((positions.shape[1], len(positions)), positions.dtype).T
+        cores = positions[:k]
+        out[:k] = self.core_accelerations(cores)
+        self.field(positions[k:], np.ascontiguousarray(cores), out=out[k:])
+        return out
+
+
+def parabolic_encounter(masses: Sequence[float], pericentre: float, separation: float,
+                        G: float = 1.0, dim: int = 2):
+    """
+    Two cores approaching on a Newtonian parabolic orbit, centre-of-mass frame.
+
+    The relative orbit has energy 0 and angular momentum sqrt(2 G M q) for
+    pericentre q; the cores start `separation` apart, inbound. (Under an
+    entropic law the actual orbit is more strongly bound.)
+
+    Returns:
+    --------
+    (np.ndarray, np.ndarray)
+        Core positions and velocities, shape (2, dim)
+    """
+    m1, m2 = masses
+    total = m1 + m2
+    if separation < pericentre:
+        raise ValueError("separation must be at least the pericentre distance")
+    speed = np.sqrt(2 * G * total / separation)
+    v_t = np.sqrt(2 * G * total * pericentre) / separation
+    v_r = -np.sqrt(max(speed**2 - v_t**2, 0.0))
+    rel_pos = np.zeros(dim)
+    rel_vel = np.zeros(dim)
+    rel_pos[0] = separation
+    rel_vel[:2] = v_r, v_t
+    # Core 2 relative to core 1, masses weighting the centre of mass
+    positions = np.array([-m2 / total * rel_pos, m1 / total * rel_pos])
+    velocities = np.array([-m2 / total * rel_vel, m1 / total * rel_vel])
+    return positions, velocities
+
+
+def _incline(vectors: np.ndarray, inclination: float) -> np.ndarray:
+    """Rotate (N, 3) vectors about the x axis."""
+    c, s = np.cos(inclination), np.sin(inclination)
+    y, z = vectors[:, 1].copy(), vectors[:, 2].copy()
+    vectors[:, 1] = c * y - s * z
+    vectors[:, 2] = s * y + c * z
+    return vectors
+
+
+def core_disks(core_positions, core_velocities, masses, n_per_disk: Union[int, Sequence[int]],
+               r_min: float, r_max: float, law=NEWTON, G: float = 1.0, dt: float = 0.1,
+               softening: float = 1.0, spins: Optional[Sequence[int]] = None,
+               inclinations: Optional[Sequence[float]] = None,
+               integrator: Union[str, Integrator] = 'leapfrog', dtype=np.float64,
+               chunk: Optional[int] = None) -> ParticleEngine:
+    """
+    Engine for moving cores, each carrying a disk of test particles.
+
+    Parameters:
+    -----------
+    core_positions, core_velocities : array_like
+        Core state, shape (K, dim) with dim 2 or 3
+    masses : array_like
+        Core masses
+    n_per_disk : int or sequence of int
+        Test particles around each core (0 for a bare perturber)
+    r_min, r_max : float
+        Disk annulus (see particle_engine.disk_positions)
+    law : callable
+        Interpolation law applied to the total field magnitude
+    G, softening : float
+        Gravitational constant and core softening length
+    dt : float
+        Time step
+    spins : sequence of int, optional
+        +1 (counter-clockwise, default) or -1 (retrograde) per disk
+    inclinations : sequence of float, optional
+        Tilt of each disk about the x axis in radians (3D only)
+    integrator : str or Integrator
+        Symplectic scheme
+    dtype : np.dtype
+        Floating type of the state
+    chunk : int, optional
+        Targets per field block (see CoreField)
+
+    Returns:
+    --------
+    ParticleEngine
+        Cores in the first K rows of the store, disks after them in core order
+    """
+    core_positions = np.asarray(core_positions, dtype=float)
+    core_velocities = np.asarray(core_velocities, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    k, dim = core_positions.shape
+    counts = np.broadcast_to(n_per_disk, (k,))
+    spins = np.ones(k) if spins is None else np.asarray(spins)
+    inclinations = np.zeros(k) if inclinations is None else np.asarray(inclinations)
+    if dim == 2 and np.any(inclinations != 0):
+        raise ValueError("Inclined disks need dim=3")
+
+    positions, velocities = [core_positions], [core_velocities]
+    for i in range(k):
+        local = disk_positions(int(counts[i]), r_min, r_max, dim=dim)
+        isolated = CoreField(masses[i], law, G, softening)
+        pull = np.linalg.norm(isolated.field(local, np.zeros((1, dim))), axis=1)
+        vel = spins[i] * circular_velocities(local, pull)
+        if inclinations[i] != 0:
+            local, vel = _incline(local, inclinations[i]), _incline(vel, inclinations[i])
+        positions.append(local + core_positions[i])
+        velocities.append(vel + core_velocities[i])
+
+    store = ParticleStore.from_arrays(np.concatenate(positions), np.concatenate(velocities), dtype)
+    return ParticleEngine(store, CoreField(masses, law, G, softening, chunk), integrator, dt)
+
+
+def benchmark(n: int = 100_000, steps: int = 200, a0: float = 1e-3):
+    """Time a two-galaxy encounter with n test particles per step and per interaction."""
+    from interpolation_laws import InterpolationLaw
+
+    np.random.seed(0)
+    cores, velocities = parabolic_encounter((1e4, 1e4), pericentre=400.0, separation=1200.0)
+    engine = core_disks(cores, velocities, (1e4, 1e4), n // 2, 10.0, 150.0,
+                        InterpolationLaw('simple', a0), dt=0.5, softening=5.0)
+    start = time.perf_counter()
+    for _ in engine.iter_steps(steps, every=steps):
+        pass
+    seconds = time.perf_counter() - start
+    field = engine.force
+    print(f"N={n:7d} steps={steps}: {seconds / steps * 1e3:.1f} ms/step "
+          f"({field.pairs_per_second:.3e} core-particle interactions/s), "
+          f"core separation {np.linalg.norm(np.subtract(*engine.store.positions[:2])):.0f}")
+
+
+if __name__ == "__main__":
+    print("=== Galaxy Flyby Benchmark ===")
+    benchmark()
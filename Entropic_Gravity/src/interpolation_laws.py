@@ -0,0 +1,538 @@
+"""
+Interpolation Laws Module: Vectorized Entropic Acceleration Kernels
+-------------------------------------------------------------------
+
+Single home for the interpolation functions that map the Newtonian
+acceleration g_N onto the observed (entropic / MOND) acceleration g.
+Every simulation and validation module evaluates its force law here, so
+one optimized kernel serves the whole codebase.
+
+Available laws (all take g_N arrays of any shape and return arrays):
+- 'newton':       g = g_N
+- 'naive_switch': g = g_N if g_N > a0 else sqrt(a0 g_N)   (original hard switch)
+- 'simple':       mu(x) = x/(1+x)          -> g = (g_N + sqrt(g_N^2 + 4 a0 g_N)) / 2
+- 'standard':     mu(x) = x/sqrt(1+x^2)    -> g^2 = (g_N^2 + g_N sqrt(g_N^2 + 4 a0^2)) / 2
+- 'exponential':  g = g_N / (1 - exp(-sqrt(g_N/a0)))       (McGaugh 2016 RAR)
+- 'verlinde2016': g = g_N + sqrt(a0 g_N)                   (Verlinde 2016 apparent DM)
+
+law_derivative gives dg/dg_N (closed form for the laws above).
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+LawFunction = Callable[..., np.ndarray]
+
+
+def _floating(x) -> np.ndarray:
+    """x as a float array, keeping float32 inputs in single precision."""
+    x = np.asarray(x)
+    return x.astype(np.result_type(x.dtype, np.float32), copy=False)
+
+
+def _prepare(g_n, out: Optional[np.ndarray]):
+    """Return (g_N as float array, output buffer)."""
+    g = _floating(g_n)
+    if out is None:
+        out = np.empty_like(g)
+    return g, out
+
+
+def _scratch(g: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Work array for a law: out itself unless it aliases the input."""
+    return np.empty_like(g) if np.may_share_memory(g, out) else out
+
+
+def _result(out: np.ndarray):
+    """Unwrap 0-d results so scalar callers get scalars back."""
+    return out if out.ndim else out[()]
+
+
+def newton(g_n, a0: float = 0.0, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Identity law: no entropic correction."""
+    g, out = _prepare(g_n, out)
+    np.copyto(out, g)
+    return _result(out)
+
+
+def naive_switch(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Original regime switch: Newtonian above a0, deep-MOND below.
+    Continuous, but with a kink (discontinuous derivative) at g_N = a0.
+    """
+    g, out = _prepare(g_n, out)
+    # g > a0 exactly when g > sqrt(a0 g), so the switch is a maximum
+    deep = np.multiply(g, a0, out=_scratch(g, out))
+    np.sqrt(deep, out=deep)
+    np.maximum(g, deep, out=out)
+    return _result(out)
+
+
+def simple_mu(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simple interpolation function mu(x) = x/(1+x), inverted in closed form:
+    g = (g_N + sqrt(g_N^2 + 4 g_N a0)) / 2
+    """
+    g, out = _prepare(g_n, out)
+    tmp = np.add(g, 4.0 * a0, out=_scratch(g, out))
+    np.multiply(tmp, g, out=tmp)
+    np.sqrt(tmp, out=tmp)
+    np.add(tmp, g, out=out)
+    out *= 0.5
+    return _result(out)
+
+
+def standard_mu(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Standard interpolation function mu(x) = x/sqrt(1+x^2).
+    g mu(g/a0) = g_N is a quadratic in g^2, so:
+    g = sqrt((g_N^2 + g_N sqrt(g_N^2 + 4 a0^2)) / 2)
+    """
+    g, out = _prepare(g_n, out)
+    tmp = np.multiply(g, g, out=_scratch(g, out))
+    tmp += 4.0 * a0 * a0
+    np.sqrt(tmp, out=tmp)
+    tmp += g
+    tmp *= g
+    tmp *= 0.5
+    np.sqrt(tmp, out=out)
+    return _result(out)
+
+
+def exponential(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Exponential law of the Radial Acceleration Relation (McGaugh 2016):
+    g = g_N / (1 - exp(-sqrt(g_N/a0)))
+    Tends to sqrt(a0 g_N) -> 0 as g_N -> 0, which is returned exactly at g_N = 0.
+    """
+    g, out = _prepare(g_n, out)
+    tmp = np.divide(g, a0, out=np.empty_like(g))
+    np.sqrt(tmp, out=tmp)
+    np.negative(tmp, out=tmp)
+    np.expm1(tmp, out=tmp)
+    np.negative(tmp, out=tmp)
+    positive = tmp > 0
+    np.divide(g, tmp, out=tmp, where=positive)
+    np.copyto(tmp, 0.0, where=~positive)
+    np.copyto(out, tmp)
+    return _result(out)
+
+
+def verlinde2016(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Verlinde (2016) apparent dark matter for a point mass:
+    g = g_N + g_D with g_D = sqrt(a0 g_N)
+    """
+    g, out = _prepare(g_n, out)
+    tmp = np.multiply(g, a0, out=_scratch(g, out))
+    np.sqrt(tmp, out=tmp)
+    np.add(tmp, g, out=out)
+    return _result(out)
+
+
+LAWS: Dict[str, LawFunction] = {
+    'newton': newton,
+    'naive_switch': naive_switch,
+    'simple': simple_mu,
+    'standard': standard_mu,
+    'exponential': exponential,
+    'verlinde2016': verlinde2016,
+}
+
+
+# Derivatives dg/dg_N of the closed-form laws, e.g. for the epicyclic
+# frequency kappa^2 = (3 g - 2 g_N g'(g_N)) / r. They accept array a0
+# broadcasting against g_N and diverge like sqrt(a0 / g_N) as g_N -> 0.
+
+def _newton_derivative(g_n, a0):
+    return np.ones(np.broadcast(g_n, a0).shape)
+
+
+def _naive_switch_derivative(g_n, a0):
+    deep = 0.5 * np.sqrt(a0 / g_n)
+    return np.where(g_n > a0, 1.0, deep)
+
+
+def _simple_derivative(g_n, a0):
+    root = np.sqrt(g_n * (g_n + 4.0 * a0))
+    return 0.5 * (1.0 + (g_n + 2.0 * a0) / root)
+
+
+def _standard_derivative(g_n, a0):
+    root = np.sqrt(g_n * g_n + 4.0 * a0 * a0)
+    g = np.sqrt(0.5 * g_n * (g_n + root))
+    return (2.0 * g_n + root + g_n * g_n / root) / (4.0 * g)
+
+
+def _exponential_derivative(g_n, a0):
+    u = np.sqrt(g_n / a0)
+    e = np.exp(-u)
+    one_minus = -np.expm1(-u)
+    return 1.0 / one_minus - 0.5 * u * e / one_minus**2
+
+
+def _verlinde2016_derivative(g_n, a0):
+    return 1.0 + 0.5 * np.sqrt(a0 / g_n)
+
+
+DERIVATIVES: Dict[str, LawFunction] = {
+    'newton': _newton_derivative,
+    'naive_switch': _naive_switch_derivative,
+    'simple': _simple_derivative,
+    'standard': _standard_derivative,
+    'exponential': _exponential_derivative,
+    'verlinde2016': _verlinde2016_derivative,
+}
+
+
+def law_derivative(name: str, g_n, a0, rel_step: float = 1e-6) -> np.ndarray:
+    """
+    dg/dg_N of a law at g_N, analytic where registered, otherwise a
+    relative central difference.
+
+    Parameters:
+    -----------
+    name : str
+        Registry key of the law
+    g_n : array_like
+        Newtonian accelerations (> 0)
+    a0 : float or array_like
+        Acceleration scale, broadcast against g_n
+    rel_step : float
+        Relative step of the finite-difference fallback
+    """
+    g_n = np.asarray(g_n, dtype=float)
+    if name in DERIVATIVES:
+        return DERIVATIVES[name](g_n, a0)
+    law = get_law(name)
+    shape = np.broadcast(g_n, a0).shape
+    g_n = np.broadcast_to(g_n, shape)
+    h = rel_step * g_n
+    return (law(g_n + h, a0) - law(g_n - h, a0)) / (2.0 * h)
+
+
+def law_from_mu(mu: Callable[[np.ndarray], np.ndarray],
+                dmu: Callable[[np.ndarray], np.ndarray],
+                max_iter: int = 50, tol: float = 1e-14) -> LawFunction:
+    """
+    Build a law from an interpolation function mu(x) with no closed-form inverse.
+
+    Solves x mu(x) = g_N / a0 for x = g / a0 with vectorized Newton iterations
+    started from the simple-law solution. These laws are the expensive ones;
+    wrap them in a TabulatedLaw for large particle counts.
+
+    Parameters:
+    -----------
+    mu : callable
+        Interpolation function, vectorized over x
+    dmu : callable
+        Derivative mu'(x), vectorized over x
+    max_iter : int
+        Newton iteration cap
+    tol : float
+        Relative convergence tolerance on x
+
+    Returns:
+    --------
+    callable
+        func(g_n, a0, out=None) suitable for register_law
+    """
+    def law(g_n, a0: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        g, out = _prepare(g_n, out)
+        # 1-d working copies: scalar inputs index like arrays in the loop
+        y = np.atleast_1d(g / a0)
+        x = np.array(simple_mu(y, 1.0), dtype=float, ndmin=1)
+        active = x > 0
+        for _ in range(max_iter):
+            xa = x[active]
+            f = xa * mu(xa) - y[active]
+            df = mu(xa) + xa * dmu(xa)
+            step = f / df
+            x[active] = xa - step
+            converged = np.abs(step) <= tol * np.abs(xa)
+            if np.all(converged):
+                break
+            active[np.flatnonzero(active)[converged]] = False
+        np.multiply(x.reshape(out.shape), a0, out=out)
+        return _result(out)
+
+    return law
+
+
+def register_law(name: str, func: LawFunction,
+                 derivative: Optional[LawFunction] = None) -> None:
+    """
+    Register an additional interpolation law.
+
+    Parameters:
+    -----------
+    name : str
+        Registry key
+    func : callable
+        func(g_n, a0, out=None) -> array of the same shape as g_n
+    derivative : callable, optional
+        derivative(g_n, a0) -> dg/dg_N; without it law_derivative falls
+        back to finite differences
+    """
+    LAWS[name] = func
+    DERIVATIVES.pop(name, None)
+    if derivative is not None:
+        DERIVATIVES[name] = derivative
+
+
+def get_law(name: str) -> LawFunction:
+    """Look up a law by name, with a helpful error for typos."""
+    try:
+        return LAWS[name]
+    except KeyError:
+        raise ValueError(f"Unknown interpolation law '{name}'. "
+                         f"Available: {', '.join(sorted(LAWS))}") from None
+
+
+@dataclass(frozen=True)
+class InterpolationLaw:
+    """
+    Parameter object binding a named law to its acceleration scale a0.
+
+    Instances are shared between simulations and validation modules so that
+    every caller evaluates exactly the same kernel.
+    """
+    name: str = 'simple'
+    a0: float = 1.0
+
+    def __post_init__(self):
+        get_law(self.name)  # validate eagerly
+
+    def __call__(self, g_n, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return LAWS[self.name](g_n, self.a0, out=out)
+
+    def derivative(self, g_n) -> np.ndarray:
+        """dg/dg_N at g_N (see law_derivative)."""
+        return law_derivative(self.name, g_n, self.a0)
+
+
+NEWTON = InterpolationLaw('newton', 0.0)
+
+
+def newtonian_acceleration(r, mass, G: float = 1.0, r_min: float = 0.0,
+                           out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Newtonian point-mass acceleration magnitude G M / r^2.
+
+    Parameters:
+    -----------
+    r : array_like
+        Distances from the mass (any shape)
+    mass : float or array_like
+        Source mass (broadcast against r)
+    G : float
+        Gravitational constant
+    r_min : float
+        Radii below this return 0 instead of diverging
+
+    Returns:
+    --------
+    np.ndarray
+        Acceleration magnitudes, same shape as r
+    """
+    r = _floating(r)
+    if out is None:
+        out = np.empty(np.broadcast(r, mass).shape, dtype=r.dtype)
+    # Scalar masses stay Python floats so float32 radii are not promoted
+    gm = G * float(mass) if np.ndim(mass) == 0 else G * np.asarray(mass, dtype=float)
+    np.multiply(r, r, out=out)
+    if r_min > 0:
+        small = np.less(r, r_min)
+    else:
+        small = None if out.all() else np.equal(out, 0.0)
+    if small is not None and small.any():
+        out[small] = 1.0  # placeholder, avoids division by zero
+        np.divide(gm, out, out=out)
+        out[small] = 0.0
+    else:
+        np.divide(gm, out, out=out)
+    return _result(out)
+
+
+def point_mass_acceleration(r, mass, law: InterpolationLaw, G: float = 1.0,
+                            r_min: float = 0.0,
+                            out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Entropic acceleration magnitude around a point mass: law(G M / r^2).
+
+    Parameters:
+    -----------
+    r : array_like
+        Distances from the mass
+    mass : float or array_like
+        Source mass
+    law : InterpolationLaw
+        Interpolation law and a0
+    G : float
+        Gravitational constant
+    r_min : float
+        Radii below this return 0
+
+    Returns:
+    --------
+    np.ndarray
+        Acceleration magnitudes, same shape as r
+    """
+    g_n = newtonian_acceleration(r, mass, G, r_min, out=out)
+    return law(g_n, out=g_n if isinstance(g_n, np.ndarray) else None)
+
+
+def apply_to_field(g_vec, law: InterpolationLaw, axis: int = -1,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Apply the entropic correction to a Newtonian vector field.
+
+    The interpolation acts on the MAGNITUDE of the total field and the
+    direction is preserved: g = law(|g_N|) * g_N / |g_N|.
+
+    Parameters:
+    -----------
+    g_vec : array_like
+        Newtonian acceleration vectors, components along `axis`
+    law : InterpolationLaw
+        Interpolation law and a0
+    axis : int
+        Axis holding the vector components
+
+    Returns:
+    --------
+    np.ndarray
+        Corrected vectors, same shape as g_vec (zero where |g_N| = 0)
+    """
+    g_vec = _floating(g_vec)
+    g_mag = np.sqrt(np.sum(g_vec * g_vec, axis=axis, keepdims=True))
+    factor = law(g_mag)
+    nonzero = g_mag > 0
+    np.divide(factor, g_mag, out=factor, where=nonzero)
+    np.copyto(factor, 0.0, where=~nonzero)
+    if out is None:
+        return g_vec * factor
+    return np.multiply(g_vec, factor, out=out)
+
+
+class TabulatedLaw:
+    """
+    Precomputed lookup table of g(g_N) for one (law, a0) pair.
+
+    The table is uniform in ln(g_N) over [a0 10^-decades, a0 10^decades] and
+    stores ln(g), so power-law regimes are interpolated almost exactly. The
+    grid is refined until the measured relative error is below `rtol`; g_N = a0
+    always falls on a node, which makes the naive switch exact. Inputs outside
+    the table (including g_N = 0) fall back to the exact law.
+
+    Evaluation writes into scratch buffers owned by the table and reused
+    between calls of the same size, so instances are not thread-safe.
+    """
+
+    def __init__(self, law: InterpolationLaw, rtol: float = 1e-6,
+                 decades: float = 10.0, max_nodes: int = 2**22):
+        if law.a0 <= 0:
+            raise ValueError("Tabulation requires a positive a0")
+        self.law = law
+        self.rtol = rtol
+
+        half_span = decades * np.log(10.0)
+        half_cells = 64
+        while True:
+            n_nodes = 2 * half_cells + 1
+            u = np.linspace(-half_span, half_span, n_nodes) + np.log(law.a0)
+            v = np.log(law(np.exp(u)))
+            dv = np.diff(v)
+            max_error = self._measure_error(u, v, dv)
+            if max_error <= rtol:
+                break
+            half_cells *= 2
+            if 2 * half_cells + 1 > max_nodes:
+                raise ValueError(f"Cannot reach rtol={rtol} for law '{law.name}' "
+                                 f"with at most {max_nodes} nodes")
+
+        self.max_error = max_error
+        self.n_nodes = n_nodes
+        self._u0 = u[0]
+        self._inv_h = (n_nodes - 1) / (u[-1] - u[0])
+        self._v = v
+        self._dv = np.append(dv, 0.0)  # t = n-1 picks a zero slope
+        self._size = -1
+
+    def _measure_error(self, u, v, dv) -> float:
+        """Max relative error at interior points of every cell."""
+        frac = np.array([0.25, 0.5, 0.75])
+        h = u[1] - u[0]
+        u_test = u[:-1, None] + h * frac
+        exact = self.law(np.exp(u_test))
+        approx = np.exp(v[:-1, None] + dv[:, None] * frac)
+        return float(np.max(np.abs(approx / exact - 1.0)))
+
+    def _workspace(self, size: int):
+        if size != self._size:
+            self._t = np.empty(size)
+            self._slope = np.empty(size)
+            self._idx = np.empty(size, dtype=np.intp)
+            self._inside = np.empty(size, dtype=bool)
+            self._below_top = np.empty(size, dtype=bool)
+            self._contiguous = None  # result buffer for a strided `out`, on demand
+            self._size = size
+
+    def __call__(self, g_n, out: Optional[np.ndarray] = None) -> np.ndarray:
+        g, out = _prepare(g_n, out)
+        self._workspace(g.size)
+        flat_g = g.reshape(-1)
+        strided = not out.flags.c_contiguous
+        if strided:
+            # reshape would copy a strided `out`: fill a contiguous buffer instead
+            if self._contiguous is None:
+                self._contiguous = np.empty(g.size)
+            flat_out = self._contiguous
+        else:
+            flat_out = out.reshape(-1)
+        t, slope, idx = self._t, self._slope, self._idx
+
+        # Fractional table coordinate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.log(flat_g, out=t)
+        t -= self._u0
+        t *= self._inv_h
+        last = self.n_nodes - 1
+        np.greater_equal(t, 0.0, out=self._inside)  # False for NaN too
+        np.less_equal(t, last, out=self._below_top)
+        self._inside &= self._below_top
+        outside = None
+        if not self._inside.all():
+            outside = np.flatnonzero(~self._inside)
+            g_outside = flat_g[outside]  # copy: out may alias g_n
+            t[outside] = 0.0
+
+        # Linear interpolation of ln(g) in ln(g_N)
+        np.copyto(idx, t, casting='unsafe')
+        t -= idx
+        np.take(self._dv, idx, out=slope, mode='clip')  # 'raise' buffers out
+        slope *= t
+        np.take(self._v, idx, out=flat_out, mode='clip')
+        flat_out += slope
+        np.exp(flat_out, out=flat_out)
+
+        if outside is not None:
+            flat_out[outside] = self.law(g_outside)
+        if strided:
+            np.copyto(out, flat_out.reshape(out.shape))
+        return _result(out)
+
+
+@lru_cache(maxsize=None)
+def tabulate(law: InterpolationLaw, rtol: float = 1e-6):
+    """
+    Cached TabulatedLaw for (law, a0, rtol); built once per process.
+
+    The identity 'newton' law is returned unchanged since it is already
+    cheaper than any table lookup.
+    """
+    if law.name == 'newton':
+        return law
+    return TabulatedLaw(law, rtol)
@@ -0,0 +1,206 @@
+"""
+Lensing Maps Module: FFT Deflection, Shear and Magnification of Mass Maps
+-------------------------------------------------------------------------
+
+Thin-lens maps of a surface density Sigma (kg/m^2 on a regular grid, e.g.
+the projected particle catalog of lensing_simulation.generate_mass_map).
+
+- The deflection angle alpha(xi) = (4 G / c^2) int Sigma(xi') (xi - xi') /
+  |xi - xi'|^2 d^2xi' is a convolution: both components are computed by
+  FFT with the kernel sampled on a zero-padded (2 nx, 2 ny) grid, so the
+  lens is isolated (no periodic images, Hockney & Eastwood). The kernel
+  FFTs depend only on the grid and are cached by LensingMesh.
+- Entropic correction: the in-plane Newtonian field of the projected mass,
+  g = G int Sigma (xi' - xi) / |xi' - xi|^3 d^2xi', comes from a second
+  pair of kernels; the deflection is rescaled by law(|g|) / |g|. For a
+  point mass this is alpha = 4 g_entropic r / c^2, the M_eff = g r^2 / G
+  rule of calculate_deflection_angle.
+- With the lens distance factor D = D_l D_ls / D_s the Jacobian of the lens
+  mapping is A = I - D d(alpha)/d(xi) (central differences): convergence
+  kappa = Sigma / Sigma_cr, effective (entropic) convergence, shear
+  gamma_1, gamma_2 and magnification mu = 1 / det A.
+
+Transforms use scipy.fft in single precision by default, on all cores:
+a 4096^2 map needs a few 8192^2 transforms of about a second each.
+"""
+
+import numpy as np
+import scipy.fft
+from typing import Optional, Tuple
+
+G_SI = 6.674e-11
+C_SI = 3.0e8
+
+
+def critical_density(distance: float, G: float = G_SI, c: float = C_SI) -> float:
+    """Sigma_cr = c^2 / (4 pi G D) for D = D_l D_ls / D_s."""
+    return c**2 / (4 * np.pi * G * distance)
+
+
+class LensingMesh:
+    """
+    FFT lensing solver for Sigma maps of one grid geometry.
+
+    Parameters:
+    -----------
+    shape : (int, int)
+        Map shape (nx, ny); axis 0 is x, axis 1 is y (np.histogram2d order)
+    pixel : float
+        Pixel side in metres
+    G, c : float
+        Gravitational constant and speed of light
+    dtype : np.dtype
+        Float type of the transforms (float32 halves time and memory)
+    workers : int
+        scipy.fft worker threads (-1: all cores)
+    """
+
+    def __init__(self, shape: Tuple[int, int], pixel: float, G: float = G_SI, c: float = C_SI,
+                 dtype=np.float32, workers: int = -1):
+        self.shape = tuple(shape)
+        self.padded = tuple(2 * n for n in self.shape)
+        self.pixel = pixel
+        self.G = G
+        self.c = c
+        self.dtype = np.dtype(dtype)
+        self.workers = workers
+        self._hats = {}
+
+    def _offsets(self):
+        """Signed separations on the padded grid (the unused +-n row is 0), sparse."""
+        axes = []
+        for n in self.shape:
+            k = np.arange(2 * n)
+            d = np.where(k < n, k, k - 2 * n) * self.pixel
+            d[n] = 0.0
+            axes.append(d.astype(self.dtype))
+        return np.meshgrid(*axes, indexing='ij', sparse=True)
+
+    def _kernel_hats(self, kind: str):
+        """FFTs of the (x, y) kernels of 'alpha' (d / d^2) or 'field' (-d / d^3), cached."""
+        if kind not in self._hats:
+            dx, dy = self._offsets()
+            # Built in units of the pixel and in self.dtype, scaled at the end
+            dx, dy = dx / self.pixel, dy / self.pixel
+            weight = dx**2 + dy**2
+            weight[weight == 0] = np.inf   # no self-deflection of a pixel
+            if kind == 'alpha':
+                np.reciprocal(weight, out=weight)
+                scale = 4 * self.G * self.pixel / self.c**2
+            else:
+                weight *= np.sqrt(weight)
+                np.reciprocal(weight, out=weight)
+                scale = -self.G
+            self._hats[kind] = tuple(
+                scipy.fft.rfft2(d * weight, workers=self.workers) * self.dtype.type(scale)
+                for d in (dx, dy))
+        return self._hats[kind]
+
+    def _convolve(self, sigma_hat, kernel_hat) -> np.ndarray:
+        nx, ny = self.shape
+        out = scipy.fft.irfft2(sigma_hat * kernel_hat, s=self.padded, workers=self.workers)
+        return np.ascontiguousarray(out[:nx, :ny])
+
+    def deflection(self, sigma: np.ndarray, law=None):
+        """
+        Deflection angle field.
+
+        Parameters:
+        -----------
+        sigma : np.ndarray
+            Surface density, shape `shape`
+        law : callable, optional
+            Interpolation law; None for the GR (baryons only) deflection
+
+        Returns:
+        --------
+        (np.ndarray, np.ndarray or None)
+            alpha, shape (2, nx, ny) in radians, and the entropic boost
+            law(|g|) / |g| (None without a law)
+        """
+        sigma = np.asarray(sigma, dtype=self.dtype)
+        if sigma.shape != self.shape:
+            raise ValueError(f"Sigma has shape {sigma.shape}, the mesh {self.shape}")
+        sigma_hat = scipy.fft.rfft2(sigma, s=self.padded, workers=self.workers)
+        alpha = np.stack([self._convolve(sigma_hat, k) for k in self._kernel_hats('alpha')])
+        if law is None:
+            return alpha, None
+        g = [self._convolve(sigma_hat, k) for k in self._kernel_hats('field')]
+        g_mag = np.hypot(g[0], g[1]).astype(float)
+        boost = law(g_mag)
+        np.divide(boost, g_mag, out=boost, where=g_mag > 0)
+        boost[g_mag == 0] = 1.0
+        alpha *= boost.astype(self.dtype)
+        return alpha, boost
+
+    def maps(self, sigma: np.ndarray, distance: float, law=None) -> dict:
+        """
+        Full set of lensing maps.
+
+        Parameters:
+        -----------
+        sigma : np.ndarray
+            Surface density (kg/m^2), shape `shape`
+        distance : float
+            D_l D_ls / D_s in metres
+        law : callable, optional
+            Interpolation law applied to the in-plane field magnitude
+
+        Returns:
+        --------
+        dict
+            'kappa' (Sigma / Sigma_cr), 'alpha_x', 'alpha_y' (radians),
+            'boost' (entropic deflection factor, ones for GR), and from the
+            Jacobian of the mapping 'kappa_eff', 'gamma1', 'gamma2', 'gamma'
+            and 'magnification' (signed, infinite on critical curves)
+        """
+        alpha, boost = self.deflection(sigma, law)
+        # d(alpha_i)/d(xi_j), scaled to the dimensionless Jacobian
+        dax_dx, dax_dy = np.gradient(alpha[0], self.pixel)
+        day_dx, day_dy = np.gradient(alpha[1], self.pixel)
+        kappa_eff = 0.5 * distance * (dax_dx + day_dy)
+        gamma1 = 0.5 * distance * (dax_dx - day_dy)
+        gamma2 = 0.5 * distance * (dax_dy + day_dx)
+        gamma = np.hypot(gamma1, gamma2)
+        det = (1.0 - kappa_eff)**2 - gamma**2
+        with np.errstate(divide='ignore'):
+            magnification = 1.0 / det
+        return {
+            'kappa': np.asarray(sigma, dtype=float) / critical_density(distance, self.G, self.c),
+            'alpha_x': alpha[0], 'alpha_y': alpha[1],
+            'boost': np.ones(self.shape) if boost is None else boost,
+            'kappa_eff': kappa_eff, 'gamma1': gamma1, 'gamma2': gamma2, 'gamma': gamma,
+            'magnification': magnification,
+        }
+
+
+def lensing_maps(sigma: np.ndarray, pixel: float, distance: float, law=None,
+                 G: float = G_SI, c: float = C_SI, dtype=np.float32,
+                 workers: int = -1) -> dict:
+    """One-off LensingMesh(sigma.shape, pixel, ...).maps(sigma, distance, law)."""
+    mesh = LensingMesh(np.shape(sigma), pixel, G, c, dtype, workers)
+    return mesh.maps(sigma, distance, law)
+
+
+def benchmark(n: int = 4096, law: Optional[object] = None):
+    """Time the maps of an exponential disk on an n x n grid."""
+    import time
+    from interpolation_laws import InterpolationLaw
+
+    kpc = 3.086e19
+    law = law or InterpolationLaw('naive_switch', 1.2e-10)
+    pixel = 50 * kpc / n
+    x = (np.arange(n) - n / 2 + 0.5) * pixel
+    r = np.hypot(x[:, None], x[None, :])
+    sigma = 1e11 * 1.989e30 / (2 * np.pi * (5 * kpc)**2) * np.exp(-r / (5 * kpc))
+    mesh = LensingMesh((n, n), pixel)
+    for label in ('first call (kernel FFTs)', 'cached kernels'):
+        start = time.perf_counter()
+        maps = mesh.maps(sigma, 1e9 * 3.086e16, law)
+        print(f"{n}x{n} entropic maps, {label}: {time.perf_counter() - start:.1f} s "
+              f"(max boost {maps['boost'].max():.1f})")
+
+
+if __name__ == "__main__":
+    print("=== Lensing Maps Benchmark ===")
+    benchmark()
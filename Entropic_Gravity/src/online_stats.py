@@ -0,0 +1,255 @@
+"""
+Online Statistics Module: Streaming Rotation Curves and Conservation Checks
+---------------------------------------------------------------------------
+
+Accumulators updated while a simulation runs, so rotation-curve statistics
+need no stored history and cost O(N) per sampled step.
+
+RadialProfile bins the stars by in-plane radius and keeps per-bin sums of
+count, mass, v_r, v_r^2, v_phi and v_phi^2:
+- the bin index of every star is computed once per sample (arithmetic for
+  linear or logarithmic edges, searchsorted otherwise) and every sum is one
+  np.bincount over it; stars outside the edges land in two overflow bins;
+- radii, velocity components and the bin index go to workspace buffers
+  kept between samples, so sampling inside a step loop allocates nothing
+  proportional to N;
+- sums of the latest sample and running totals over all samples are kept,
+  so both the instantaneous and the time-averaged profile can be read out:
+  mean circular velocity <v_phi>, dispersions sigma_r and sigma_phi, and
+  the surface density.
+
+ConservationMonitor tracks total energy (given a potential) and angular
+momentum L_z per sample with their largest relative deviation from the
+first sample.
+"""
+
+import numpy as np
+from typing import Callable, Dict, Optional
+
+# Accumulated per-bin sums, in row order
+_SUMS = ('count', 'mass', 'v_r', 'v_r2', 'v_phi', 'v_phi2')
+
+
+def polar_velocities(positions: np.ndarray, velocities: np.ndarray):
+    """In-plane radius, radial and azimuthal velocity of every particle."""
+    x, y = positions[:, 0], positions[:, 1]
+    r = np.hypot(x, y)
+    safe = np.where(r > 0, r, 1.0)
+    v_r = (x * velocities[:, 0] + y * velocities[:, 1]) / safe
+    v_phi = (x * velocities[:, 1] - y * velocities[:, 0]) / safe
+    return r, v_r, v_phi
+
+
+class RadialProfile:
+    """
+    Streaming radial-bin statistics of a disk.
+
+    Parameters:
+    -----------
+    edges : array_like
+        Increasing bin edges in radius (n_bins + 1 values)
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        if self.edges.ndim != 1 or len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("edges must be a 1D increasing array of at least 2 values")
+        self.n_bins = len(self.edges) - 1
+        steps = np.diff(self.edges)
+        ratios = self.edges[1:] / self.edges[:-1] if self.edges[0] > 0 else None
+        if np.allclose(steps, steps[0], rtol=1e-12):
+            self.spacing = 'linear'
+        elif ratios is not None and np.allclose(ratios, ratios[0], rtol=1e-12):
+            self.spacing = 'log'
+        else:
+            self.spacing = 'irregular'
+        self.centers = 0.5 * (self.edges[1:] + self.edges[:-1])
+        self.area = np.pi * (self.edges[1:]**2 - self.edges[:-1]**2)
+        self._size = -1
+        self.reset()
+
+    def reset(self):
+        """Forget every sample."""
+        self.n_samples = 0
+        self._last = np.zeros((len(_SUMS), self.n_bins + 2))
+        self._total = np.zeros((len(_SUMS), self.n_bins + 2))
+
+    def bin_index(self, r: np.ndarray, out: Optional[np.ndarray] = None,
+                  scratch: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Bin of every radius: 1..n_bins inside the edges, 0 below, n_bins + 1 above.
+
+        out (intp) and scratch (float64, not r) are optional buffers of len(r)
+        for allocation-free linear and logarithmic edges.
+        """
+        e = self.edges
+        if self.spacing == 'irregular':
+            index = np.searchsorted(e, r, side='right')
+            if out is None:
+                return index
+            out[...] = index
+            return out
+        if self.spacing == 'linear':
+            u = np.subtract(r, e[0], out=scratch)
+            u *= self.n_bins / (e[-1] - e[0])
+        else:
+            u = np.divide(r, e[0], out=scratch)
+            with np.errstate(divide='ignore'):
+                np.log(u, out=u)
+            u *= self.n_bins / np.log(e[-1] / e[0])
+        np.clip(u, -1.0, self.n_bins, out=u)
+        np.floor(u, out=u)
+        u += 1
+        if out is None:
+            return u.astype(np.int64)
+        np.copyto(out, u, casting='unsafe')
+        return out
+
+    def _workspace(self, size: int):
+        """Per-star buffers of update(), reallocated only when N changes."""
+        if size != self._size:
+            self._r, self._v_r, self._v_phi, self._tmp = np.empty((4, size))
+            self._index = np.empty(size, dtype=np.intp)
+            self._size = size
+
+    def _polar(self, positions: np.ndarray, velocities: np.ndarray):
+        """polar_velocities into the workspace buffers."""
+        x, y = positions[:, 0], positions[:, 1]
+        vx, vy = velocities[:, 0], velocities[:, 1]
+        r, v_r, v_phi, tmp = self._r, self._v_r, self._v_phi, self._tmp
+        np.hypot(x, y, out=r)
+        np.multiply(x, vx, out=v_r)
+        np.multiply(y, vy, out=tmp)
+        v_r += tmp
+        np.multiply(x, vy, out=v_phi)
+        np.multiply(y, vx, out=tmp)
+        v_phi -= tmp
+        # Numerators vanish at r = 0, so any positive divisor gives 0 there
+        np.maximum(r, np.finfo(float).tiny, out=tmp)
+        v_r /= tmp
+        v_phi /= tmp
+        return r, v_r, v_phi
+
+    def update(self, positions: np.ndarray, velocities: np.ndarray, masses=1.0):
+        """
+        Add one sample of the particle state.
+
+        Per-star intermediates live in workspace buffers, so a sample
+        allocates only the per-bin sums.
+
+        Parameters:
+        -----------
+        positions, velocities : np.ndarray
+            State, shape (N, dim); the disk plane is (x, y)
+        masses : np.ndarray or float
+            Particle masses (for the surface density)
+        """
+        self._workspace(len(positions))
+        r, v_r, v_phi = self._polar(positions, velocities)
+        tmp = self._tmp
+        index = self.bin_index(r, out=self._index, scratch=tmp)
+        size = self.n_bins + 2
+        last = self._last
+        last[0] = np.bincount(index, minlength=size)
+        if np.ndim(masses) == 0:
+            np.multiply(last[0], masses, out=last[1])
+        else:
+            last[1] = np.bincount(index, weights=masses, minlength=size)
+        last[2] = np.bincount(index, weights=v_r, minlength=size)
+        last[3] = np.bincount(index, weights=np.multiply(v_r, v_r, out=tmp), minlength=size)
+        last[4] = np.bincount(index, weights=v_phi, minlength=size)
+        last[5] = np.bincount(index, weights=np.multiply(v_phi, v_phi, out=tmp), minlength=size)
+        self._total += last
+        self.n_samples += 1
+
+    def profile(self, time_average: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Per-bin statistics (NaN in empty bins).
+
+        Parameters:
+        -----------
+        time_average : bool
+            Pool all samples (True) or use only the latest one
+
+        Returns:
+        --------
+        dict
+            'r' (bin centres), 'count' (mean stars per bin), 'v_circ' (mean
+            v_phi), 'v_r' (mean radial velocity), 'sigma_r', 'sigma_phi' and
+            'surface_density' (mean mass per area)
+        """
+        if self.n_samples == 0:
+            raise ValueError("No samples accumulated")
+        sums = self._total / self.n_samples if time_average else self._last
+        sums = sums[:, 1:-1]
+        count = sums[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = sums[2:] / count
+        v_r, v_r2, v_phi, v_phi2 = mean
+        return {
+            'r': self.centers,
+            'count': count,
+            'v_circ': v_phi,
+            'v_r': v_r,
+            'sigma_r': np.sqrt(np.maximum(v_r2 - v_r**2, 0.0)),
+            'sigma_phi': np.sqrt(np.maximum(v_phi2 - v_phi**2, 0.0)),
+            'surface_density': sums[1] / self.area,
+        }
+
+    def state(self) -> dict:
+        """Accumulated sums for a checkpoint."""
+        return {'profile_last': self._last.copy(), 'profile_total': self._total.copy(),
+                'profile_samples': self.n_samples}
+
+    def restore(self, state: dict):
+        self._last[...] = state['profile_last']
+        self._total[...] = state['profile_total']
+        self.n_samples = state['profile_samples']
+
+
+class ConservationMonitor:
+    """
+    Running energy and angular-momentum diagnostics.
+
+    Parameters:
+    -----------
+    potential : callable, optional
+        Specific potential phi(r) of the in-plane radius; without it only
+        kinetic energy and L_z are tracked
+    masses : np.ndarray or float
+        Particle masses
+    """
+
+    def __init__(self, potential: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 masses=1.0):
+        self.potential = potential
+        self.masses = masses
+        self.n_samples = 0
+        self.initial = None
+        self.last = None
+        self.max_deviation = {}
+
+    def measure(self, positions: np.ndarray, velocities: np.ndarray) -> Dict[str, float]:
+        """Total kinetic energy, energy (if a potential is set) and L_z of one state."""
+        m = self.masses
+        kinetic = 0.5 * np.einsum('ij,ij->i', velocities, velocities)
+        lz = positions[:, 0] * velocities[:, 1] - positions[:, 1] * velocities[:, 0]
+        values = {'kinetic': float(np.sum(m * kinetic)), 'lz': float(np.sum(m * lz))}
+        if self.potential is not None:
+            phi = self.potential(np.hypot(positions[:, 0], positions[:, 1]))
+            values['energy'] = values['kinetic'] + float(np.sum(m * phi))
+        return values
+
+    def update(self, positions: np.ndarray, velocities: np.ndarray) -> Dict[str, float]:
+        """Add one sample; returns its values."""
+        values = self.measure(positions, velocities)
+        if self.initial is None:
+            self.initial = values
+            self.max_deviation = {k: 0.0 for k in values}
+        for key, value in values.items():
+            scale = abs(self.initial[key]) or 1.0
+            self.max_deviation[key] = max(self.max_deviation[key],
+                                          abs(value - self.initial[key]) / scale)
+        self.last = values
+        self.n_samples += 1
+        return values
@@ -0,0 +1,370 @@
+"""
+Particle Engine Module: One Orbit Engine for Every Disk Simulation
+------------------------------------------------------------------
+
+The shared core of simulacao_galaxia and the renderers in
+visualization_video: a particle store, a pluggable force and a pluggable
+symplectic integrator behind a step / run API, so a speed-up made here
+reaches every consumer.
+
+- ParticleStore keeps the state as a structure of arrays: one contiguous
+  row per coordinate, (dim, N) blocks for positions and velocities plus the
+  optional Kahan carries. `positions` / `velocities` are (N, dim) views of
+  those blocks, so code written for (N, dim) arrays works unchanged while
+  every per-coordinate kernel streams through contiguous memory.
+- A force is any callable force(positions, out=None) -> accelerations;
+  CentralForce is the pull of the galactic core under an interpolation law
+  (in the disk plane for 3D discs), evaluated without temporaries.
+- ParticleEngine advances a store with an integrators.Integrator, reusing
+  the last force of a step for the first kick of the next one. run() goes
+  all the way; iter_steps() is a generator yielding read-only views of the
+  live state at a chosen cadence, so consumers (renderers, online analysis)
+  stream every state without copies.
+"""
+
+import numpy as np
+from typing import Callable, Optional, Union
+
+from interpolation_laws import NEWTON, newtonian_acceleration
+from integrators import Integrator
+
+ForceFunction = Callable[..., np.ndarray]
+
+
+class ParticleStore:
+    """
+    Structure-of-arrays particle state.
+
+    Parameters:
+    -----------
+    n : int
+        Number of particles
+    dim : int
+        Spatial dimension (2 or 3)
+    dtype : np.dtype
+        Floating type of the velocities (and positions, unless pos_dtype)
+    pos_dtype : np.dtype, optional
+        Floating type of the positions, e.g. float64 under float32 velocities
+    carries : bool
+        Also allocate the Kahan compensation arrays of positions and velocities
+    """
+
+    def __init__(self, n: int, dim: int = 2, dtype=np.float64, pos_dtype=None,
+                 carries: bool = False):
+        self.n = n
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.pos_dtype = self.dtype if pos_dtype is None else np.dtype(pos_dtype)
+        self._pos = np.zeros((dim, n), dtype=self.pos_dtype)
+        self._vel = np.zeros((dim, n), dtype=self.dtype)
+        self._pos_carry = np.zeros_like(self._pos) if carries else None
+        self._vel_carry = np.zeros_like(self._vel) if carries else None
+
+    @classmethod
+    def from_arrays(cls, positions, velocities, dtype=None, pos_dtype=None,
+                    carries: bool = False) -> 'ParticleStore':
+        """Store holding copies of (N, dim) position and velocity arrays."""
+        positions = np.asarray(positions)
+        dtype = np.asarray(velocities).dtype if dtype is None else dtype
+        store = cls(len(positions), positions.shape[1], dtype, pos_dtype, carries)
+        store.positions[...] = positions
+        store.velocities[...] = velocities
+        return store
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Positions, an (N, dim) view of the coordinate rows."""
+        return self._pos.T
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """Velocities, an (N, dim) view of the coordinate rows."""
+        return self._vel.T
+
+    @property
+    def pos_carry(self) -> Optional[np.ndarray]:
+        """Kahan carry of the positions (None without carries)."""
+        return None if self._pos_carry is None else self._pos_carry.T
+
+    @property
+    def vel_carry(self) -> Optional[np.ndarray]:
+        """Kahan carry of the velocities (None without carries)."""
+        return None if self._vel_carry is None else self._vel_carry.T
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the state."""
+        arrays = (self._pos, self._vel, self._pos_carry, self._vel_carry)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+
+def disk_positions(n: int, r_min: float, r_max: float, thickness: float = 0.0,
+                   dim: int = 2) -> np.ndarray:
+    """
+    Particles spread uniformly over the area of an annulus (np.random stream).
+
+    Parameters:
+    -----------
+    n : int
+        Number of particles
+    r_min, r_max : float
+        Inner and outer radius
+    thickness : float
+        Standard deviation of the Gaussian heights (3D only)
+    dim : int
+        2 for a flat disk, 3 to add the z column
+
+    Returns:
+    --------
+    np.ndarray
+        Positions, shape (n, dim), float64
+    """
+    theta = np.random.uniform(0, 2*np.pi, n)
+    # r = sqrt(u) to distribute uniformly on disk area
+    r = np.sqrt(np.random.uniform(r_min**2, r_max**2, n))
+    columns = [r * np.cos(theta), r * np.sin(theta)]
+    if dim == 3:
+        columns.append(np.random.normal(0, thickness, n))
+    return np.column_stack(columns)
+
+
+def circular_velocities(positions: np.ndarray, pull: np.ndarray) -> np.ndarray:
+    """
+    Velocities of circular orbits, v = sqrt(pull * r) perpendicular to the
+    in-plane radius vector (no vertical motion).
+
+    Parameters:
+    -----------
+    positions : np.ndarray
+        Positions, shape (N, dim)
+    pull : np.ndarray
+        Inward acceleration magnitude at every position, shape (N,)
+    """
+    r = np.hypot(positions[:, 0], positions[:, 1])
+    v_over_r = np.sqrt(pull * r) / r
+    vel = np.zeros(positions.shape)
+    vel[:, 0] = -positions[:, 1] * v_over_r
+    vel[:, 1] = positions[:, 0] * v_over_r
+    return vel
+
+
+class CentralForce:
+    """
+    Pull of a point-mass core, law(G M / r^2) along -r_hat, with r the radius
+    in the disk plane (the z component of 3D positions feels no force).
+
+    Evaluation writes into `out` or into a workspace owned by the force (the
+    next call overwrites it) and allocates nothing per call.
+
+    Parameters:
+    -----------
+    law : callable
+        Interpolation law g = law(g_N) (see interpolation_laws)
+    mass : float
+        Core mass
+    G : float
+        Gravitational constant
+    r_floor : float
+        Smallest radius used, avoids division by zero at the centre
+    """
+
+    def __init__(self, law=NEWTON, mass: float = 1.0, G: float = 1.0, r_floor: float = 1e-5):
+        self.law = law
+        self.mass = mass
+        self.G = G
+        self.r_floor = r_floor
+        self._ws = None
+
+    def magnitude(self, r, out=None) -> np.ndarray:
+        """Acceleration magnitude at in-plane radius r (out must not be r)."""
+        g_n = newtonian_acceleration(r, self.mass, self.G, out=out)
+        return self.law(g_n, out=g_n)
+
+    def _workspace(self, n: int, dim: int, dtype):
+        """(r, g_N, g, acceleration) buffers for the first n particles."""
+        ws = self._ws
+        if ws is None or len(ws[0]) < n or ws[0].dtype != dtype or ws[3].shape[1] != dim:
+            # Accelerations share the coordinate-row layout of ParticleStore
+            ws = self._ws = (np.empty(n, dtype), np.empty(n, dtype), np.empty(n, dtype),
+                             np.empty((dim, n), dtype).T)
+        return tuple(buf[:n] for buf in ws)
+
+    def __call__(self, positions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Acceleration vectors at the positions, shape (N, dim), in the
+        positions' floating type.
+        """
+        n, dim = positions.shape
+        r_mag, g_n, g, acc = self._workspace(n, dim, positions.dtype)
+        if out is None:
+            out = acc
+        np.hypot(positions[:, 0], positions[:, 1], out=r_mag)
+        np.maximum(r_mag, self.r_floor, out=r_mag)
+
+        if self.law is NEWTON:
+            newtonian_acceleration(r_mag, self.mass, self.G, out=g)
+        else:
+            newtonian_acceleration(r_mag, self.mass, self.G, out=g_n)
+            self.law(g_n, out=g)
+
+        # a_vec = -(r_vec / r_mag) * a_mag, per component (a broadcast
+        # multiply would go through a temporary buffer)
+        np.divide(g, r_mag, out=g)
+        np.negative(g, out=g)
+        for j in range(2):
+            np.multiply(positions[:, j], g, out=out[:, j])
+        if dim > 2:
+            out[:, 2:] = 0.0
+        return out
+
+
+class ParticleEngine:
+    """
+    Step / run driver advancing a ParticleStore under a force.
+
+    Parameters:
+    -----------
+    store : ParticleStore
+        State, advanced in place (with its Kahan carries if it has them)
+    force : callable
+        force(positions, out=None) -> accelerations of shape (N, dim)
+    integrator : str or Integrator
+        Symplectic scheme from integrators.SCHEMES, or an Integrator
+    dt : float
+        Default time step
+    """
+
+    def __init__(self, store: ParticleStore, force: ForceFunction,
+                 integrator: Union[str, Integrator] = 'leapfrog', dt: float = 0.1):
+        self.store = store
+        self.force = force
+        self.integrator = Integrator(integrator) if isinstance(integrator, str) else integrator
+        self.dt = dt
+        self.time = 0.0
+        self.steps_taken = 0
+        self._acc_buf = np.empty((store.dim, store.n), store.pos_dtype).T
+        self._acc = None
+        self._views = None
+
+    def _accelerations(self, positions: np.ndarray) -> np.ndarray:
+        # Into an engine-owned buffer, so the cached force survives calls to
+        # the force (and its workspace) between steps
+        return self.force(positions, out=self._acc_buf)
+
+    def invalidate(self):
+        """Forget the cached force, e.g. after the state was changed outside step()."""
+        self._acc = None
+
+    def state(self) -> dict:
+        """Copy of everything a restart needs (see checkpoint): state, carries, cached force, clocks."""
+        store = self.store
+        state = {'positions': store.positions.copy(), 'velocities': store.velocities.copy(),
+                 'time': self.time, 'steps_taken': self.steps_taken,
+                 'integrator_force_evals': self.integrator.n_force_evals}
+        if store.pos_carry is not None:
+            state['pos_carry'] = store.pos_carry.copy()
+            state['vel_carry'] = store.vel_carry.copy()
+        if self._acc is not None:
+            state['acc'] = self._acc.copy()
+        return state
+
+    def restore(self, state: dict):
+        """Continue from a state() taken earlier, bit for bit."""
+        store = self.store
+        store.positions[...] = state['positions']
+        store.velocities[...] = state['velocities']
+        if store.pos_carry is not None:
+            store.pos_carry[...] = state['pos_carry']
+            store.vel_carry[...] = state['vel_carry']
+        self.time = state['time']
+        self.steps_taken = state['steps_taken']
+        self.integrator.n_force_evals = state['integrator_force_evals']
+        self._acc = None
+        if 'acc' in state:
+            self._acc_buf[...] = state['acc']
+            self._acc = self._acc_buf
+
+    def step(self, dt: Optional[float] = None) -> np.ndarray:
+        """Advance one step (default self.dt); returns the positions view."""
+        dt = self.dt if dt is None else dt
+        store = self.store
+        self._acc = self.integrator.step(store.positions, store.velocities, self._accelerations,
+                                         dt, self._acc, store.pos_carry, store.vel_carry)
+        self.time += dt
+        self.steps_taken += 1
+        return store.positions
+
+    def readonly_views(self):
+        """(positions, velocities): read-only (N, dim) views of the live state."""
+        if self._views is None:
+            views = (self.store.positions.view(), self.store.velocities.view())
+            for view in views:
+                view.flags.writeable = False
+            self._views = views
+        return self._views
+
+    def iter_steps(self, steps: int, every: int = 1,
+                   callback: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None):
+        """
+        Advance `steps` steps, yielding (step, positions, velocities) after
+        every step number that is a multiple of `every`.
+
+        The arrays are read-only views of the live state, not copies: they
+        are updated in place when the generator resumes, so copy whatever
+        must outlive the current iteration. callback(step, positions,
+        velocities) still runs after every step.
+        """
+        if every < 1:
+            raise ValueError("every must be positive")
+        positions, velocities = self.readonly_views()
+        for _ in range(steps):
+            self.step()
+            if callback is not None:
+                callback(self.steps_taken, self.store.positions, self.store.velocities)
+            if self.steps_taken % every == 0:
+                yield self.steps_taken, positions, velocities
+
+    def run(self, steps: int,
+            callback: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None) -> np.ndarray:
+        """
+        Advance `steps` steps, calling callback(step, positions, velocities)
+        after each (step counts all steps taken by the engine); returns the
+        positions view.
+        """
+        for _ in range(steps):
+            self.step()
+            if callback is not None:
+                callback(self.steps_taken, self.store.positions, self.store.velocities)
+        return self.store.positions
+
+
+def central_disk(n: int, r_min: float, r_max: float, law=NEWTON, mass: float = 1.0,
+                 G: float = 1.0, dt: float = 0.1, thickness: float = 0.0, dim: int = 2,
+                 velocity_law=None, integrator: Union[str, Integrator] = 'leapfrog',
+                 dtype=np.float64) -> ParticleEngine:
+    """
+    Engine for a disk of test particles on circular orbits around a core.
+
+    Parameters:
+    -----------
+    n, r_min, r_max, thickness, dim :
+        Disk layout (see disk_positions)
+    law : callable
+        Interpolation law of the core's pull during the run
+    mass, G : float
+        Core mass and gravitational constant
+    dt : float
+        Time step
+    velocity_law : callable, optional
+        Law the initial circular velocities are balanced against (defaults
+        to law; a different one starts the disk out of equilibrium)
+    integrator : str or Integrator
+        Symplectic scheme
+    dtype : np.dtype
+        Floating type of the state
+    """
+    positions = disk_positions(n, r_min, r_max, thickness, dim)
+    balance = CentralForce(law if velocity_law is None else velocity_law, mass, G)
+    pull = balance.magnitude(np.hypot(positions[:, 0], positions[:, 1]))
+    store = ParticleStore.from_arrays(positions, circular_velocities(positions, pull), dtype)
+    return ParticleEngine(store, CentralForce(law, mass, G), integrator, dt)
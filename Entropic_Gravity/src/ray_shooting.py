@@ -0,0 +1,350 @@
+"""
+Ray Shooting Module: Inverse Ray Tracing for Magnification Maps and Lensed Images
+--------------------------------------------------------------------------------
+
+A regular grid of rays in the image (lens) plane is mapped to the source
+plane through the lens equation
+
+    beta = xi - D alpha(xi),    D = D_l D_ls / D_s
+
+(beta expressed in lens-plane units, as in lensing_maps). Binning the rays
+on the source plane gives the magnification map, caustics included
+(mu = rays per source pixel x ray area / pixel area); sampling a source
+surface brightness at beta gives the lensed image (surface brightness is
+conserved along a ray).
+
+- Deflections: RadialDeflection for an axisymmetric alpha(r) (e.g. the
+  entropic profile of a CumulativeMassProfile and an interpolation law) or
+  GridDeflection for the alpha_x / alpha_y maps of lensing_maps (bilinear).
+- Rays are never stored: every block of image-plane rows is generated,
+  traced and binned in place, so memory is a few arrays of `chunk` rays per
+  thread plus the output maps, whatever the ray count. 10^8 - 10^9 rays
+  are a matter of minutes on one node.
+- Blocks run on a thread pool (NumPy releases the GIL in its kernels);
+  every thread accumulates its own ray counts, summed once at the end.
+
+Maps follow the lensing_maps convention: axis 0 is x, axis 1 is y.
+"""
+
+import os
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+
+DEFAULT_CHUNK = 1 << 20    # Rays per block: about 60 MB of scratch per thread
+
+
+class RadialDeflection:
+    """
+    Axisymmetric deflection alpha(xi) = alpha(r) xi / r of a tabulated profile.
+
+    Between the tabulated radii alpha(r) is interpolated linearly, with
+    alpha(0) = 0; beyond the last radius it keeps its last value (the flat
+    entropic plateau) or, with keplerian_tail, falls as 1 / r.
+
+    Parameters:
+    -----------
+    radii : array_like
+        Increasing radii of the table
+    alpha : array_like
+        Deflection angle (radians) at those radii
+    center : (float, float)
+        Lens centre
+    keplerian_tail : bool
+        alpha ~ 1 / r beyond the table (a point mass in GR)
+    """
+
+    def __init__(self, radii, alpha, center: Sequence[float] = (0.0, 0.0),
+                 keplerian_tail: bool = False):
+        radii = np.asarray(radii, dtype=float)
+        alpha = np.asarray(alpha, dtype=float)
+        if radii[0] > 0:
+            radii, alpha = np.concatenate(([0.0], radii)), np.concatenate(([0.0], alpha))
+        self.radii = radii
+        self.alpha = alpha
+        self.center = (float(center[0]), float(center[1]))
+        self.keplerian_tail = keplerian_tail
+
+    @classmethod
+    def from_mass_profile(cls, profile, radii, law=None, G: float = 6.674e-11,
+                          c: float = 3.0e8, **kwargs) -> 'RadialDeflection':
+        """
+        Deflection of a mass_profile.CumulativeMassProfile (projected),
+        alpha = 4 g r / c^2 with g = law(G M(<r) / r^2): the M_eff rule of
+        the lensing simulation (GR for law=None).
+        """
+        radii = np.asarray(radii, dtype=float)
+        g = G * profile(radii) / radii**2
+        if law is not None:
+            g = law(g)
+        return cls(radii, 4 * g * radii / c**2, **kwargs)
+
+    def __call__(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(alpha_x, alpha_y) at the points (x, y)."""
+        dx = x - self.center[0]
+        dy = y - self.center[1]
+        r = np.hypot(dx, dy)
+        # alpha(r) / r, the factor applied to both offsets
+        scale = np.interp(r, self.radii, self.alpha)
+        if self.keplerian_tail:
+            outside = r > self.radii[-1]
+            scale[outside] = self.alpha[-1] * self.radii[-1] / r[outside]
+        np.divide(scale, r, out=scale, where=r > 0)
+        dx *= scale
+        dy *= scale
+        return dx, dy
+
+
+class GridDeflection:
+    """
+    Bilinear interpolation of deflection maps (e.g. lensing_maps output).
+
+    Rays outside the map take the value of the nearest edge pixel, so the
+    traced region should lie within the map.
+
+    Parameters:
+    -----------
+    alpha_x, alpha_y : np.ndarray
+        Deflection maps (radians), shape (nx, ny), axis 0 is x
+    x_axis, y_axis : array_like
+        Regularly spaced pixel-centre coordinates of the maps
+    """
+
+    def __init__(self, alpha_x: np.ndarray, alpha_y: np.ndarray, x_axis, y_axis):
+        self.alpha = (np.asarray(alpha_x), np.asarray(alpha_y))
+        if self.alpha[0].shape != self.alpha[1].shape:
+            raise ValueError("alpha_x and alpha_y must have the same shape")
+        self.shape = self.alpha[0].shape
+        self.origin = (float(x_axis[0]), float(y_axis[0]))
+        self.step = (float(x_axis[1] - x_axis[0]), float(y_axis[1] - y_axis[0]))
+
+    @classmethod
+    def from_maps(cls, maps: dict, x_axis, y_axis) -> 'GridDeflection':
+        """From the dict of lensing_maps / LensingMesh.maps."""
+        return cls(maps['alpha_x'], maps['alpha_y'], x_axis, y_axis)
+
+    def __call__(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(alpha_x, alpha_y) at the points (x, y)."""
+        corners = []
+        for coord, origin, step, n in zip((x, y), self.origin, self.step, self.shape):
+            u = np.clip((coord - origin) / step, 0, n - 1)
+            i = np.minimum(u.astype(np.intp), n - 2)
+            u -= i
+            corners.append((i, u))
+        (i, u), (j, v) = corners
+        result = []
+        for alpha in self.alpha:
+            low = alpha[i, j] * (1 - v) + alpha[i, j + 1] * v
+            high = alpha[i + 1, j] * (1 - v) + alpha[i + 1, j + 1] * v
+            result.append(low * (1 - u) + high * u)
+        return result[0], result[1]
+
+
+def gaussian_source(center: Sequence[float], width: float, peak: float = 1.0) -> Callable:
+    """Circular Gaussian surface brightness on the source plane."""
+    cx, cy = center
+
+    def brightness(bx, by):
+        return peak * np.exp(-((bx - cx)**2 + (by - cy)**2) / (2 * width**2))
+    return brightness
+
+
+def image_source(pixels: np.ndarray, extent: Sequence[float]) -> Callable:
+    """
+    Surface brightness of a pixel image (axis 0 is x) covering
+    extent = (x_min, x_max, y_min, y_max), nearest pixel, 0 outside.
+    """
+    pixels = np.asarray(pixels)
+    x_min, x_max, y_min, y_max = extent
+    nx, ny = pixels.shape
+
+    def brightness(bx, by):
+        i = np.floor((bx - x_min) * (nx / (x_max - x_min))).astype(np.intp)
+        j = np.floor((by - y_min) * (ny / (y_max - y_min))).astype(np.intp)
+        inside = (i >= 0) & (i < nx) & (j >= 0) & (j < ny)
+        out = np.zeros(bx.shape, dtype=pixels.dtype)
+        out[inside] = pixels[i[inside], j[inside]]
+        return out
+    return brightness
+
+
+class RayShooter:
+    """
+    Inverse ray shooting through a deflection field.
+
+    Parameters:
+    -----------
+    deflection : callable
+        (x, y) -> (alpha_x, alpha_y), e.g. RadialDeflection or GridDeflection
+    distance : float
+        D_l D_ls / D_s (same length unit as the coordinates)
+    chunk : int
+        Rays per block (scratch is about 8 arrays of `chunk` floats per thread)
+    n_threads : int, optional
+        Worker threads, defaults to the CPU count
+    """
+
+    def __init__(self, deflection: Callable, distance: float, chunk: int = DEFAULT_CHUNK,
+                 n_threads: Optional[int] = None):
+        self.deflection = deflection
+        self.distance = distance
+        self.chunk = chunk
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self._local = threading.local()
+        self.last_rays = 0
+        self.last_seconds = 0.0
+
+    @property
+    def rays_per_second(self) -> float:
+        """Rays traced per second by the last call."""
+        return self.last_rays / self.last_seconds if self.last_seconds > 0 else 0.0
+
+    def trace(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Source-plane positions beta = xi - D alpha(xi) of rays at (x, y)."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        alpha_x, alpha_y = self.deflection(x, y)
+        return x - self.distance * alpha_x, y - self.distance * alpha_y
+
+    @staticmethod
+    def _ray_axes(extent: Sequence[float], shape: Tuple[int, int]):
+        """Ray (pixel-centre) coordinates of an image-plane grid."""
+        return [lo + (np.arange(n) + 0.5) * (hi - lo) / n
+                for lo, hi, n in zip(extent[::2], extent[1::2], shape)]
+
+    def _rows(self, x_axis, y_axis, lo, hi):
+        """Trace the rays of image-plane rows [lo, hi) (flattened, x-major)."""
+        x = np.repeat(x_axis[lo:hi], len(y_axis))
+        y = np.tile(y_axis, hi - lo)
+        return self.trace(x, y)
+
+    def _run(self, task, n_rows: int, block: int):
+        """Run task(lo, hi) over blocks of image-plane rows on the thread pool."""
+        blocks = [(lo, min(lo + block, n_rows)) for lo in range(0, n_rows, block)]
+        if self.n_threads == 1 or len(blocks) == 1:
+            for lo, hi in blocks:
+                task(lo, hi)
+        else:
+            with ThreadPoolExecutor(self.n_threads) as pool:
+                for future in [pool.submit(task, lo, hi) for lo, hi in blocks]:
+                    future.result()
+
+    def magnification_map(self, image_extent: Sequence[float], rays: Tuple[int, int],
+                          source_extent: Sequence[float], source_shape: Tuple[int, int]) -> dict:
+        """
+        Magnification map on the source plane.
+
+        Parameters:
+        -----------
+        image_extent : (x_min, x_max, y_min, y_max)
+            Image-plane region covered by the rays (must contain every image
+            of the source region)
+        rays : (int, int)
+            Rays along x and y (one ray per image-plane cell centre)
+        source_extent : (x_min, x_max, y_min, y_max)
+            Source-plane region of the map
+        source_shape : (int, int)
+            Source-plane pixels along x and y
+
+        Returns:
+        --------
+        dict
+            'magnification' (rays per pixel x ray area / pixel area, 1 without
+            lens), 'counts' (rays per pixel), 'extent' (source_extent) and
+            'rays' (total rays traced)
+        """
+        x_axis, y_axis = self._ray_axes(image_extent, rays)
+        nx, ny = source_shape
+        x_min, x_max, y_min, y_max = source_extent
+        inv_x, inv_y = nx / (x_max - x_min), ny / (y_max - y_min)
+        partials = []
+        lock = threading.Lock()
+
+        def task(lo, hi):
+            counts = getattr(self._local, 'counts', None)
+            if counts is None or counts.shape != (nx * ny,):
+                counts = self._local.counts = np.zeros(nx * ny, dtype=np.int64)
+                with lock:
+                    partials.append(counts)
+            bx, by = self._rows(x_axis, y_axis, lo, hi)
+            # Uniform source bins: indices by arithmetic, out-of-map rays dropped
+            bx -= x_min
+            bx *= inv_x
+            by -= y_min
+            by *= inv_y
+            i = np.floor(bx).astype(np.intp)
+            j = np.floor(by).astype(np.intp)
+            inside = (i >= 0) & (i < nx) & (j >= 0) & (j < ny)
+            flat = i[inside] * ny + j[inside]
+            counts += np.bincount(flat, minlength=nx * ny)
+
+        self._local = threading.local()
+        start = time.perf_counter()
+        self._run(task, len(x_axis), max(1, self.chunk // len(y_axis)))
+        self.last_seconds = time.perf_counter() - start
+        self.last_rays = len(x_axis) * len(y_axis)
+
+        counts = np.sum(partials, axis=0).reshape(nx, ny)
+        ray_area = ((image_extent[1] - image_extent[0]) / rays[0]
+                    * (image_extent[3] - image_extent[2]) / rays[1])
+        pixel_area = 1.0 / (inv_x * inv_y)
+        return {'magnification': counts * (ray_area / pixel_area), 'counts': counts,
+                'extent': tuple(source_extent), 'rays': self.last_rays}
+
+    def lensed_image(self, source: Callable, image_extent: Sequence[float],
+                     shape: Tuple[int, int], oversample: int = 1) -> np.ndarray:
+        """
+        Lensed image of an extended source.
+
+        Parameters:
+        -----------
+        source : callable
+            Source surface brightness (bx, by) -> values, e.g. gaussian_source
+            or image_source
+        image_extent : (x_min, x_max, y_min, y_max)
+            Image-plane region
+        shape : (int, int)
+            Output pixels along x and y
+        oversample : int
+            Rays per pixel along each axis; pixels are the mean of
+            oversample^2 rays
+
+        Returns:
+        --------
+        np.ndarray
+            Surface brightness of the image, shape `shape`
+        """
+        k = oversample
+        x_axis, y_axis = self._ray_axes(image_extent, (shape[0] * k, shape[1] * k))
+        image = np.empty(shape)
+
+        def task(lo, hi):
+            bx, by = self._rows(x_axis, y_axis, lo * k, hi * k)
+            values = source(bx, by).reshape(hi - lo, k, shape[1], k)
+            image[lo:hi] = values.mean(axis=(1, 3))
+
+        start = time.perf_counter()
+        self._run(task, shape[0], max(1, self.chunk // (len(y_axis) * k)))
+        self.last_seconds = time.perf_counter() - start
+        self.last_rays = len(x_axis) * len(y_axis)
+        return image
+
+
+def benchmark(rays_per_side: int = 10000, n_threads: Optional[int] = None):
+    """Time the magnification map of a point mass with an entropic plateau."""
+    radii = np.geomspace(1e-3, 10, 200)
+    # Point mass (alpha = 1 / r, Einstein radius 1 for D = 1) plus a flat tail
+    alpha = 1.0 / radii + 0.05
+    shooter = RayShooter(RadialDeflection(radii, alpha), 1.0, n_threads=n_threads)
+    result = shooter.magnification_map((-3, 3, -3, 3), (rays_per_side, rays_per_side),
+                                       (-1, 1, -1, 1), (500, 500))
+    print(f"{result['rays']:.1e} rays, threads={shooter.n_threads}: {shooter.last_seconds:.1f} s "
+          f"({shooter.rays_per_second:.2e} rays/s, max magnification "
+          f"{result['magnification'].max():.0f})")
+
+
+if __name__ == "__main__":
+    print("=== Ray Shooting Benchmark ===")
+    benchmark()
@@ -11,8 +11,24 @@ Simulate the rotation curve of a galaxy under two paradigms:
 
 Methodology:
 - N-Body Simulation with test particles orbiting a central massive core.
-- Symplectic Velocity Verlet Integrator for energy stability.
-- Vectorized NumPy implementation for performance.
+- Symplectic Velocity Verlet Integrator for energy stability
+  (any scheme from integrators.SCHEMES can be selected).
+- Optional hierarchical power-of-two block time steps per star.
+- Optional single-precision state (float32) for large ensembles, with
+  positions accumulated in float64 or the state by compensated (Kahan)
+  summation.
+- Optional star-star self-gravity: exact tiled direct summation or a
+  Barnes-Hut tree, in-process or spread over worker processes by domain
+  decomposition, or a 2D fast multipole method (entropic law applied to the
+  total Newtonian field of core + disk), or a particle-mesh FFT solver with the QUMOND field equation
+  (curl-free, non-spherical entropic field).
+- Stars live in the shared particle_engine (structure-of-arrays store,
+  pluggable force and integrator), the same engine the video renderers use.
+- Vectorized NumPy implementation for performance; the central-force kernel
+  and the integrator update work in preallocated buffers (no per-step
+  allocations).
+- The rotation curve is accumulated while the simulation runs (online
+  radial-bin mean circular velocity and dispersions, see online_stats).
 
 Units:
 Arbitrary simulation units used to ensure numerical stability.
@@ -23,6 +39,19 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 
+from interpolation_laws import (InterpolationLaw, NEWTON, newtonian_acceleration, apply_to_field,
+                                tabulate)
+from integrators import Integrator
+from checkpoint import rng_state, set_rng_state
+from online_stats import RadialProfile
+from particle_engine import (ParticleStore, ParticleEngine, CentralForce, disk_positions,
+                             circular_velocities)
+from barnes_hut import BarnesHutTree
+from direct_summation import DirectSummation
+from fmm2d import FastMultipole2D
+from domain_decomposition import DomainDecomposition
+from particle_mesh import ParticleMesh
+
 # --- Configuration & Constants ---
 G = 1.0
 M_CORE = 1.0e4      # Mass of the galactic core
@@ -34,131 +63,393 @@ DT = 0.1            # Time step
 STEPS = 2000        # Simulation steps
 OUTPUT_DIR = r"C:\Users\Douglas\Desktop\Entropy\Gravidade_Entropica\results"
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Block time-stepping: rung k advances with dt = DT_MAX / 2^k and each star
+# sits on the coarsest rung with dt <= ETA * t_dyn, t_dyn = sqrt(r / |a|).
+DT_MAX = 1.6        # Coarsest (synchronisation) step, DT * 2^4
+MAX_RUNG = 10       # Finest step DT_MAX / 2^10
+ETA = 0.05          # Time-step accuracy parameter
+
+# Self-gravity: 'central' ignores star-star forces, the others add them
+FORCE_BACKENDS = ('central', 'direct', 'tree', 'parallel', 'pm', 'fmm')
+M_DISK = 1.0e3      # Total stellar mass of the disk (self-gravity only)
+SOFTENING = 2.0     # Plummer softening length for star-star forces
+THETA = 0.5         # Barnes-Hut opening angle
+FMM_ORDER = 8       # Fast multipole expansion order
+PM_CELLS = 64       # Particle-mesh cells per side
+PM_BOX = 2.4 * R_MAX  # Particle-mesh box side (stars outside feel only the core)
+
+# State precision: updates can be summed in plain dtype arithmetic, positions
+# kept in float64 while velocities use dtype (forces are then evaluated from
+# the float64 positions into a float64 buffer, N x 2 x 8 bytes), or kicks and
+# drifts Kahan-compensated in dtype
+ACCUMULATIONS = ('plain', 'float64', 'kahan')
+
+# Rotation curve: radial-bin statistics accumulated during the run, sampled
+# every PROFILE_EVERY steps (one DT_MAX, so block time steps sample at every
+# synchronisation)
+PROFILE_BINS = 25
+PROFILE_EVERY = 16
+
+# Physics model per simulation mode
+MODE_LAWS = {
+    'Newton': NEWTON,
+    # Simple interpolation function mu(x) = x / (1+x)
+    'Entropic': InterpolationLaw('simple', A0),
+}
 
 class GalacticSimulation:
-    def __init__(self, mode='Newton'):
+    def __init__(self, mode='Newton', tabulated=False, table_rtol=1e-6, integrator='leapfrog',
+                 block_timesteps=False, eta=ETA, max_rung=MAX_RUNG,
+                 force_backend='central', n_stars=N_STARS, disk_mass=M_DISK,
+                 theta=THETA, softening=SOFTENING, pm_cells=PM_CELLS, assignment='cic',
+                 n_threads=None, n_workers=None, decomposition='angular', fmm_order=FMM_ORDER,
+                 dtype=np.float64, accumulation='plain'):
         """
         Initialize the galaxy simulation.
         
         Args:
             mode (str): 'Newton' for classical gravity, 'Entropic' for Verlinde/MOND.
+            tabulated (bool): Evaluate the interpolation law from a precomputed
+                log-spaced lookup table instead of the closed form.
+            table_rtol (float): Maximum relative error of the lookup table.
+            integrator (str): Symplectic scheme from integrators.SCHEMES
+                ('leapfrog' is the classic Velocity Verlet).
+            block_timesteps (bool): Give every star its own power-of-two time
+                step DT_MAX / 2^k from its dynamical time instead of the global DT.
+            eta (float): Block time-step accuracy, dt_i <= eta * t_dyn_i.
+            max_rung (int): Finest allowed rung.
+            force_backend (str): 'central' (core only), 'direct' (core plus
+                exact star-star self-gravity), 'tree' (Barnes-Hut self-gravity),
+                'parallel' (Barnes-Hut over worker processes, one domain each),
+                'fmm' (fast multipole self-gravity) or 'pm' (particle-mesh
+                self-gravity with the QUMOND field equation).
+            n_stars (int): Number of stars.
+            disk_mass (float): Total stellar mass, shared equally by the stars.
+            theta (float): Barnes-Hut opening angle.
+            softening (float): Plummer softening of star-star forces.
+            pm_cells (int): Particle-mesh cells per side.
+            assignment (str): Particle-mesh assignment, 'cic' or 'tsc'.
+            n_threads (int): Threads for direct summation (default: all CPUs).
+            n_workers (int): Worker processes for 'parallel' (default: all CPUs).
+            decomposition (str): 'angular' sectors or 'radial' rings for 'parallel'.
+            fmm_order (int): Expansion order of the 'fmm' backend.
+            dtype: Floating type of the star state and of the force
+                evaluation (np.float32 halves memory traffic).
+            accumulation (str): How the state accumulates updates: 'plain'
+                (in dtype), 'float64' (positions stored in double precision;
+                forces follow the positions and are evaluated in float64,
+                only velocities use dtype) or 'kahan' (compensated kicks and
+                drifts in dtype).
         """
+        if mode not in MODE_LAWS:
+            raise ValueError(f"Unknown mode: {mode}")
+        if force_backend not in FORCE_BACKENDS:
+            raise ValueError(f"Unknown force backend: {force_backend}")
+        if accumulation not in ACCUMULATIONS:
+            raise ValueError(f"Unknown accumulation: {accumulation}")
+        if block_timesteps and force_backend != 'central':
+            raise ValueError("Block time steps need the 'central' force backend")
         self.mode = mode
-        self.stars_pos = self._init_positions()
-        self.stars_vel = self._init_velocities()
+        self.law = tabulate(MODE_LAWS[mode], table_rtol) if tabulated else MODE_LAWS[mode]
+        self.integrator = Integrator(integrator)
+        self.block_timesteps = block_timesteps
+        self.eta = eta
+        self.max_rung = max_rung
+        self.n_force_evals = 0   # Per-star force evaluations
+        self.rungs = None
+        self.force_backend = force_backend
+        self.n_stars = n_stars
+        self.star_mass = disk_mass / n_stars
+        self.theta = theta
+        self.softening = softening
+        self.mesh = ParticleMesh(PM_BOX, pm_cells, assignment=assignment, G=G) \
+            if force_backend == 'pm' else None
+        self.direct = DirectSummation(softening, G, n_threads=n_threads) \
+            if force_backend == 'direct' else None
+        self.domains = DomainDecomposition(n_stars, n_workers, decomposition=decomposition,
+                                           theta=theta, softening=softening, G=G) \
+            if force_backend == 'parallel' else None
+        self.fmm = FastMultipole2D(fmm_order, softening, G) if force_backend == 'fmm' else None
+        self.dtype = np.dtype(dtype)
+        self.accumulation = accumulation
+        self.core = CentralForce(self.law, M_CORE, G)
+        self.newton_core = CentralForce(NEWTON, M_CORE, G)
+        # Initial conditions are drawn in double precision for every dtype
+        positions = disk_positions(n_stars, R_MIN, R_MAX)
+        pos_dtype = np.float64 if accumulation == 'float64' else self.dtype
+        self.store = ParticleStore.from_arrays(positions, self._init_velocities(positions),
+                                               self.dtype, pos_dtype,
+                                               carries=accumulation == 'kahan')
+        self.engine = ParticleEngine(self.store, self.get_forces, self.integrator, DT)
+        self.profile = RadialProfile(np.linspace(R_MIN, R_MAX, PROFILE_BINS + 1))
         self.history_v = []
         self.history_r = []
         
         print(f"[INFO] Initialized Simulation. Mode: {self.mode}")
 
-    def _init_positions(self):
-        """Initialize stars in a disk distribution."""
-        # Random angles
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        # Random radii (uniform areal distribution)
-        # r = sqrt(u) to distribute uniformly on disk area
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        # z is 0 for 2D disk
-        return np.column_stack((x, y))
+    @property
+    def stars_pos(self):
+        """Star positions, an (N, 2) view of the engine's store."""
+        return self.store.positions
 
-    def _init_velocities(self):
+    @stars_pos.setter
+    def stars_pos(self, value):
+        self.store.positions[...] = value
+        self.engine.invalidate()
+
+    @property
+    def stars_vel(self):
+        """Star velocities, an (N, 2) view of the engine's store."""
+        return self.store.velocities
+
+    @stars_vel.setter
+    def stars_vel(self, value):
+        self.store.velocities[...] = value
+
+    @property
+    def pos_carry(self):
+        """Kahan carry of the positions ('kahan' accumulation only)."""
+        return self.store.pos_carry
+
+    @property
+    def vel_carry(self):
+        """Kahan carry of the velocities ('kahan' accumulation only)."""
+        return self.store.vel_carry
+
+    def _init_velocities(self, positions):
         """Initialize velocities for circular orbits (approximate)."""
-        # Calculate distance to center
-        r = np.linalg.norm(self.stars_pos, axis=1)
-        
-        # Calculate Circular Velocity v_circ = sqrt(a * r)
-        # We need the acceleration at this radius to match circular orbit condition.
-        # F = m*a = m*v^2/r => v = sqrt(a*r)
-        
-        # Calculate expected acceleration for this r
-        a = self._calc_acceleration_magnitude(r)
-        
-        v_mag = np.sqrt(a * r)
+        # Circular Velocity v_circ = sqrt(a * r): we need the acceleration at
+        # this radius to match circular orbit condition, F = m*a = m*v^2/r
+        r = np.linalg.norm(positions, axis=1)
+        if self.force_backend == 'central':
+            a = self._calc_acceleration_magnitude(r)
+        else:
+            # Inward pull of core and disk together
+            acc = self.get_forces(positions)
+            a = np.maximum(-np.einsum('ij,ij->i', acc, positions) / r, 0.0)
         
         # Velocity is perpendicular to position vector
-        # If pos is (x, y), perp is (-y, x)
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        
-        return np.column_stack((vx, vy))
+        return circular_velocities(positions, a)
 
-    def _calc_acceleration_magnitude(self, r):
+    def _calc_acceleration_magnitude(self, r, out=None):
         """
         Calculate acceleration magnitude based on the selected physics model.
         r: array of distances from center
+        out: optional result buffer (must not be r)
         """
-        # Newtonian Acceleration: a_N = GM / r^2
-        a_newton = G * M_CORE / (r**2)
-        
-        if self.mode == 'Newton':
-            return a_newton
-        elif self.mode == 'Entropic':
-            # Entropic Correction (Simple Interpolation Function)
-            # a = (a_N + sqrt(a_N^2 + 4 a_N a_0)) / 2
-            # This derives from the interpolation function mu(x) = x / (1+x)
-            return 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        else:
-            raise ValueError(f"Unknown mode: {self.mode}")
+        # Newtonian a_N = GM / r^2 through the entropic correction, e.g. the
+        # simple interpolation a = (a_N + sqrt(a_N^2 + 4 a_N a_0)) / 2
+        return self.core.magnitude(r, out=out)
 
-    def get_forces(self, positions):
+    def get_forces(self, positions, out=None):
         """
-        Calculate acceleration vectors for all stars towards the center.
-        Assuming central potential dominates (ignoring star-star gravity for now).
-        """
-        r_vec = -positions # Vector pointing to center (0,0)
-        r_mag = np.linalg.norm(positions, axis=1)
-        
-        # Avoid division by zero
-        r_mag = np.maximum(r_mag, 1e-5)
+        Calculate acceleration vectors for all stars.
+        With the 'central' backend only the core pulls (star-star gravity is
+        ignored); otherwise the disk's own field is added before the entropic
+        correction is applied to the total.
         
-        a_mag = self._calc_acceleration_magnitude(r_mag)
+        The result is written into `out` if given, otherwise into a workspace
+        buffer owned by the core force that the next call overwrites (copy it
+        to keep it). The central backend allocates nothing per call.
+        """
+        if self.force_backend in ('direct', 'tree', 'parallel', 'fmm'):
+            return self._self_gravity_forces(positions, out)
+        if self.force_backend == 'pm':
+            acc = self._pm_forces(positions)
+            if out is None:
+                return acc
+            np.copyto(out, acc)
+            return out
         
-        # Normalize direction and scale by acceleration magnitude
-        # a_vec = (r_vec / r_mag) * a_mag
-        # But r_vec has length r_mag, so r_vec/r_mag is unit vector
-        # We need to be careful with dimensions for broadcasting
+        self.n_force_evals += len(positions)
+        return self.core(positions, out)
+
+    def _self_gravity_forces(self, positions, out):
+        """Entropic correction of the total Newtonian field (core + disk)."""
+        g_vec = self.newton_core(positions, out)
         
-        acc_x = (r_vec[:, 0] / r_mag) * a_mag
-        acc_y = (r_vec[:, 1] / r_mag) * a_mag
+        if self.force_backend == 'direct':
+            g_vec += self.direct.accelerations(positions, self.star_mass)
+        elif self.force_backend == 'parallel':
+            g_vec += self.domains.accelerations(positions, self.star_mass)
+        elif self.force_backend == 'fmm':
+            g_vec += self.fmm.accelerations(positions, self.star_mass)
+        else:
+            tree = BarnesHutTree(positions, self.star_mass)
+            g_vec += tree.accelerations(theta=self.theta, softening=self.softening, G=G)
         
-        return np.column_stack((acc_x, acc_y))
+        self.n_force_evals += len(positions)
+        return apply_to_field(g_vec, self.law, out=g_vec)
+
+    def _pm_forces(self, positions):
+        """QUMOND field of core + disk from the particle mesh."""
+        self.n_force_evals += len(positions)
+        return self.mesh.qumond_accelerations(positions, self.star_mass, self.law, M_CORE)
 
-    def run(self):
-        """Run the simulation using Velocity Verlet integration."""
-        dt = DT
+    def _target_rungs(self, positions, acc):
+        """Finest rung each star needs: DT_MAX / 2^k <= eta * sqrt(r / |a|)."""
+        r = np.linalg.norm(positions, axis=1)
+        a = np.maximum(np.linalg.norm(acc, axis=1), 1e-30)
+        dt_star = self.eta * np.sqrt(r / a)
+        rungs = np.ceil(np.log2(DT_MAX / dt_star))
+        return np.clip(rungs, 0, self.max_rung).astype(np.int64)
+
+    def _checkpoint_state(self, **progress):
+        """Engine state, counters and RNG state plus the run's progress."""
+        state = self.engine.state()
+        state.update(rng_state(), n_force_evals=self.n_force_evals, **progress)
+        state.update(self.profile.state())
+        return state
+
+    def _restore_checkpoint(self, state):
+        self.engine.restore(state)
+        self.profile.restore(state)
+        set_rng_state(state)
+        self.n_force_evals = state['n_force_evals']
+        print(f"[INFO] Resuming from checkpoint at step {self.engine.steps_taken}.")
+
+    def run(self, steps=STEPS, trajectory=None, checkpoint=None):
+        """
+        Run the simulation with the selected symplectic integrator.
         
-        # Initial Forces
-        acc = self.get_forces(self.stars_pos)
+        trajectory: optional trajectory_store.TrajectoryStore (fields
+            'positions' and 'velocities'); snapshots are written at its
+            cadence (with block time steps: at every synchronisation).
+        checkpoint: optional checkpoint.Checkpointer. If its file exists the
+            run resumes from it (and reproduces the uninterrupted run bit for
+            bit); the state is saved on its schedule (with block time steps:
+            counted in DT_MAX synchronisations) and when the run completes.
+        """
+        for _ in self.iter_steps(steps, trajectory=trajectory, checkpoint=checkpoint):
+            pass
         
-        print(f"[INFO] Starting integration for {STEPS} steps...")
+        # Store data for final snapshot
+        self.history_r = np.linalg.norm(self.stars_pos, axis=1)
+        self.history_v = np.linalg.norm(self.stars_vel, axis=1)
+
+        print("[INFO] Simulation Complete.")
+
+    def iter_steps(self, steps=STEPS, every=1, trajectory=None, checkpoint=None):
+        """
+        Generator version of run(): advances the simulation and yields
+        (step, positions, velocities) whenever the step number is a multiple
+        of `every` (with block time steps: at every `every`-th DT_MAX
+        synchronisation, step counted in units of DT).
         
-        for step in range(STEPS):
-            # 1. Update positions
-            self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-            
-            # 2. Update forces (acceleration) at new positions
-            new_acc = self.get_forces(self.stars_pos)
-            
-            # 3. Update velocities
-            self.stars_vel += 0.5 * (acc + new_acc) * dt
+        The arrays are read-only views of the live state: nothing is copied,
+        and they change when the generator resumes, so copy what must be
+        kept. trajectory and checkpoint work as in run().
+        """
+        saved = None if checkpoint is None else checkpoint.load()
+        if self.block_timesteps:
+            yield from self._run_block(steps, trajectory, checkpoint, saved, every)
+        else:
+            engine = self.engine
+            if saved is not None:
+                self._restore_checkpoint(saved)
+                target = saved['target']
+            else:
+                target = engine.steps_taken + steps
+            print(f"[INFO] Starting integration for {target - engine.steps_taken} steps "
+                  f"({self.integrator.scheme.name})...")
             
-            # Update acc for next step
-            acc = new_acc
+            def after_step(step, pos, vel):
+                if engine.steps_taken % PROFILE_EVERY == 0:
+                    self.profile.update(pos, vel, self.star_mass)
+                if trajectory is not None:
+                    trajectory.record(engine.steps_taken, engine.time, positions=pos, velocities=vel)
+                if checkpoint is not None and checkpoint.due(engine.steps_taken):
+                    checkpoint.save(self._checkpoint_state(target=target))
             
-            # Store data for final snapshot
-            if step == STEPS - 1:
-                r_final = np.linalg.norm(self.stars_pos, axis=1)
-                v_final = np.linalg.norm(self.stars_vel, axis=1)
-                self.history_r = r_final
-                self.history_v = v_final
+            yield from engine.iter_steps(target - engine.steps_taken, every, after_step)
+            if checkpoint is not None:
+                checkpoint.save(self._checkpoint_state(target=target))
 
-        print("[INFO] Simulation Complete.")
+    def _run_block(self, steps, trajectory=None, checkpoint=None, saved=None, every=1):
+        """
+        Hierarchical block time-stepping over the same total time steps * DT
+        (steps must be a whole number of DT_MAX synchronisations).
+
+        Time is counted in ticks of the finest step DT_MAX / 2^max_rung. A star
+        on rung k takes a full step of 2^(max_rung - k) ticks whenever the
+        clock reaches its own time, so only the active rung is kicked and
+        drifted. Stars move to a finer rung at the end of any step, and to the
+        next coarser one only where that rung's steps begin. All stars are
+        synchronised every DT_MAX.
+        """
+        ticks = 1 << self.max_rung
+        tick_dt = DT_MAX / ticks
+        engine = self.engine
+        steps_per_base = int(round(DT_MAX / DT))
+        
+        if saved is not None:
+            self._restore_checkpoint(saved)
+            n_base, first = saved['n_base'], saved['base']
+            acc, rungs = saved['block_acc'], saved['rungs']
+        else:
+            if steps % steps_per_base:
+                raise ValueError(f"Block time steps run whole DT_MAX={DT_MAX} synchronisations: "
+                                 f"steps must be a multiple of {steps_per_base}, got {steps}")
+            n_base, first = steps // steps_per_base, 0
+            acc = self.get_forces(self.stars_pos).copy()
+            rungs = self._target_rungs(self.stars_pos, acc)
+        star_tick = np.zeros(self.n_stars, dtype=np.int64)
+        
+        print(f"[INFO] Starting block integration for {n_base - first} x DT_MAX={DT_MAX} "
+              f"(rungs {rungs.min()}-{rungs.max()}, {self.integrator.scheme.name})...")
+        
+        for base in range(first, n_base):
+            star_tick[:] = 0
+            now = 0
+            while now < ticks:
+                active = np.flatnonzero(star_tick == now)
+                span = ticks >> rungs[active]
+                
+                pos = self.stars_pos[active]
+                vel = self.stars_vel[active]
+                carry = None if self.pos_carry is None else self.pos_carry[active]
+                vel_carry = None if self.vel_carry is None else self.vel_carry[active]
+                acc_active = self.integrator.step(pos, vel, self.get_forces,
+                                                  (span * tick_dt)[:, None], acc[active],
+                                                  carry, vel_carry)
+                if acc_active is None:
+                    acc_active = self.get_forces(pos)
+                self.stars_pos[active] = pos
+                self.stars_vel[active] = vel
+                if carry is not None:
+                    self.pos_carry[active] = carry
+                    self.vel_carry[active] = vel_carry
+                acc[active] = acc_active
+                star_tick[active] += span
+                
+                # New rungs: refine freely, coarsen one level where aligned
+                target = self._target_rungs(pos, acc_active)
+                current = rungs[active]
+                coarser = np.maximum(current - 1, 0)
+                aligned = star_tick[active] % (ticks >> coarser) == 0
+                rungs[active] = np.where(target > current, target,
+                                         np.where((target < current) & aligned, coarser, current))
+                
+                now = star_tick.min()
+            
+            # The engine's clock counts the synchronisation in units of DT,
+            # continuing across runs like the global step path
+            engine.steps_taken += steps_per_base
+            engine.time += DT_MAX
+            step = engine.steps_taken
+            self.profile.update(self.stars_pos, self.stars_vel, self.star_mass)
+            if trajectory is not None:
+                trajectory.append(step, engine.time,
+                                  positions=self.stars_pos, velocities=self.stars_vel)
+            if checkpoint is not None and (base + 1 == n_base or checkpoint.due(base + 1)):
+                checkpoint.save(self._checkpoint_state(n_base=n_base, base=base + 1,
+                                                       block_acc=acc, rungs=rungs))
+            if (base + 1) % every == 0:
+                self.rungs = rungs
+                yield (step,) + engine.readonly_views()
+        
+        self.rungs = rungs
+        engine.invalidate()
 
 def plot_results(sim_newton, sim_entropic):
     """Generate comparative plots."""
@@ -168,21 +459,26 @@ def plot_results(sim_newton, sim_entropic):
     r_grid = np.linspace(R_MIN, R_MAX, 100)
     
     # Newton Analytical
-    a_n = G * M_CORE / r_grid**2
+    a_n = newtonian_acceleration(r_grid, M_CORE, G)
     v_n = np.sqrt(a_n * r_grid)
     
     # Entropic Analytical
-    a_e = 0.5 * (a_n + np.sqrt(a_n**2 + 4 * a_n * A0))
+    a_e = MODE_LAWS['Entropic'](a_n)
     v_e = np.sqrt(a_e * r_grid)
 
     plt.plot(r_grid, v_n, 'k--', label='Newtonian Prediction ($v \propto r^{-1/2}$)', alpha=0.7)
     plt.plot(r_grid, v_e, 'r--', label='Entropic Prediction (Flat)', alpha=0.7)
 
-    # Simulation Data
-    plt.scatter(sim_newton.history_r, sim_newton.history_v, 
-                s=10, c='gray', label='Sim Data: Newtonian', alpha=0.5)
-    plt.scatter(sim_entropic.history_r, sim_entropic.history_v, 
-                s=10, c='red', label='Sim Data: Entropic', alpha=0.5)
+    # Simulation Data: time-averaged <v_phi> per radial bin, bars are sigma_phi
+    for sim, color, name in ((sim_newton, 'gray', 'Newtonian'), (sim_entropic, 'red', 'Entropic')):
+        stats = sim.profile
+        if stats.n_samples == 0:
+            # Runs shorter than PROFILE_EVERY steps: profile of the final state
+            stats = RadialProfile(stats.edges)
+            stats.update(sim.stars_pos, sim.stars_vel, sim.star_mass)
+        profile = stats.profile()
+        plt.errorbar(profile['r'], profile['v_circ'], yerr=profile['sigma_phi'], fmt='o',
+                     ms=4, c=color, capsize=2, label=f'Sim Data: {name}', alpha=0.7)
 
     plt.xlabel('Distance from Galactic Center ($r$)')
     plt.ylabel('Orbital Velocity ($v$)')
@@ -190,6 +486,7 @@ def plot_results(sim_newton, sim_entropic):
     plt.legend()
     plt.grid(True, alpha=0.3)
     
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_path = os.path.join(OUTPUT_DIR, 'rotation_curve_comparison.png')
     plt.savefig(output_path)
     print(f"[RESULT] Plot saved to: {output_path}")
@@ -0,0 +1,319 @@
+"""
+Trajectory Store Module: Memory-Mapped On-Disk Simulation History
+-----------------------------------------------------------------
+
+Keeps every recorded snapshot of a run on disk instead of in a Python list,
+so long large-N runs can be analysed and rendered afterwards with bounded
+memory.
+
+Layout of a store directory:
+    index.json                 small header: particle count, dimension,
+                               dtype, fields, cadence, chunk length and the
+                               number of snapshots written
+    step_00000.npy             (chunk_steps,) int64 step numbers
+    time_00000.npy             (chunk_steps,) float64 simulation times
+    positions_00000.npy        (chunk_steps, N, dim) per field, .npy format
+    ...
+
+Snapshots are appended chunk by chunk through np.memmap (np.lib.format
+.open_memmap), so only the open chunk of every field is mapped while
+writing. Reads map one chunk at a time and copy out just the requested
+snapshot or particle rows; the operating system pages in the rest lazily.
+The index is rewritten atomically (write + os.replace) on flush, so a
+reader never sees a snapshot count beyond the data on disk.
+"""
+
+import json
+import os
+import re
+import numpy as np
+from typing import Dict, Iterator, Optional, Sequence
+
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_STEPS = 64
+MODES = ('r', 'w', 'a')
+
+
+class TrajectoryStore:
+    """
+    Append-only snapshot store on disk with random-access reads.
+
+    Parameters:
+    -----------
+    path : str
+        Store directory
+    mode : str
+        'r' read an existing store, 'w' create (replacing an existing
+        store; other files in the directory are kept), 'a' append to an
+        existing store
+    n_particles, dim : int
+        State shape per snapshot (required for 'w')
+    fields : sequence of str
+        Per-particle arrays recorded every snapshot
+    dtype : np.dtype
+        Floating type on disk
+    every : int
+        Cadence: record() keeps steps that are multiples of `every`
+    chunk_steps : int
+        Snapshots per chunk file
+    """
+
+    def __init__(self, path: str, mode: str = 'r', n_particles: Optional[int] = None,
+                 dim: int = 2, fields: Sequence[str] = ('positions', 'velocities'),
+                 dtype=np.float64, every: int = 1, chunk_steps: int = DEFAULT_CHUNK_STEPS):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Available: {', '.join(MODES)}")
+        self.path = path
+        self.mode = mode
+        if mode == 'w':
+            if n_particles is None:
+                raise ValueError("A new store needs n_particles")
+            if every < 1 or chunk_steps < 1:
+                raise ValueError("every and chunk_steps must be positive")
+            os.makedirs(path, exist_ok=True)
+            self._clear(fields)
+            self.header = {'version': FORMAT_VERSION, 'n_particles': int(n_particles),
+                           'dim': int(dim), 'dtype': np.dtype(dtype).str,
+                           'fields': list(fields), 'every': int(every),
+                           'chunk_steps': int(chunk_steps), 'count': 0}
+            self._write_index()
+        else:
+            with open(os.path.join(path, INDEX_FILE)) as f:
+                self.header = json.load(f)
+        self._open = {}        # chunk -> {name: memmap}, the chunk being written or read
+
+    def _clear(self, fields: Sequence[str]):
+        """
+        Remove a previous store from the directory: its index and the chunk
+        files of its fields and of `fields`, nothing else. Chunk-named files
+        without an index are not ours to delete, so they raise.
+        """
+        names = {'step', 'time'} | set(fields)
+        index = os.path.join(self.path, INDEX_FILE)
+        try:
+            with open(index) as f:
+                names |= set(json.load(f)['fields'])
+            owned = True
+        except (OSError, ValueError, KeyError, TypeError):
+            owned = False
+        pattern = re.compile(r"(%s)_\d{5}\.npy" % '|'.join(map(re.escape, sorted(names))))
+        chunks = [name for name in os.listdir(self.path) if pattern.fullmatch(name)]
+        if chunks and not owned:
+            raise FileExistsError(f"{self.path} holds chunk files ({chunks[0]}, ...) "
+                                  f"but no valid {INDEX_FILE}; not overwriting them")
+        for name in chunks:
+            os.remove(os.path.join(self.path, name))
+        if owned:
+            os.remove(index)
+
+    # --- Header ---
+
+    @property
+    def n_particles(self) -> int:
+        return self.header['n_particles']
+
+    @property
+    def dim(self) -> int:
+        return self.header['dim']
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self.header['dtype'])
+
+    @property
+    def fields(self):
+        return tuple(self.header['fields'])
+
+    @property
+    def every(self) -> int:
+        return self.header['every']
+
+    @property
+    def chunk_steps(self) -> int:
+        return self.header['chunk_steps']
+
+    def __len__(self) -> int:
+        return self.header['count']
+
+    def _write_index(self):
+        tmp = os.path.join(self.path, INDEX_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.header, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+
+    # --- Chunks ---
+
+    def _file(self, name: str, chunk: int) -> str:
+        return os.path.join(self.path, f"{name}_{chunk:05d}.npy")
+
+    def _chunk(self, chunk: int, create: bool = False) -> Dict[str, np.memmap]:
+        """Memory maps of one chunk, keeping only one chunk mapped at a time."""
+        if chunk in self._open:
+            return self._open[chunk]
+        self._release()
+        if create:
+            shape = (self.chunk_steps, self.n_particles, self.dim)
+            arrays = {'step': np.lib.format.open_memmap(self._file('step', chunk), 'w+',
+                                                        np.int64, (self.chunk_steps,)),
+                      'time': np.lib.format.open_memmap(self._file('time', chunk), 'w+',
+                                                        np.float64, (self.chunk_steps,))}
+            for name in self.fields:
+                arrays[name] = np.lib.format.open_memmap(self._file(name, chunk), 'w+',
+                                                         self.dtype, shape)
+        else:
+            access = 'r' if self.mode == 'r' else 'r+'
+            arrays = {name: np.load(self._file(name, chunk), mmap_mode=access)
+                      for name in ('step', 'time') + self.fields}
+        self._open = {chunk: arrays}
+        return arrays
+
+    def _release(self):
+        for arrays in self._open.values():
+            for array in arrays.values():
+                if isinstance(array, np.memmap) and array.mode != 'r':
+                    array.flush()
+        self._open = {}
+
+    # --- Writing ---
+
+    def append(self, step: int, time: float = 0.0, **arrays) -> None:
+        """
+        Append one snapshot.
+
+        Parameters:
+        -----------
+        step : int
+            Step number of the snapshot
+        time : float
+            Simulation time
+        **arrays :
+            One (n_particles, dim) array per field, e.g. positions=...
+        """
+        if self.mode == 'r':
+            raise ValueError("Store is open read-only")
+        missing = set(self.fields) - set(arrays)
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(sorted(missing))}")
+        count = len(self)
+        chunk, slot = divmod(count, self.chunk_steps)
+        target = self._chunk(chunk, create=slot == 0)
+        target['step'][slot] = step
+        target['time'][slot] = time
+        for name in self.fields:
+            target[name][slot] = arrays[name]
+        self.header['count'] = count + 1
+
+    def record(self, step: int, time: float = 0.0, **arrays) -> bool:
+        """Append the snapshot if step falls on the cadence; returns whether it did."""
+        if step % self.every:
+            return False
+        self.append(step, time, **arrays)
+        return True
+
+    def flush(self):
+        """Write mapped data and then the index to disk."""
+        if self.mode != 'r':
+            self._release()
+            self._write_index()
+
+    def close(self):
+        self.flush()
+        self._open = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Reading ---
+
+    def _locate(self, index: int):
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f"Snapshot {index} out of range ({count} stored)")
+        return divmod(index, self.chunk_steps)
+
+    def read(self, field: str, index: int, particles=None) -> np.ndarray:
+        """
+        One snapshot of a field, optionally for a subset of particles.
+
+        Parameters:
+        -----------
+        field : str
+            Field name
+        index : int
+            Snapshot number (negative counts from the end)
+        particles : slice, int array or bool mask, optional
+            Particles to read; all by default
+
+        Returns:
+        --------
+        np.ndarray
+            In-memory copy, shape (n_selected, dim)
+        """
+        if field not in self.fields:
+            raise KeyError(f"Unknown field '{field}'")
+        chunk, slot = self._locate(index)
+        data = self._chunk(chunk)[field][slot]
+        return np.array(data if particles is None else data[particles])
+
+    def step_of(self, index: int) -> int:
+        """Step number of a snapshot."""
+        chunk, slot = self._locate(index)
+        return int(self._chunk(chunk)['step'][slot])
+
+    def time_of(self, index: int) -> float:
+        """Simulation time of a snapshot."""
+        chunk, slot = self._locate(index)
+        return float(self._chunk(chunk)['time'][slot])
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Step numbers of all snapshots."""
+        return self._column('step')
+
+    @property
+    def times(self) -> np.ndarray:
+        """Simulation times of all snapshots."""
+        return self._column('time')
+
+    def _column(self, name: str) -> np.ndarray:
+        out = np.empty(len(self), dtype=np.int64 if name == 'step' else np.float64)
+        for lo in range(0, len(self), self.chunk_steps):
+            n = min(self.chunk_steps, len(self) - lo)
+            out[lo:lo + n] = self._chunk(lo // self.chunk_steps)[name][:n]
+        return out
+
+    def find(self, step: int) -> int:
+        """Snapshot index of a step number."""
+        steps = self.steps
+        index = int(np.searchsorted(steps, step))
+        if index == len(steps) or steps[index] != step:
+            raise KeyError(f"Step {step} was not recorded")
+        return index
+
+    def track(self, field: str, particles, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Time series of a particle subset, shape (n_snapshots, n_selected, dim),
+        read chunk by chunk.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        selected = np.arange(self.n_particles)[particles]
+        out = np.empty((max(stop - start, 0), len(selected), self.dim), dtype=self.dtype)
+        index = start
+        while index < stop:
+            chunk, slot = divmod(index, self.chunk_steps)
+            n = min(self.chunk_steps - slot, stop - index)
+            out[index - start:index - start + n] = self._chunk(chunk)[field][slot:slot + n][:, selected]
+            index += n
+        return out
+
+    def iter_snapshots(self, *fields: str) -> Iterator[tuple]:
+        """Yield one tuple of arrays (default: all fields) per snapshot, in order."""
+        fields = fields or self.fields
+        for index in range(len(self)):
+            yield tuple(self.read(name, index) for name in fields)
@@ -0,0 +1,77 @@
+"""
+Tests for the Barnes-Hut tree gravity
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from barnes_hut import BarnesHutTree, tree_accelerations, expand_ranges
+
+
+def direct_accelerations(positions, masses, softening):
+    """O(N^2) reference sum"""
+    d = positions[None, :, :] - positions[:, None, :]
+    r2 = np.sum(d**2, axis=-1) + softening**2
+    np.fill_diagonal(r2, np.inf)
+    return np.sum(masses[None, :, None] * d / r2[..., None]**1.5, axis=1)
+
+
+class TestBarnesHut(unittest.TestCase):
+    """Tests for the tree code against direct summation"""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.masses = rng.uniform(0.5, 1.5, 1500)
+        self.pos2 = rng.normal(size=(1500, 2))
+        self.pos3 = rng.normal(size=(1500, 3))
+
+    def test_theta_zero_is_exact(self):
+        """Opening every cell reproduces the direct sum in 2D and 3D"""
+        for pos in (self.pos2, self.pos3):
+            expected = direct_accelerations(pos, self.masses, 0.01)
+            acc = tree_accelerations(pos, self.masses, theta=0.0, softening=0.01)
+            np.testing.assert_allclose(acc, expected, rtol=1e-10, atol=1e-10)
+
+    def test_opening_angle_controls_error(self):
+        """Median force error is small and grows with theta"""
+        expected = direct_accelerations(self.pos3, self.masses, 0.01)
+        norm = np.linalg.norm(expected, axis=1)
+        errors = []
+        for theta in (0.3, 0.6):
+            acc = tree_accelerations(self.pos3, self.masses, theta=theta, softening=0.01)
+            errors.append(np.median(np.linalg.norm(acc - expected, axis=1) / norm))
+        self.assertLess(errors[0], 1e-3)
+        self.assertLess(errors[0], errors[1])
+        self.assertLess(errors[1], 1e-2)
+
+    def test_external_targets(self):
+        """Field at arbitrary points matches the direct sum"""
+        tree = BarnesHutTree(self.pos2, self.masses)
+        targets = np.array([[10.0, 0.0], [0.0, -20.0]])
+        acc = tree.accelerations(targets, theta=0.0, G=2.0)
+        d = self.pos2[None, :, :] - targets[:, None, :]
+        expected = 2.0 * np.sum(self.masses[None, :, None] * d
+                                / np.sum(d**2, axis=-1, keepdims=True)**1.5, axis=1)
+        np.testing.assert_allclose(acc, expected, rtol=1e-12)
+
+    def test_duplicate_points(self):
+        """Coincident particles do not break the tree"""
+        pos = np.repeat(np.array([[0.0, 0.0], [1.0, 1.0]]), 20, axis=0)
+        acc = tree_accelerations(pos, 1.0, theta=0.5, softening=0.1)
+        self.assertTrue(np.all(np.isfinite(acc)))
+        np.testing.assert_allclose(acc[:20].sum(axis=0), -acc[20:].sum(axis=0))
+
+    def test_expand_ranges(self):
+        """Range flattening helper"""
+        owner, index = expand_ranges(np.array([5, 0, 9]), np.array([2, 0, 3]))
+        np.testing.assert_array_equal(owner, [0, 0, 2, 2, 2])
+        np.testing.assert_array_equal(index, [5, 6, 9, 10, 11])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for checkpoint / restart (checkpoint)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checkpoint import Checkpointer, save_checkpoint, load_checkpoint, rng_state, set_rng_state
+from entropic_fall_1d import simulate_entropic_fall
+from simulacao_galaxia import GalacticSimulation
+
+
+class Preempted(Exception):
+    pass
+
+
+class Preemption:
+    """Trajectory stand-in that kills the run at a given step"""
+
+    def __init__(self, at):
+        self.at = at
+
+    def record(self, step, time, **arrays):
+        if step == self.at:
+            raise Preempted
+
+    def append(self, step, time, **arrays):
+        self.record(step, time)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests for atomic saves and bit-exact restarts"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'run.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_roundtrip(self):
+        """Arrays keep dtype and bits, the rest goes through JSON; the RNG resumes"""
+        np.random.seed(3)
+        np.random.normal()
+        state = {'a': np.float32([1.5, np.pi]), 'n': 7, 'hist': [0.1, 1 / 3], 'name': None,
+                 **rng_state()}
+        expected = np.random.normal(size=3)
+        save_checkpoint(self.path, state)
+        self.assertEqual(os.listdir(self.dir), ['run.npz'])
+        loaded = load_checkpoint(self.path)
+        self.assertEqual(loaded['a'].dtype, np.float32)
+        np.testing.assert_array_equal(loaded['a'], state['a'])
+        self.assertEqual((loaded['n'], loaded['hist'], loaded['name']), (7, [0.1, 1 / 3], None))
+        set_rng_state(loaded)
+        np.testing.assert_array_equal(np.random.normal(size=3), expected)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.path)
+
+    def resume(self, steps, preempt_at, **kwargs):
+        """Final state of an uninterrupted run and of a preempted + resumed one"""
+        np.random.seed(0)
+        reference = GalacticSimulation('Entropic', n_stars=200, **kwargs)
+        reference.run(steps)
+        checkpoint = Checkpointer(self.path, every_steps=4)
+        np.random.seed(0)
+        first = GalacticSimulation('Entropic', n_stars=200, **kwargs)
+        with self.assertRaises(Preempted):
+            first.run(steps, trajectory=Preemption(preempt_at), checkpoint=checkpoint)
+        np.random.seed(1)   # the restarted job draws different initial conditions
+        resumed = GalacticSimulation('Entropic', n_stars=200, **kwargs)
+        resumed.run(steps, checkpoint=checkpoint)
+        return reference, resumed
+
+    def test_restart_is_bit_exact(self):
+        """Kahan float32 state, carries and cached force survive a preemption"""
+        reference, resumed = self.resume(30, 18, dtype=np.float32, accumulation='kahan',
+                                         integrator='forest_ruth')
+        np.testing.assert_array_equal(resumed.stars_pos, reference.stars_pos)
+        np.testing.assert_array_equal(resumed.stars_vel, reference.stars_vel)
+        np.testing.assert_array_equal(resumed.pos_carry, reference.pos_carry)
+        self.assertEqual(resumed.n_force_evals, reference.n_force_evals)
+        self.assertEqual(resumed.engine.steps_taken, 30)
+        np.testing.assert_array_equal(resumed.profile.profile()['v_circ'],
+                                      reference.profile.profile()['v_circ'])
+
+    def test_block_restart_is_bit_exact(self):
+        """Block time steps resume at a synchronisation with their rungs"""
+        reference, resumed = self.resume(112, 80, block_timesteps=True)
+        np.testing.assert_array_equal(resumed.stars_pos, reference.stars_pos)
+        np.testing.assert_array_equal(resumed.rungs, reference.rungs)
+        self.assertEqual(resumed.n_force_evals, reference.n_force_evals)
+        self.assertEqual(resumed.engine.steps_taken, 112)
+        self.assertEqual(resumed.engine.time, reference.engine.time)
+
+    def test_entropic_fall_restart(self):
+        """The Metropolis walk continues with the saved RNG stream"""
+        np.random.seed(5)
+        reference = simulate_entropic_fall(steps=400, temperature=0.05)
+        np.random.seed(5)
+        checkpoint = Checkpointer(self.path, every_steps=100)
+        partial = simulate_entropic_fall(steps=250, temperature=0.05, checkpoint=checkpoint)
+        self.assertEqual(partial, reference[:251])
+        # A 400-step job preempted after step 250 continues from there
+        state = load_checkpoint(self.path)
+        self.assertEqual(state['step'], 250)
+        np.random.seed(9)
+        resumed = simulate_entropic_fall(steps=400, temperature=0.05, checkpoint=checkpoint)
+        self.assertEqual(resumed, reference)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the reactive cosmology solver (cosmology)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+from scipy.optimize import brentq
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cosmology import e_lcdm, e_reactive, hubble_reactive, reactive_alpha
+
+
+def reference(z, omega_b, omega_l, alpha, exponent, power):
+    """Bracketed scalar root of the reactive Friedmann equation."""
+    def residual(e):
+        return e**2 - omega_b * (1 + z)**3 - omega_l - alpha * e**power * (1 + z)**exponent
+    return brentq(residual, 1e-3, 1e6, xtol=1e-14, rtol=1e-14)
+
+
+class TestCosmology(unittest.TestCase):
+
+    def test_closed_form_roots(self):
+        """n = 1 (quadratic) and n = 0 satisfy the equation and E(0) = 1"""
+        z = np.linspace(0, 5, 11)
+        for power in (0.0, 1.0):
+            e = e_reactive(z, power=power)
+            self.assertAlmostEqual(e[0], 1.0, places=14)
+            alpha = reactive_alpha()
+            residual = e**2 - 0.049 * (1 + z)**3 - 0.69 - alpha * e**power * (1 + z)**1.5
+            np.testing.assert_allclose(residual, 0.0, atol=1e-12)
+        self.assertIsInstance(e_reactive(1.5), float)
+
+    def test_newton_variants(self):
+        """Other coupling powers converge to the bracketed root"""
+        z = np.array([0.0, 0.5, 2.0, 10.0])
+        for power in (0.25, 0.5, 1.5):
+            e = e_reactive(z, 0.05, 0.7, exponent=2.0, power=power)
+            expected = [reference(zi, 0.05, 0.7, 0.25, 2.0, power) for zi in z]
+            np.testing.assert_allclose(e, expected, rtol=1e-11)
+        with self.assertRaises(ValueError):
+            e_reactive(z, 0.05, 0.7, alpha=-0.1, power=0.5)
+        with self.assertRaises(ValueError):
+            e_reactive(z, power=2.0)
+
+    def test_parameter_grids(self):
+        """Redshifts x parameter grids broadcast in one call"""
+        z = np.linspace(0, 3, 50)
+        omega_b = np.array([0.03, 0.05])[:, None, None]
+        omega_l = np.array([0.6, 0.7, 0.72])[None, :, None]
+        for power in (1.0, 0.5):
+            e = e_reactive(z, omega_b, omega_l, power=power)
+            self.assertEqual(e.shape, (2, 3, 50))
+            np.testing.assert_allclose(e[..., 0], 1.0)
+            self.assertAlmostEqual(e[1, 2, 30], reference(z[30], 0.05, 0.72, 0.23, 1.5, power),
+                                   places=10)
+        # alpha = 0 is LCDM with Omega_m = Omega_b; H scales with H0
+        np.testing.assert_allclose(e_reactive(z, 0.3, 0.7), e_lcdm(z, 0.3))
+        np.testing.assert_allclose(hubble_reactive(z, 70.0), 70.0 * e_reactive(z))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized Toomre Q engine (disk_stability)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import InterpolationLaw, LAWS
+from disk_stability import epicyclic_frequency, toomre_q, parameter_grid, stable_fraction, GAS
+
+
+class TestToomreQ(unittest.TestCase):
+    """Tests for the analytic epicyclic frequency and Q grids"""
+
+    def test_limits(self):
+        """kappa = Omega for Newton and sqrt(2) Omega in the deep-MOND regime"""
+        r = np.linspace(1, 100, 50)
+        omega = np.sqrt(1e3 / r**3)
+        np.testing.assert_allclose(epicyclic_frequency(r, 1e3, 'newton', 0.0), omega, rtol=1e-12)
+        deep = epicyclic_frequency(1e6, 1.0, InterpolationLaw('simple', 1.0))
+        omega_deep = np.sqrt(InterpolationLaw('simple', 1.0)(1e-12) / 1e6)
+        self.assertAlmostEqual(deep / omega_deep, np.sqrt(2), places=5)
+
+    def test_matches_numerical_derivative(self):
+        """kappa^2 = R dOmega^2/dR + 4 Omega^2 for every law"""
+        r = np.geomspace(1, 500, 60)
+        h = 1e-5 * r
+        for name in LAWS:
+            law = InterpolationLaw(name, 0.5)
+            omega2 = lambda x: law(2e3 / x**2) / x
+            kappa2 = r * (omega2(r + h) - omega2(r - h)) / (2 * h) + 4 * omega2(r)
+            smooth = np.abs(2e3 / r**2 - 0.5) > 1e-2
+            np.testing.assert_allclose(epicyclic_frequency(r, 2e3, law)[smooth]**2, kappa2[smooth],
+                                       rtol=1e-6, err_msg=name)
+
+    def test_broadcast_grid(self):
+        """One call evaluates radius x mass x a0 x sigma x Sigma"""
+        grid = parameter_grid(r=np.linspace(5, 150, 7), mass=[1e2, 1e3, 1e4], a0=[0.5, 2.0],
+                              sigma=[1.0, 10.0], surface_density=[0.5, 1.0, 2.0])
+        q = toomre_q(**grid)
+        self.assertEqual(q.shape, (7, 3, 2, 2, 3))
+        law = InterpolationLaw('simple', 2.0)
+        expected = epicyclic_frequency(grid['r'].ravel(), 1e3, law) * 10.0 / (3.36 * 2.0)
+        np.testing.assert_allclose(q[:, 1, 1, 1, 2], expected, rtol=1e-14)
+        self.assertEqual(stable_fraction(q).shape, (3, 2, 2, 3))
+        gas = toomre_q(10.0, 1e3, 1.0, 1.0, law, factor=GAS)
+        self.assertAlmostEqual(gas * np.pi, toomre_q(10.0, 1e3, 1.0, 1.0, law) * 3.36)
+        with self.assertRaises(ValueError):
+            epicyclic_frequency(10.0, 1e3, 'simple')
+
+
+if __name__ == '__main__':
+    unittest.main()
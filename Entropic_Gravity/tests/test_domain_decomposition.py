@@ -0,0 +1,70 @@
+"""
+Tests for the multi-process domain decomposition
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from domain_decomposition import DomainDecomposition
+from direct_summation import direct_accelerations
+
+
+def disk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    phi = rng.uniform(0, 2 * np.pi, n)
+    r = np.sqrt(rng.uniform(10**2, 500**2, n))
+    return np.column_stack([r * np.cos(phi), r * np.sin(phi)])
+
+
+class TestDomainDecomposition(unittest.TestCase):
+    """Tests for shared-memory domain decomposition"""
+
+    def test_exact_for_both_decompositions(self):
+        """With theta = 0 the sum over domain trees is the direct sum"""
+        pos = disk(2000)
+        masses = np.random.default_rng(1).uniform(0.5, 1.5, 2000)
+        expected = direct_accelerations(pos, masses, softening=1.0)
+        for decomposition in ('angular', 'radial'):
+            with DomainDecomposition(2000, 3, decomposition=decomposition,
+                                     theta=0.0, softening=1.0) as solver:
+                acc = solver.accelerations(pos, masses)
+                np.testing.assert_allclose(acc, expected, rtol=1e-9, atol=1e-15)
+                self.assertEqual(solver.domain_counts.sum(), 2000)
+                self.assertLessEqual(np.ptp(solver.domain_counts), 1)
+
+    def test_migration_and_rebalance(self):
+        """Orbiting particles migrate; compressing one side triggers a rebalance"""
+        pos = disk(1200, seed=2)
+        with DomainDecomposition(1200, 4, theta=0.7, softening=1.0) as solver:
+            solver.accelerations(pos, 1.0)
+            self.assertEqual(solver.n_rebalances, 1)
+
+            # Rigid rotation keeps the load balanced but moves particles across edges
+            c, s = np.cos(0.2), np.sin(0.2)
+            solver.accelerations(pos @ np.array([[c, s], [-s, c]]), 1.0)
+            self.assertGreater(solver.n_migrated, 0)
+            self.assertEqual(solver.n_rebalances, 1)
+
+            # Squeeze every particle into the upper half plane
+            squeezed = pos.copy()
+            squeezed[:, 1] = np.abs(squeezed[:, 1])
+            solver.accelerations(squeezed, 1.0)
+            self.assertEqual(solver.n_rebalances, 2)
+            self.assertLessEqual(np.ptp(solver.domain_counts), 1)
+
+    def test_capacity_and_options(self):
+        """Too many particles or unknown decompositions raise"""
+        with self.assertRaises(ValueError):
+            DomainDecomposition(10, 1, decomposition='hilbert')
+        with DomainDecomposition(10, 1) as solver:
+            with self.assertRaises(ValueError):
+                solver.accelerations(disk(11), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
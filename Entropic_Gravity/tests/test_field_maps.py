@@ -0,0 +1,82 @@
+"""
+Tests for grid field maps of the external field effect (field_maps)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import InterpolationLaw, apply_to_field
+from field_maps import field_map, grid_points
+from galaxy_flyby import CoreField, SOURCE_BLOCK
+
+LAW = InterpolationLaw('simple', 2.0)
+BODIES = [[-50.0, 0.0], [50.0, 0.0]]
+
+
+class TestFieldMaps(unittest.TestCase):
+    """Tests for vectorized 2D / 3D field maps"""
+
+    def test_line_matches_point_loop(self):
+        """The y = 0 slice equals the per-point evaluation of the collision test"""
+        x = np.linspace(-100, 100, 200)
+        line = field_map(BODIES, [1e3, 1e3], (x, 0.0), LAW, r_min=1.0)
+        self.assertEqual(line['g'].shape, (2, 200))
+        for i in (0, 57, 99, 120):
+            p = np.array([x[i], 0.0])
+            g_n = sum(-1e3 * (p - b) / np.linalg.norm(p - b)**3 for b in np.array(BODIES))
+            np.testing.assert_allclose(line['g_newton'][:, i], g_n, rtol=1e-12)
+            np.testing.assert_allclose(line['g'][:, i], apply_to_field(g_n, LAW), rtol=1e-12)
+        near = np.abs(np.abs(x) - 50) < 1.0
+        self.assertTrue(np.all(np.isnan(line['g_mag'][near])))
+        self.assertFalse(np.any(np.isnan(line['g_mag'][~near])))
+
+    def test_grid_shapes_and_3d_slice(self):
+        """Maps are (ny, nx) ready to plot; the z = 0 plane of 3D sources matches 2D"""
+        x, y = np.linspace(-100, 100, 30), np.linspace(-80, 80, 20)
+        flat = field_map(BODIES, [1e3, 1e3], (x, y), LAW, softening=2.0)
+        self.assertEqual(flat['boost'].shape, (20, 30))
+        self.assertEqual(flat['g'].shape, (2, 20, 30))
+        np.testing.assert_allclose(flat['g_newton'][0, 4, 7],
+                                   CoreField([1e3, 1e3], softening=2.0).field(
+                                       np.array([[x[7], y[4]]]), np.array(BODIES))[0, 0])
+        bodies_3d = np.column_stack([BODIES, [0.0, 0.0]])
+        plane = field_map(bodies_3d, [1e3, 1e3], (x, y, 0.0), LAW, softening=2.0)
+        np.testing.assert_allclose(plane['g'][:2], flat['g'], rtol=1e-12)
+        cube = field_map(bodies_3d, [1e3, 1e3], (x, y, np.linspace(-10, 10, 5)), LAW)
+        self.assertEqual(cube['g_mag'].shape, (20, 30, 5))
+        points, shape = grid_points((x, 1.0, y))
+        self.assertEqual((points.shape, shape), ((600, 3), (30, 20)))
+
+    def test_external_field_effect(self):
+        """A lone source superposes trivially; a neighbour suppresses the boost"""
+        x = np.linspace(-150, 150, 41)
+        single = field_map([[0.0, 0.0]], [1e3], (x, x), LAW, softening=1.0, superposed=True)
+        np.testing.assert_allclose(single['efe'], 1.0, rtol=1e-12)
+        pair = field_map(BODIES, [1e3, 1e3], (x, x), LAW, softening=1.0, superposed=True)
+        self.assertLess(pair['efe'][20, 0], 1.0)    # far side: external field suppresses
+        self.assertGreater(pair['efe'][20, 22], 1.0)  # saddle: fields cancel, boost grows
+
+    def test_extended_sources(self):
+        """Per-source Plummer radii and more sources than one block"""
+        rng = np.random.default_rng(1)
+        sources = rng.normal(scale=20, size=(SOURCE_BLOCK + 44, 2))
+        masses = rng.uniform(1, 2, len(sources))
+        radii = rng.uniform(1, 5, len(sources))
+        targets = rng.uniform(-60, 60, size=(500, 2))
+        diff = sources[None] - targets[:, None]
+        r2 = np.sum(diff**2, axis=-1) + radii**2
+        expected = np.sum(masses[:, None] * diff / r2[..., None]**1.5, axis=1)
+        field = CoreField(masses, softening=radii, chunk=128)
+        np.testing.assert_allclose(field.field(targets, sources), expected, rtol=1e-10)
+        field = CoreField(masses, LAW, softening=radii)
+        np.testing.assert_allclose(field.field(targets, sources), apply_to_field(expected, LAW),
+                                   rtol=1e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
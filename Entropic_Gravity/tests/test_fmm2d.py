@@ -0,0 +1,72 @@
+"""
+Tests for the 2D fast multipole gravity
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fmm2d import FastMultipole2D, fmm_accelerations, binomial
+from direct_summation import direct_accelerations
+
+
+class TestFastMultipole(unittest.TestCase):
+    """Tests for the FMM against direct summation"""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 6000
+        phi = rng.uniform(0, 2 * np.pi, n)
+        r = np.sqrt(rng.uniform(10**2, 500**2, n))
+        self.pos = np.column_stack([r * np.cos(phi), r * np.sin(phi)])
+        self.masses = rng.uniform(0.5, 1.5, n)
+
+    def relative_error(self, acc, reference):
+        return np.linalg.norm(acc - reference, axis=1) / np.linalg.norm(reference, axis=1)
+
+    def test_error_falls_with_order(self):
+        """Higher expansion orders converge to the direct sum, softened or not"""
+        for softening in (0.0, 2.0):
+            reference = direct_accelerations(self.pos, self.masses, softening)
+            errors = []
+            for order in (2, 6, 12):
+                solver = FastMultipole2D(order, softening, leaf_size=16)
+                errors.append(np.median(self.relative_error(
+                    solver.accelerations(self.pos, self.masses), reference)))
+                self.assertGreaterEqual(solver.levels, 2)
+            self.assertLess(errors[1], errors[0] / 10)
+            self.assertLess(errors[2], errors[1] / 10)
+            self.assertLess(errors[2], 1e-4)
+
+    def test_shallow_tree_is_exact(self):
+        """Below two levels everything is near field, i.e. the direct sum"""
+        pos = self.pos[:50]
+        acc = fmm_accelerations(pos, 2.0, order=3, G=3.0)
+        np.testing.assert_allclose(acc, 3.0 * direct_accelerations(pos, 2.0), rtol=1e-10)
+
+    def test_empty_input(self):
+        """No particles give an empty (0, 2) result like the direct sum"""
+        acc = FastMultipole2D().accelerations(np.zeros((0, 2)), 1.0)
+        self.assertEqual(acc.shape, (0, 2))
+        self.assertEqual(acc.shape, direct_accelerations(np.zeros((0, 2)), 1.0).shape)
+
+    def test_invalid_input(self):
+        """3D positions and non-positive orders are rejected"""
+        with self.assertRaises(ValueError):
+            FastMultipole2D().accelerations(np.zeros((10, 3)), 1.0)
+        with self.assertRaises(ValueError):
+            FastMultipole2D(order=0)
+
+    def test_binomial(self):
+        """Generalized binomial coefficients"""
+        self.assertEqual(binomial(5, 2), 10.0)
+        self.assertEqual(binomial(2, 3), 0.0)
+        self.assertAlmostEqual(binomial(-0.5, 2), 0.375)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests for the restricted three-body flyby engine (galaxy_flyby)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import InterpolationLaw, NEWTON, apply_to_field
+from galaxy_flyby import CoreField, parabolic_encounter, core_disks
+
+LAW = InterpolationLaw('simple', 1e-3)
+
+
+class TestCoreField(unittest.TestCase):
+    """Tests for the chunked cores x particles kernel"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.masses = np.array([1e4, 3e3, 5e3])
+        self.cores = rng.uniform(-100, 100, size=(3, 2))
+        self.targets = rng.uniform(-300, 300, size=(1000, 2))
+
+    def newtonian(self, targets, softening):
+        diff = self.cores[None, :, :] - targets[:, None, :]
+        r2 = np.sum(diff**2, axis=-1) + softening**2
+        return np.sum(self.masses[None, :, None] * diff / r2[..., None]**1.5, axis=1)
+
+    def test_matches_broadcast_sum(self):
+        """Chunked blocks reproduce the full broadcast, law applied to the total field"""
+        expected = self.newtonian(self.targets, 2.0)
+        field = CoreField(self.masses, NEWTON, softening=2.0, chunk=37)
+        np.testing.assert_allclose(field.field(self.targets, self.cores), expected, rtol=1e-12)
+        field = CoreField(self.masses, LAW, softening=2.0, chunk=37)
+        np.testing.assert_allclose(field.field(self.targets, self.cores),
+                                   apply_to_field(expected, LAW), rtol=1e-12)
+        self.assertEqual(field.last_pairs, 3000)
+
+    def test_saddle_point(self):
+        """Between two equal cores the fields cancel before the correction"""
+        field = CoreField([1e3, 1e3], LAW, softening=0.0)
+        g = field.field(np.array([[0.0, 0.0], [10.0, 0.0]]), np.array([[-50.0, 0.0], [50.0, 0.0]]))
+        self.assertLess(np.abs(g[0]).max(), 1e-6)
+        g_n = 1e3 / 40**2 - 1e3 / 60**2
+        self.assertAlmostEqual(g[1, 0], LAW(g_n))
+
+    def test_engine_force(self):
+        """Cores feel each other (not themselves), particles feel all cores"""
+        field = CoreField(self.masses, LAW, softening=1.0)
+        positions = np.concatenate([self.cores, self.targets])
+        acc = field(positions)
+        np.testing.assert_allclose(acc[3:], apply_to_field(self.newtonian(self.targets, 1.0), LAW))
+        others = [np.delete(np.arange(3), i) for i in range(3)]
+        for i, rest in enumerate(others):
+            diff = self.cores[rest] - self.cores[i]
+            r2 = np.sum(diff**2, axis=1) + 1.0
+            g_n = np.sum(self.masses[rest, None] * diff / r2[:, None]**1.5, axis=0)
+            np.testing.assert_allclose(acc[i], apply_to_field(g_n, LAW))
+
+
+class TestFlyby(unittest.TestCase):
+    """Tests for initial conditions and the integrated encounter"""
+
+    def test_parabolic_encounter(self):
+        """Zero orbital energy, centre of mass at rest, Newtonian pericentre reached"""
+        masses = (2e4, 1e4)
+        pos, vel = parabolic_encounter(masses, pericentre=100.0, separation=800.0)
+        np.testing.assert_allclose(np.dot(masses, pos), 0.0, atol=1e-9)
+        np.testing.assert_allclose(np.dot(masses, vel), 0.0, atol=1e-9)
+        rel_v = vel[1] - vel[0]
+        self.assertAlmostEqual(0.5 * rel_v @ rel_v - 3e4 / 800.0, 0.0)
+        engine = core_disks(pos, vel, masses, 0, 10.0, 20.0, NEWTON, dt=0.05, softening=0.0)
+        separations = [np.linalg.norm(p[1] - p[0]) for _, p, _ in engine.iter_steps(8000, every=10)]
+        self.assertAlmostEqual(min(separations), 100.0, delta=0.5)
+
+    def test_moving_disk_stays_circular(self):
+        """A lone core in uniform motion carries its disk on circular orbits"""
+        np.random.seed(0)
+        engine = core_disks([[0.0, 0.0]], [[3.0, -1.0]], [1e4], 500, 50.0, 150.0, LAW,
+                            dt=0.2, softening=5.0, spins=[-1])
+        radii = np.linalg.norm(engine.store.positions[1:], axis=1)
+        for _ in engine.iter_steps(500, every=500):
+            pass
+        pos = engine.store.positions
+        np.testing.assert_allclose(pos[0], [300.0, -100.0])
+        np.testing.assert_allclose(np.linalg.norm(pos[1:] - pos[0], axis=1), radii, rtol=1e-2)
+        # Retrograde: clockwise about the core
+        rel_pos, rel_vel = pos[1:] - pos[0], engine.store.velocities[1:] - engine.store.velocities[0]
+        self.assertTrue(np.all(rel_pos[:, 0] * rel_vel[:, 1] - rel_pos[:, 1] * rel_vel[:, 0] < 0))
+
+    def test_inclined_disks(self):
+        """3D disks are tilted about x; 2D ones cannot be"""
+        np.random.seed(1)
+        engine = core_disks(np.zeros((1, 3)), np.zeros((1, 3)), [1e4], 100, 10.0, 50.0,
+                            inclinations=[np.pi / 2])
+        np.testing.assert_allclose(engine.store.positions[1:, 1], 0.0, atol=1e-12)
+        with self.assertRaises(ValueError):
+            core_disks(np.zeros((1, 2)), np.zeros((1, 2)), [1e4], 10, 10.0, 50.0,
+                       inclinations=[0.3])
+
+
+if __name__ == '__main__':
+    unittest.main()
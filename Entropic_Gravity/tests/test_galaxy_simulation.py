@@ -0,0 +1,240 @@
+"""
+Tests for the N-body disk simulation (simulacao_galaxia)
+"""
+
+import sys
+import os
+import unittest
+import tracemalloc
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import simulacao_galaxia as sg
+from simulacao_galaxia import GalacticSimulation
+
+
+def orbital_energy(sim):
+    """Specific Keplerian energy of every star around the core"""
+    r = np.linalg.norm(sim.stars_pos, axis=1)
+    return 0.5 * np.sum(sim.stars_vel**2, axis=1) - sg.G * sg.M_CORE / r
+
+
+class TestBlockTimesteps(unittest.TestCase):
+    """Tests for hierarchical per-star time steps"""
+
+    def run_newton(self, **kwargs):
+        np.random.seed(1)
+        sim = GalacticSimulation('Newton', **kwargs)
+        e0 = orbital_energy(sim)
+        sim.run()
+        return sim, np.max(np.abs(orbital_energy(sim) - e0) / np.abs(e0))
+
+    def test_cheaper_at_equal_accuracy(self):
+        """Block steps beat the global DT on both cost and worst-star energy error"""
+        sim_global, err_global = self.run_newton()
+        sim_block, err_block = self.run_newton(block_timesteps=True)
+
+        self.assertLess(err_block, err_global)
+        self.assertLess(sim_block.n_force_evals * 4, sim_global.n_force_evals)
+
+    def test_rungs_follow_dynamical_time(self):
+        """Inner stars sit on finer rungs than outer stars"""
+        sim, _ = self.run_newton(block_timesteps=True)
+        r = np.linalg.norm(sim.stars_pos, axis=1)
+        inner = sim.rungs[r < 30]
+        outer = sim.rungs[r > 300]
+        self.assertGreater(inner.min(), outer.max())
+        self.assertTrue(np.all((sim.rungs >= 0) & (sim.rungs <= sim.max_rung)))
+
+    def test_invalid_mode(self):
+        """Unknown modes raise errors"""
+        with self.assertRaises(ValueError):
+            GalacticSimulation('MOND')
+        with self.assertRaises(ValueError):
+            GalacticSimulation('Newton', force_backend='exact')
+        with self.assertRaises(ValueError):
+            GalacticSimulation('Newton', force_backend='tree', block_timesteps=True)
+
+
+class TestPrecision(unittest.TestCase):
+    """Tests for single-precision state"""
+
+    def energy_error(self, **kwargs):
+        np.random.seed(2)
+        sim = GalacticSimulation('Entropic', n_stars=300, **kwargs)
+        e0 = orbital_energy(sim)
+        sim.run(steps=3000)
+        self.assertEqual(sim.stars_vel.dtype, sim.dtype)
+        return sim, np.median(np.abs(orbital_energy(sim) - e0) / np.abs(e0))
+
+    def test_kahan_matches_double(self):
+        """Compensated float32 stays at float64 accuracy, plain float32 does not"""
+        double, err_double = self.energy_error()
+        single, err_single = self.energy_error(dtype=np.float32)
+        kahan, err_kahan = self.energy_error(dtype=np.float32, accumulation='kahan')
+        self.assertEqual(single.stars_pos.dtype, np.float32)
+        self.assertEqual(single.get_forces(single.stars_pos).dtype, np.float32)
+        drift = np.abs(err_single - err_double)
+        self.assertLess(np.abs(err_kahan - err_double) * 10, drift)
+        offset = np.linalg.norm(kahan.stars_pos - kahan.pos_carry - double.stars_pos, axis=1)
+        self.assertLess(np.median(offset), 1e-3)
+
+    def test_float64_positions_and_block_steps(self):
+        """Mixed precision keeps double positions; carries work with block steps"""
+        mixed, _ = self.energy_error(dtype=np.float32, accumulation='float64')
+        self.assertEqual(mixed.stars_pos.dtype, np.float64)
+        self.assertEqual(mixed.stars_vel.dtype, np.float32)
+        # Forces follow the positions: evaluated and buffered in float64
+        self.assertEqual(mixed.get_forces(mixed.stars_pos).dtype, np.float64)
+        np.random.seed(1)
+        sim = GalacticSimulation('Newton', dtype=np.float32, accumulation='kahan',
+                                 block_timesteps=True)
+        sim.run(steps=208)
+        self.assertTrue(np.all(np.isfinite(sim.stars_pos)))
+        # Only whole DT_MAX synchronisations: no silently rounded step count
+        with self.assertRaises(ValueError):
+            sim.run(steps=200)
+        with self.assertRaises(ValueError):
+            GalacticSimulation('Newton', accumulation='double')
+
+
+class TestWorkspace(unittest.TestCase):
+    """Tests for the allocation-free force evaluation"""
+
+    def test_no_steady_state_allocations(self):
+        """Steps allocate nothing proportional to the number of stars"""
+        n = 50000
+        for kwargs in ({}, {'dtype': np.float32, 'accumulation': 'kahan'}):
+            sim = GalacticSimulation('Entropic', n_stars=n, **kwargs)
+            for _ in sim.iter_steps(sg.PROFILE_EVERY):  # warm-up, one profile sample
+                pass
+            # The engine's step and the simulation's step loop, profile
+            # samples included
+            for advance in (lambda: [sim.engine.step() for _ in range(10)],
+                            lambda: list(sim.iter_steps(2 * sg.PROFILE_EVERY,
+                                                        every=sg.PROFILE_EVERY))):
+                tracemalloc.start()
+                try:
+                    start, _ = tracemalloc.get_traced_memory()
+                    advance()
+                    current, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                # One float32 temporary of N stars would be 200 kB
+                self.assertLess(peak - start, n)
+                self.assertLess(current - start, 4096)
+
+    def test_out_and_workspace(self):
+        """Results go to out= or to a reused workspace buffer"""
+        np.random.seed(0)
+        sim = GalacticSimulation('Entropic', n_stars=100)
+        first = sim.get_forces(sim.stars_pos)
+        expected = first.copy()
+        self.assertIs(sim.get_forces(sim.stars_pos).base, first.base)
+        out = np.empty_like(sim.stars_pos)
+        self.assertIs(sim.get_forces(sim.stars_pos, out=out), out)
+        np.testing.assert_array_equal(out, expected)
+        # Subsets (block time steps) use the front of the workspace
+        np.testing.assert_array_equal(sim.get_forces(sim.stars_pos[:10]), expected[:10])
+
+
+class TestStreaming(unittest.TestCase):
+    """Tests for the generator step API"""
+
+    def test_iter_steps_matches_run(self):
+        """Streaming with global and block steps ends where run() does"""
+        for kwargs, every, expected in (({}, 5, [5, 10, 15, 20]),
+                                        ({'block_timesteps': True}, 2, [32, 64])):
+            np.random.seed(7)
+            reference = GalacticSimulation('Newton', n_stars=100, **kwargs)
+            reference.run(steps=64 if kwargs else 20)
+            np.random.seed(7)
+            sim = GalacticSimulation('Newton', n_stars=100, **kwargs)
+            frames = list(sim.iter_steps(64 if kwargs else 20, every=every))
+            self.assertEqual([step for step, _, _ in frames], expected)
+            _, pos, vel = frames[-1]
+            self.assertFalse(pos.flags.writeable)
+            self.assertTrue(np.shares_memory(pos, sim.stars_pos))
+            np.testing.assert_array_equal(sim.stars_pos, reference.stars_pos)
+            np.testing.assert_array_equal(vel, reference.stars_vel)
+
+    def test_block_steps_continue_engine_clock(self):
+        """Block runs advance the engine's step and time, and later runs continue them"""
+        np.random.seed(7)
+        sim = GalacticSimulation('Newton', n_stars=100, block_timesteps=True)
+        first = [step for step, _, _ in sim.iter_steps(32)]
+        second = [step for step, _, _ in sim.iter_steps(32)]
+        self.assertEqual(first + second, [16, 32, 48, 64])
+        self.assertEqual(sim.engine.steps_taken, 64)
+        self.assertAlmostEqual(sim.engine.time, 4 * sg.DT_MAX)
+
+
+class TestSelfGravity(unittest.TestCase):
+    """Tests for the star-star force backends"""
+
+    def test_massless_disk_matches_central(self):
+        """A massless disk reproduces the core-only forces"""
+        np.random.seed(3)
+        central = GalacticSimulation('Entropic', n_stars=200)
+        for backend in ('direct', 'tree', 'parallel', 'pm', 'fmm'):
+            np.random.seed(3)
+            sim = GalacticSimulation('Entropic', n_stars=200, force_backend=backend, disk_mass=0.0)
+            np.testing.assert_allclose(sim.stars_vel, central.stars_vel, rtol=1e-12)
+            np.testing.assert_allclose(sim.get_forces(sim.stars_pos),
+                                       central.get_forces(central.stars_pos), rtol=1e-12)
+
+    def test_tree_converges_to_direct(self):
+        """The exact direct backend is the reference for the tree and the FMM"""
+        np.random.seed(6)
+        direct = GalacticSimulation('Entropic', n_stars=1000, force_backend='direct', n_threads=2)
+        np.random.seed(6)
+        exact_tree = GalacticSimulation('Entropic', n_stars=1000, force_backend='tree', theta=0.0)
+        np.random.seed(6)
+        tree = GalacticSimulation('Entropic', n_stars=1000, force_backend='tree')
+        reference = direct.get_forces(direct.stars_pos)
+        np.testing.assert_allclose(exact_tree.get_forces(exact_tree.stars_pos), reference, rtol=1e-9)
+        error = np.linalg.norm(tree.get_forces(tree.stars_pos) - reference, axis=1)
+        self.assertLess(np.median(error / np.linalg.norm(reference, axis=1)), 1e-3)
+        np.random.seed(6)
+        fmm = GalacticSimulation('Entropic', n_stars=1000, force_backend='fmm', fmm_order=12)
+        error = np.linalg.norm(fmm.get_forces(fmm.stars_pos) - reference, axis=1)
+        self.assertLess(np.median(error / np.linalg.norm(reference, axis=1)), 1e-6)
+
+    def test_pm_matches_tree_for_newton(self):
+        """Without the entropic law the mesh and tree disks pull alike away from the centre"""
+        np.random.seed(5)
+        tree = GalacticSimulation('Newton', n_stars=2000, force_backend='tree', disk_mass=1e4)
+        pm = GalacticSimulation('Newton', n_stars=2000, force_backend='pm', disk_mass=1e4,
+                                assignment='tsc')
+        pm.stars_pos = tree.stars_pos.copy()
+        r = np.linalg.norm(tree.stars_pos, axis=1)
+        pull_tree = -np.einsum('ij,ij->i', tree.get_forces(tree.stars_pos), tree.stars_pos) / r
+        pull_pm = -np.einsum('ij,ij->i', pm.get_forces(pm.stars_pos), pm.stars_pos) / r
+        # The mesh smooths the graininess of individual stars (and the disk edge):
+        # compare ring averages inside the disk
+        rings = np.digitize(r, np.linspace(200, 450, 6))
+        for k in range(1, 6):
+            ring = rings == k
+            self.assertAlmostEqual(pull_pm[ring].mean() / pull_tree[ring].mean(), 1.0, delta=0.05)
+
+    def test_disk_adds_to_total_field(self):
+        """Disk mass deepens the pull and the law acts on the total field"""
+        np.random.seed(4)
+        sim = GalacticSimulation('Entropic', n_stars=300, force_backend='tree', disk_mass=5e3)
+        acc = sim.get_forces(sim.stars_pos)
+        r = np.linalg.norm(sim.stars_pos, axis=1)
+        pull = -np.einsum('ij,ij->i', acc, sim.stars_pos) / r
+        core_only = sim._calc_acceleration_magnitude(r)
+        outer = r > 400
+        self.assertGreater(np.median(pull[outer] / core_only[outer]), 1.1)
+
+        sim.n_force_evals = 0
+        sim.run(steps=20)
+        self.assertTrue(np.all(np.isfinite(sim.history_v)))
+        self.assertEqual(sim.n_force_evals, 300 * 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the pluggable symplectic integrators
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from integrators import Integrator, SCHEMES, get_scheme, compensated_add
+
+
+def kepler_accel(pos):
+    """Point mass GM = 1 at the origin"""
+    r = np.sqrt(pos @ pos)
+    return -pos / r**3
+
+
+def run_kepler(scheme, dt, t_end=10.0):
+    """Eccentric Kepler orbit (e = 0.5); returns final state and integrator"""
+    pos = np.array([1.0, 0.0])
+    vel = np.array([0.0, np.sqrt(1.5)])
+    integrator = Integrator(scheme)
+    integrator.integrate(pos, vel, kepler_accel, dt, int(round(t_end / dt)))
+    return pos, vel, integrator
+
+
+class TestIntegrators(unittest.TestCase):
+    """Tests for the symplectic schemes"""
+
+    def test_observed_order(self):
+        """Halving dt reduces the error by 2^order for every scheme"""
+        base_dt = {'euler': 0.01, 'leapfrog': 0.02, 'forest_ruth': 0.05, 'yoshida6': 0.1}
+        for name, dt in base_dt.items():
+            finals = [run_kepler(name, dt / 2**k)[0] for k in range(3)]
+            e1 = np.linalg.norm(finals[0] - finals[1])
+            e2 = np.linalg.norm(finals[1] - finals[2])
+            self.assertAlmostEqual(np.log2(e1 / e2), SCHEMES[name].order, delta=0.3, msg=name)
+
+    def test_force_evaluations(self):
+        """First-same-as-last caching gives the advertised cost per step"""
+        for name, evals in (('euler', 1), ('leapfrog', 1), ('forest_ruth', 3), ('yoshida6', 7)):
+            self.assertEqual(get_scheme(name).force_evaluations, evals)
+            _, _, integrator = run_kepler(name, 0.1, t_end=1.0)
+            extra = 0 if name == 'euler' else 1  # initial kick of the first step
+            self.assertEqual(integrator.n_force_evals, 10 * evals + extra)
+
+    def test_energy_conservation(self):
+        """Higher-order schemes conserve energy better at the same dt"""
+        def energy(pos, vel):
+            return 0.5 * (vel @ vel) - 1.0 / np.sqrt(pos @ pos)
+
+        e0 = energy(np.array([1.0, 0.0]), np.array([0.0, np.sqrt(1.5)]))
+        drift = {name: abs(energy(*run_kepler(name, 0.01)[:2]) - e0)
+                 for name in ('euler', 'leapfrog', 'forest_ruth')}
+        self.assertLess(drift['leapfrog'], 1e-3)
+        self.assertLess(drift['leapfrog'], drift['euler'])
+        self.assertLess(drift['forest_ruth'], drift['leapfrog'])
+
+    def test_unknown_scheme(self):
+        """Unknown schemes raise ValueError"""
+        with self.assertRaises(ValueError):
+            Integrator('rk4')
+        self.assertIs(get_scheme('verlet'), get_scheme('leapfrog'))
+
+    def test_compensated_float32_orbit(self):
+        """Kahan-summed kicks and drifts keep a float32 orbit on the float64 one"""
+        reference, _, _ = run_kepler('leapfrog', 1e-3)
+        results = []
+        for compensated in (False, True):
+            pos = np.array([1.0, 0.0], dtype=np.float32)
+            vel = np.array([0.0, np.sqrt(1.5)], dtype=np.float32)
+            carries = (np.zeros(2, np.float32), np.zeros(2, np.float32)) if compensated else (None, None)
+            accel = lambda p: kepler_accel(p.astype(np.float64))
+            Integrator('leapfrog').integrate(pos, vel, accel, 1e-3, 10000, None, *carries)
+            self.assertEqual(pos.dtype, np.float32)
+            results.append(np.linalg.norm(pos - reference))
+        self.assertLess(results[1] * 10, results[0])
+
+    def test_compensated_add(self):
+        """Many tiny increments survive in float32 with a carry"""
+        total = np.ones(3, dtype=np.float32)
+        carry = np.zeros(3, dtype=np.float32)
+        for _ in range(1000):
+            compensated_add(total, np.full(3, 1e-8, dtype=np.float32), carry)
+        np.testing.assert_allclose(total.astype(float) - carry, 1.0 + 1e-5, rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
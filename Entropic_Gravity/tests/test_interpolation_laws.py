@@ -0,0 +1,157 @@
+"""
+Tests for the shared interpolation-law registry
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import (LAWS, InterpolationLaw, get_law, newtonian_acceleration,
+                                point_mass_acceleration, apply_to_field, law_from_mu,
+                                standard_mu, tabulate, law_derivative, register_law,
+                                DERIVATIVES)
+from galactic_rotation import calculate_rotation_curve, stable_orbital_velocity
+
+
+class TestInterpolationLaws(unittest.TestCase):
+    """Tests for the vectorized interpolation laws"""
+
+    def test_limits(self):
+        """Every entropic law is Newtonian at high g_N and deep-MOND at low g_N"""
+        a0 = 2.0
+        for name in ('naive_switch', 'simple', 'standard', 'exponential'):
+            law = InterpolationLaw(name, a0)
+            self.assertAlmostEqual(law(1e8) / 1e8, 1.0, places=3)
+            g_low = 1e-8
+            self.assertAlmostEqual(law(g_low) / np.sqrt(a0 * g_low), 1.0, places=3)
+
+    def test_matches_closed_forms(self):
+        """Simple law reproduces the historical formula"""
+        g_n = np.logspace(-6, 4, 200)
+        a0 = 1e-3
+        expected = 0.5 * (g_n + np.sqrt(g_n**2 + 4 * g_n * a0))
+        np.testing.assert_allclose(InterpolationLaw('simple', a0)(g_n), expected, rtol=1e-12)
+
+        # Standard law solves g * mu(g/a0) = g_N with mu(x) = x/sqrt(1+x^2)
+        g = InterpolationLaw('standard', a0)(g_n)
+        x = g / a0
+        np.testing.assert_allclose(g * x / np.sqrt(1 + x**2), g_n, rtol=1e-10)
+
+    def test_shapes_and_zero(self):
+        """Laws preserve shape, accept scalars and map g_N = 0 to 0"""
+        g_n = np.random.uniform(0, 10, (3, 4, 5))
+        for name in LAWS:
+            law = InterpolationLaw(name, 1.0)
+            self.assertEqual(law(g_n).shape, g_n.shape)
+            self.assertEqual(law(0.0), 0.0)
+            self.assertTrue(np.isscalar(law(1.0)))
+
+    def test_unknown_law(self):
+        """Unknown laws raise ValueError"""
+        with self.assertRaises(ValueError):
+            get_law('no_such_law')
+        with self.assertRaises(ValueError):
+            InterpolationLaw('no_such_law')
+
+    def test_point_mass(self):
+        """Point-mass helper returns 0 inside r_min"""
+        r = np.array([0.0, 1e-12, 10.0])
+        g = newtonian_acceleration(r, 1000.0, r_min=1e-10)
+        np.testing.assert_allclose(g, [0.0, 0.0, 10.0])
+        g_e = point_mass_acceleration(r, 1000.0, InterpolationLaw('simple', 2.0))
+        self.assertGreater(g_e[2], 10.0)
+
+    def test_apply_to_field(self):
+        """Field correction preserves direction and corrects magnitude"""
+        law = InterpolationLaw('simple', 2.0)
+        g_vec = np.array([[3.0, 4.0], [0.0, 0.0]])
+        corrected = apply_to_field(g_vec, law)
+        self.assertAlmostEqual(np.linalg.norm(corrected[0]), law(5.0))
+        self.assertAlmostEqual(corrected[0, 0] / corrected[0, 1], 0.75)
+        np.testing.assert_array_equal(corrected[1], [0.0, 0.0])
+
+    def test_vectorized_rotation_curve(self):
+        """Vectorized rotation curve matches per-radius evaluation"""
+        radii = np.linspace(5, 100, 20)
+        for model in ('newton', 'verlinde'):
+            expected = [stable_orbital_velocity(r, model) for r in radii]
+            np.testing.assert_allclose(calculate_rotation_curve(radii, model), expected)
+
+
+class TestTabulatedLaws(unittest.TestCase):
+    """Tests for the precomputed lookup tables"""
+
+    def test_error_bound(self):
+        """Tables honour the requested relative error, in and out of range"""
+        g_n = np.concatenate([np.logspace(-16, 8, 5000), [0.0]])
+        for name in ('naive_switch', 'simple', 'standard', 'exponential', 'verlinde2016'):
+            law = InterpolationLaw(name, 1e-3)
+            table = tabulate(law, 1e-6)
+            exact = law(g_n)
+            approx = table(g_n)
+            self.assertEqual(approx[-1], 0.0)
+            np.testing.assert_allclose(approx[:-1], exact[:-1], rtol=1e-6)
+
+    def test_cached_and_in_place(self):
+        """Tables are built once per (law, a0) and can write in place"""
+        law = InterpolationLaw('simple', 2.0)
+        self.assertIs(tabulate(law, 1e-5), tabulate(InterpolationLaw('simple', 2.0), 1e-5))
+        newton = InterpolationLaw('newton', 0.0)
+        self.assertIs(tabulate(newton), newton)
+
+        g_n = np.array([[0.0, 1.0], [1e-30, 5.0]])
+        expected = law(g_n)
+        tabulate(law, 1e-5)(g_n, out=g_n)
+        np.testing.assert_allclose(g_n, expected, rtol=1e-5)
+
+        # Strided outputs (transposes, column slices) are written like the closed forms
+        g = np.linspace(0.0, 10.0, 20).reshape(10, 2)
+        out = np.zeros((2, 10)).T
+        self.assertIs(tabulate(law, 1e-5)(g, out=out), out)
+        np.testing.assert_allclose(out, law(g), rtol=1e-5)
+        r = np.linspace(1.0, 20.0, 7)
+        for accel_law in (law, tabulate(law, 1e-5)):
+            acc = np.zeros((7, 2))
+            point_mass_acceleration(r, 100.0, accel_law, out=acc[:, 0])
+            np.testing.assert_allclose(acc[:, 0], point_mass_acceleration(r, 100.0, law),
+                                       rtol=1e-5)
+            np.testing.assert_array_equal(acc[:, 1], 0.0)
+
+    def test_law_from_mu(self):
+        """Iterative inversion of mu reproduces the closed-form standard law"""
+        law = law_from_mu(lambda x: x / np.sqrt(1 + x**2), lambda x: (1 + x**2)**-1.5)
+        g_n = np.concatenate([[0.0], np.logspace(-10, 6, 300)])
+        np.testing.assert_allclose(law(g_n, 1e-3), standard_mu(g_n, 1e-3), rtol=1e-12)
+        # Scalars that need several Newton steps come back as scalars
+        for value in (2.0, 1e-6, 0.0):
+            result = law(value, 1e-3)
+            self.assertEqual(np.ndim(result), 0)
+            self.assertAlmostEqual(result, standard_mu(value, 1e-3), delta=1e-12 * max(value, 1e-3))
+
+    def test_derivatives(self):
+        """Analytic dg/dg_N matches central differences, with array a0"""
+        g_n = np.logspace(-4, 3, 40)[:, None]
+        a0 = np.array([0.3, 2.0])
+        for name in LAWS:
+            h = 1e-6 * g_n
+            expected = (LAWS[name](np.broadcast_to(g_n + h, (40, 2)), a0)
+                        - LAWS[name](np.broadcast_to(g_n - h, (40, 2)), a0)) / (2 * h)
+            smooth = np.abs(g_n - a0) > 1e-2   # the naive switch has a kink at a0
+            np.testing.assert_allclose(law_derivative(name, g_n, a0)[smooth], expected[smooth],
+                                       rtol=1e-6, err_msg=name)
+        self.assertAlmostEqual(InterpolationLaw('verlinde2016', 4.0).derivative(1.0), 2.0)
+        # Registered laws without a derivative fall back to finite differences
+        register_law('test_cubic', lambda g, a0, out=None: g**3 / a0)
+        try:
+            np.testing.assert_allclose(law_derivative('test_cubic', 2.0, 4.0), 3.0, rtol=1e-8)
+            self.assertNotIn('test_cubic', DERIVATIVES)
+        finally:
+            del LAWS['test_cubic']
+
+
+if __name__ == '__main__':
+    unittest.main()
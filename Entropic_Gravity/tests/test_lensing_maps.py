@@ -0,0 +1,82 @@
+"""
+Tests for FFT lensing maps (lensing_maps)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import InterpolationLaw
+from lensing_maps import LensingMesh, lensing_maps, critical_density
+
+
+class TestLensingMaps(unittest.TestCase):
+    """Tests in G = c = 1 units against point-mass and disk solutions"""
+
+    def setUp(self):
+        self.n, self.pixel = 64, 0.5
+        self.mesh = LensingMesh((self.n, self.n), self.pixel, G=1.0, c=1.0, dtype=np.float64)
+        self.x = np.arange(self.n) * self.pixel
+
+    def point_mass(self, i, j, mass=1.0):
+        sigma = np.zeros((self.n, self.n))
+        sigma[i, j] = mass / self.pixel**2
+        return sigma
+
+    def test_isolated_point_mass(self):
+        """alpha = 4 M / r away from the lens, even across the whole (unpadded) box"""
+        alpha, boost = self.mesh.deflection(self.point_mass(0, 0))
+        self.assertIsNone(boost)
+        dx, dy = self.x[:, None], self.x[None, :]
+        r2 = dx**2 + dy**2
+        r2[0, 0] = np.inf
+        np.testing.assert_allclose(alpha[0], 4 * dx / r2, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(alpha[1], 4 * dy / r2, rtol=1e-9, atol=1e-12)
+        single = LensingMesh((self.n, self.n), self.pixel, G=1.0, c=1.0)
+        alpha32, _ = single.deflection(self.point_mass(0, 0))
+        self.assertEqual(alpha32.dtype, np.float32)
+        np.testing.assert_allclose(alpha32, alpha, rtol=1e-3, atol=1e-6)
+
+    def test_entropic_boost(self):
+        """The deflection is rescaled by law(g_N) / g_N of the in-plane field"""
+        law = InterpolationLaw('simple', 0.05)
+        c = self.n // 2
+        gr, _ = self.mesh.deflection(self.point_mass(c, c))
+        alpha, boost = self.mesh.deflection(self.point_mass(c, c), law)
+        r = np.hypot(self.x - self.x[c], 0.0)[c + 4:]
+        g_n = 1.0 / r**2
+        np.testing.assert_allclose(boost[c + 4:, c], law(g_n) / g_n, rtol=1e-9)
+        np.testing.assert_allclose(alpha[0, c + 4:, c], 4 * law(g_n) * r, rtol=1e-9)
+        self.assertTrue(np.all(alpha[0, c + 4:, c] > gr[0, c + 4:, c]))
+
+    def test_point_mass_magnification(self):
+        """mu = 1 / (1 - (r_E / r)^4) with r_E^2 = 4 M D; kappa vanishes off the lens"""
+        c = self.n // 2
+        distance = 9.0      # r_E = 6, 12 pixels
+        maps = self.mesh.maps(self.point_mass(c, c), distance)
+        r = self.x[c + 16:c + 28] - self.x[c]
+        expected = 1.0 / (1.0 - (4 * distance / r**2)**2)
+        np.testing.assert_allclose(maps['magnification'][c + 16:c + 28, c], expected, rtol=1e-2)
+        np.testing.assert_allclose(maps['gamma'][c + 16:c + 28, c], 4 * distance / r**2, rtol=1e-2)
+        self.assertLess(np.abs(maps['kappa_eff'][c + 16:c + 28, c]).max(), 1e-2)
+        np.testing.assert_array_equal(maps['boost'], 1.0)
+
+    def test_disk_convergence(self):
+        """Inside a smooth lens, div(alpha) gives back kappa = Sigma / Sigma_cr"""
+        x = self.x - self.x.mean()
+        sigma = np.exp(-(x[:, None]**2 + x[None, :]**2) / 50.0)
+        maps = lensing_maps(sigma, self.pixel, 0.2, G=1.0, c=1.0, dtype=np.float64)
+        np.testing.assert_allclose(maps['kappa'], sigma / critical_density(0.2, 1.0, 1.0))
+        inner = slice(16, 48)
+        np.testing.assert_allclose(maps['kappa_eff'][inner, inner], maps['kappa'][inner, inner],
+                                   atol=2e-2 * maps['kappa'].max())
+        with self.assertRaises(ValueError):
+            self.mesh.deflection(np.zeros((8, 8)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for out-of-core mass maps (mass_maps)
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mass_maps import MassMapBuilder, open_catalog, build_mass_map
+
+
+class TestMassMaps(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.catalog = rng.normal(size=(20000, 4))
+        self.catalog[:, 3] = rng.random(20000)
+        self.edges = np.linspace(-2, 2, 41)
+        # Points on edges, on the last edge, outside and NaN
+        self.catalog[:41, 0] = self.edges
+        self.catalog[41:50, 1] = 2.0
+        self.catalog[50, 0] = np.nan
+
+    def reference(self, x_edges, y_edges=None):
+        y_edges = x_edges if y_edges is None else y_edges
+        c = self.catalog
+        return np.histogram2d(c[:, 0], c[:, 1], bins=[x_edges, y_edges], weights=c[:, 3])[0]
+
+    def test_matches_histogram2d(self):
+        """Regular and irregular edges, chunked and threaded, give np.histogram2d"""
+        irregular = np.sort(np.random.default_rng(4).uniform(-2.5, 2.5, 17))
+        for x_edges, y_edges in ((self.edges, None), (irregular, self.edges[5:30])):
+            for n_threads in (1, 3):
+                builder = MassMapBuilder(x_edges, y_edges, chunk=3000, n_threads=n_threads)
+                builder.add_catalog(self.catalog, mass_column=3)
+                np.testing.assert_allclose(builder.mass, self.reference(x_edges, y_edges),
+                                           rtol=1e-12, atol=1e-12)
+                self.assertEqual(builder.n_particles, len(self.catalog))
+
+    def test_streaming_blocks(self):
+        """add() block by block equals one add_catalog(); scalar masses scale counts"""
+        builder = MassMapBuilder(self.edges)
+        for lo in range(0, len(self.catalog), 7000):
+            block = self.catalog[lo:lo + 7000]
+            builder.add(block[:, 0], block[:, 1], block[:, 3])
+        np.testing.assert_allclose(builder.mass, self.reference(self.edges), atol=1e-12)
+        equal = MassMapBuilder(self.edges, chunk=5000)
+        equal.add_catalog(self.catalog, masses=2.0)
+        counts = np.histogram2d(self.catalog[:, 0], self.catalog[:, 1], bins=self.edges)[0]
+        np.testing.assert_array_equal(equal.mass, 2.0 * counts)
+        self.assertEqual(equal.n_binned, counts.sum())
+
+    def test_memory_mapped_catalogs(self):
+        """.npy and raw float32 files are read through memory maps"""
+        with tempfile.TemporaryDirectory() as tmp:
+            npy = os.path.join(tmp, 'catalog.npy')
+            np.save(npy, self.catalog)
+            raw = os.path.join(tmp, 'catalog.bin')
+            header = b'SNAPSHOT'
+            with open(raw, 'wb') as f:
+                f.write(header)
+                self.catalog.astype(np.float32).tofile(f)
+            mapped = open_catalog(raw, np.float32, 4, offset=len(header))
+            self.assertIsInstance(mapped, np.memmap)
+            np.testing.assert_array_equal(mapped, self.catalog.astype(np.float32))
+            with self.assertRaises(ValueError):
+                open_catalog(raw)
+
+            sigma = build_mass_map(npy, self.edges, mass_column=3, chunk=4096, smoothing=1.5)
+            area = (self.edges[1] - self.edges[0])**2
+            expected = gaussian_filter(self.reference(self.edges), 1.5) / area
+            np.testing.assert_allclose(sigma, expected, rtol=1e-10, atol=1e-10)
+            # Single-precision positions bin as themselves (points on edges may move)
+            masses = np.ascontiguousarray(self.catalog[:, 3])
+            single = build_mass_map(mapped, self.edges, masses=masses, chunk=4096)
+            self.catalog[:, :2] = self.catalog[:, :2].astype(np.float32)
+            np.testing.assert_allclose(single, self.reference(self.edges) / area, rtol=1e-12)
+            del mapped
+
+    def test_invalid_edges(self):
+        with self.assertRaises(ValueError):
+            MassMapBuilder([0.0, 1.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
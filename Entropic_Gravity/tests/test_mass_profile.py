@@ -0,0 +1,49 @@
+"""
+Tests for sorted prefix-sum enclosed-mass profiles (mass_profile)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mass_profile import CumulativeMassProfile
+
+
+class TestCumulativeMassProfile(unittest.TestCase):
+    """Tests for M(<r) by searchsorted"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pos = rng.normal(scale=5.0, size=(3000, 3))
+        self.masses = rng.uniform(0.5, 2.0, 3000)
+
+    def test_matches_mask_sums(self):
+        """Projected and spherical M(<r) equal the per-radius boolean masks"""
+        radii = np.linspace(0.1, 25, 50)
+        for projected, r in ((True, np.hypot(self.pos[:, 0], self.pos[:, 1])),
+                             (False, np.linalg.norm(self.pos, axis=1))):
+            profile = CumulativeMassProfile(self.pos, self.masses, projected=projected)
+            expected = [self.masses[r < value].sum() for value in radii]
+            np.testing.assert_allclose(profile(radii), expected, rtol=1e-12)
+            self.assertAlmostEqual(profile.total_mass, self.masses.sum())
+        grid = radii.reshape(5, 10)
+        self.assertEqual(profile(grid).shape, (5, 10))
+
+    def test_equal_masses_and_ties(self):
+        """A scalar mass scales the count; particles exactly at r are outside"""
+        radii = np.array([1.0, 2.0, 2.0, 3.0])
+        original = radii.copy()
+        profile = CumulativeMassProfile.from_radii(radii, 0.5)
+        np.testing.assert_array_equal(radii, original)
+        np.testing.assert_array_equal(profile([0.0, 2.0, 2.5, 10.0]), [0.0, 0.5, 1.5, 2.0])
+        weighted = CumulativeMassProfile.from_radii(radii, [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(weighted.shell_mass([0.0, 2.0, 3.0, 4.0]), [1.0, 5.0, 4.0])
+        np.testing.assert_allclose(weighted.surface_density([2.0, 3.0]), 5.0 / (5 * np.pi))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for streaming rotation-curve and conservation accumulators (online_stats)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from online_stats import RadialProfile, ConservationMonitor, polar_velocities
+import simulacao_galaxia as sg
+from simulacao_galaxia import GalacticSimulation, PROFILE_EVERY
+
+
+class TestRadialProfile(unittest.TestCase):
+    """Tests for bincount radial-bin statistics"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pos = rng.uniform(-12, 12, size=(2000, 2))
+        self.vel = rng.normal(size=(2000, 2))
+
+    def test_bin_index_matches_searchsorted(self):
+        """Linear and log edges are binned arithmetically like searchsorted"""
+        r = np.concatenate([np.linspace(0, 12, 1001), [1.0, 2.0, 10.0]])
+        for edges in (np.linspace(1, 10, 10), np.geomspace(1, 10, 7), [1, 2, 5, 10]):
+            profile = RadialProfile(edges)
+            index = profile.bin_index(r)
+            expected = np.searchsorted(profile.edges, r, side='right')
+            self.assertLessEqual(np.count_nonzero(index != expected), 2)
+            np.testing.assert_array_equal(index[-3:], expected[-3:])
+        self.assertEqual(RadialProfile(np.geomspace(1, 10, 7)).spacing, 'log')
+        with self.assertRaises(ValueError):
+            RadialProfile([1, 1, 2])
+
+    def test_statistics_match_direct_computation(self):
+        """Per-bin mean and dispersion equal the masked NumPy reductions"""
+        edges = np.array([0.0, 2.0, 5.0, 9.0])
+        profile = RadialProfile(edges)
+        profile.update(self.pos, self.vel, masses=2.0)
+        result = profile.profile(time_average=False)
+        r, v_r, v_phi = polar_velocities(self.pos, self.vel)
+        for k in range(3):
+            mask = (r >= edges[k]) & (r < edges[k + 1])
+            self.assertEqual(result['count'][k], mask.sum())
+            self.assertAlmostEqual(result['v_circ'][k], v_phi[mask].mean())
+            self.assertAlmostEqual(result['sigma_r'][k], v_r[mask].std())
+            self.assertAlmostEqual(result['sigma_phi'][k], v_phi[mask].std())
+            self.assertAlmostEqual(result['surface_density'][k],
+                                   2.0 * mask.sum() / (np.pi * (edges[k + 1]**2 - edges[k]**2)))
+
+    def test_time_average(self):
+        """The time average pools every sample; the latest one is kept apart"""
+        profile = RadialProfile(np.linspace(0, 10, 6))
+        with self.assertRaises(ValueError):
+            profile.profile()
+        profile.update(self.pos, self.vel)
+        profile.update(self.pos, 3 * self.vel)
+        pooled = RadialProfile(np.linspace(0, 10, 6))
+        pooled.update(np.concatenate([self.pos] * 2), np.concatenate([self.vel, 3 * self.vel]))
+        np.testing.assert_allclose(profile.profile()['v_circ'], pooled.profile()['v_circ'])
+        np.testing.assert_allclose(profile.profile()['sigma_phi'], pooled.profile()['sigma_phi'])
+        np.testing.assert_allclose(profile.profile()['count'], pooled.profile()['count'] / 2)
+        latest = profile.profile(time_average=False)['v_circ']
+        np.testing.assert_allclose(latest, 3 * profile.profile()['v_circ'] / 2)
+
+    def test_workspace(self):
+        """Samples reuse per-star buffers and match polar_velocities for float32 states"""
+        n = 50000
+        rng = np.random.default_rng(1)
+        pos = rng.uniform(-12, 12, size=(n, 2)).astype(np.float32)
+        vel = rng.normal(size=(n, 2)).astype(np.float32)
+        pos[0] = 0.0
+        for edges in (np.linspace(0, 10, 6), np.geomspace(1, 10, 6)):
+            profile = RadialProfile(edges)
+            profile.update(pos, vel)  # warm-up
+            tracemalloc.start()
+            try:
+                start, _ = tracemalloc.get_traced_memory()
+                profile.update(pos, vel)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            # One float32 temporary of N stars would be 200 kB (casting
+            # buffers of the float32 inputs stay below that)
+            self.assertLess(peak - start, n)
+            reference = RadialProfile(edges)
+            reference.update(pos.astype(float), vel.astype(float))
+            for key in ('count', 'v_circ', 'sigma_r', 'sigma_phi'):
+                np.testing.assert_allclose(profile.profile(time_average=False)[key],
+                                           reference.profile()[key], rtol=1e-6, err_msg=key)
+
+
+class TestSimulationProfile(unittest.TestCase):
+    """Tests for the rotation curve accumulated by GalacticSimulation"""
+
+    def test_circular_disk(self):
+        """Circular orbits give <v_phi> = v_circ(r) and small dispersions"""
+        np.random.seed(0)
+        sim = GalacticSimulation('Entropic', n_stars=2000)
+        monitor = ConservationMonitor()
+        for _, pos, vel in sim.iter_steps(4 * PROFILE_EVERY, every=PROFILE_EVERY):
+            monitor.update(pos, vel)
+        self.assertEqual(sim.profile.n_samples, 4)
+        profile = sim.profile.profile()
+        r, _, v_phi = polar_velocities(sim.stars_pos, sim.stars_vel)
+        expected = np.sqrt(sim._calc_acceleration_magnitude(profile['r']) * profile['r'])
+        np.testing.assert_allclose(profile['v_circ'], expected, rtol=0.05)
+        self.assertTrue(np.all(profile['sigma_r'] < 0.05 * profile['v_circ']))
+        self.assertLess(monitor.max_deviation['lz'], 1e-10)
+        self.assertLess(monitor.max_deviation['kinetic'], 1e-3)
+
+    def test_short_run_plot(self):
+        """Runs shorter than PROFILE_EVERY steps plot the final state's profile"""
+        sims = [GalacticSimulation(mode, n_stars=200) for mode in ('Newton', 'Entropic')]
+        for sim in sims:
+            sim.run(steps=PROFILE_EVERY - 1)
+            self.assertEqual(sim.profile.n_samples, 0)
+        output_dir, sg.OUTPUT_DIR = sg.OUTPUT_DIR, tempfile.mkdtemp()
+        try:
+            sg.plot_results(*sims)
+            self.assertTrue(os.path.exists(os.path.join(sg.OUTPUT_DIR,
+                                                        'rotation_curve_comparison.png')))
+        finally:
+            shutil.rmtree(sg.OUTPUT_DIR)
+            sg.OUTPUT_DIR = output_dir
+            sg.plt.close('all')
+        self.assertEqual(sims[0].profile.n_samples, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for the shared particle engine (particle_engine)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interpolation_laws import InterpolationLaw, NEWTON, newtonian_acceleration
+from integrators import Integrator
+from particle_engine import (ParticleStore, CentralForce, central_disk,
+                             circular_velocities)
+
+
+class TestParticleStore(unittest.TestCase):
+    """Tests for the structure-of-arrays state"""
+
+    def test_views_share_coordinate_rows(self):
+        """(N, dim) views write through to contiguous coordinate rows"""
+        pos = np.arange(12.0).reshape(6, 2)
+        store = ParticleStore.from_arrays(pos, -pos, np.float32, pos_dtype=np.float64, carries=True)
+        np.testing.assert_array_equal(store.positions, pos)
+        self.assertEqual(store.positions.dtype, np.float64)
+        self.assertEqual(store.velocities.dtype, np.float32)
+        self.assertTrue(store.positions[:, 1].flags.c_contiguous)
+        store.positions[2] = 0.0
+        self.assertEqual(store._pos[1, 2], 0.0)
+        self.assertEqual(store.nbytes, 6 * 2 * (8 + 4) * 2)
+        self.assertIsNone(ParticleStore(6).pos_carry)
+
+
+class TestCentralForce(unittest.TestCase):
+    """Tests for the core pull"""
+
+    def test_matches_law_in_the_plane(self):
+        """Radial pull law(g_N) in the disk plane, no vertical force"""
+        law = InterpolationLaw('simple', 1e-3)
+        force = CentralForce(law, 1e4, 1.0)
+        rng = np.random.default_rng(0)
+        pos = rng.uniform(-300, 300, (100, 3))
+        acc = force(pos)
+        r = np.hypot(pos[:, 0], pos[:, 1])
+        expected = law(newtonian_acceleration(r, 1e4, 1.0))
+        np.testing.assert_allclose(np.hypot(acc[:, 0], acc[:, 1]), expected, rtol=1e-12)
+        np.testing.assert_allclose(np.einsum('ij,ij->i', acc[:, :2], pos[:, :2]), -expected * r,
+                                   rtol=1e-12)
+        np.testing.assert_array_equal(acc[:, 2], 0.0)
+        # Workspace reuse and out=
+        self.assertIs(force(pos).base, acc.base)
+        out = np.empty_like(pos)
+        self.assertIs(force(pos, out=out), out)
+
+
+class TestParticleEngine(unittest.TestCase):
+    """Tests for the step / run driver"""
+
+    def test_matches_integrator_with_fewer_evaluations(self):
+        """The engine reproduces Integrator.integrate and keeps the cached force between steps"""
+        np.random.seed(0)
+        engine = central_disk(200, 10.0, 500.0, NEWTON, 1e4, dt=0.5, integrator='forest_ruth')
+        pos = engine.store.positions.copy()
+        vel = engine.store.velocities.copy()
+        reference = Integrator('forest_ruth')
+        reference.integrate(pos, vel, CentralForce(NEWTON, 1e4), 0.5, 20)
+
+        seen = []
+        engine.run(10, callback=lambda step, p, v: seen.append(step))
+        engine.force(engine.store.positions * 2)   # clobbers the force's workspace
+        engine.run(10)
+        np.testing.assert_allclose(engine.store.positions, pos, rtol=1e-12)
+        np.testing.assert_allclose(engine.store.velocities, vel, rtol=1e-12)
+        self.assertEqual(seen, list(range(1, 11)))
+        self.assertEqual(engine.integrator.n_force_evals, reference.n_force_evals)
+        self.assertEqual(engine.steps_taken, 20)
+        self.assertAlmostEqual(engine.time, 10.0)
+
+    def test_iter_steps_yields_live_readonly_views(self):
+        """The generator streams the state without copies at the chosen cadence"""
+        np.random.seed(2)
+        streamed = central_disk(100, 10.0, 500.0, NEWTON, 1e4, dt=0.5)
+        np.random.seed(2)
+        reference = central_disk(100, 10.0, 500.0, NEWTON, 1e4, dt=0.5)
+        steps = []
+        for step, pos, vel in streamed.iter_steps(12, every=4):
+            reference.run(4)
+            steps.append(step)
+            np.testing.assert_array_equal(pos, reference.store.positions)
+            self.assertTrue(np.shares_memory(pos, streamed.store.positions))
+            self.assertTrue(np.shares_memory(vel, streamed.store.velocities))
+            with self.assertRaises(ValueError):
+                pos[0, 0] = 0.0
+        self.assertEqual(steps, [4, 8, 12])
+        with self.assertRaises(ValueError):
+            next(streamed.iter_steps(1, every=0))
+
+    def test_circular_orbits_stay_circular(self):
+        """Balanced velocities keep radii; a weaker pull lets the outer disk drift out"""
+        law = InterpolationLaw('simple', 1e-3)
+        np.random.seed(1)
+        balanced = central_disk(300, 10.0, 500.0, law, 1e4, dt=0.5, dim=3, thickness=5.0)
+        np.random.seed(1)
+        unbound = central_disk(300, 10.0, 500.0, NEWTON, 1e4, dt=0.5, velocity_law=law)
+        r0 = np.hypot(balanced.store.positions[:, 0], balanced.store.positions[:, 1])
+        z0 = balanced.store.positions[:, 2].copy()
+        balanced.run(400)
+        unbound.run(400)
+        r1 = np.hypot(balanced.store.positions[:, 0], balanced.store.positions[:, 1])
+        self.assertLess(np.median(np.abs(r1 - r0) / r0), 1e-2)
+        np.testing.assert_array_equal(balanced.store.positions[:, 2], z0)
+        outer = r0 > 300
+        r_unbound = np.linalg.norm(unbound.store.positions, axis=1)
+        self.assertGreater(np.median(r_unbound[outer] / r0[outer]), 1.02)
+
+    def test_circular_velocities(self):
+        """Speed sqrt(a r), perpendicular to the radius"""
+        pos = np.array([[3.0, 4.0], [0.0, -2.0]])
+        vel = circular_velocities(pos, np.array([5.0, 2.0]))
+        np.testing.assert_allclose(np.linalg.norm(vel, axis=1), [5.0, 2.0])
+        np.testing.assert_allclose(np.einsum('ij,ij->i', vel, pos), 0.0, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for the particle-mesh Poisson solver and QUMOND correction
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from particle_mesh import ParticleMesh
+from interpolation_laws import InterpolationLaw
+
+# Probe points in the z = 0 plane (mesh cell size 18.75)
+PROBES = np.array([[150.0, 0.0], [0.0, -250.0], [200.0, 200.0], [-350.0, 100.0]])
+
+
+class TestParticleMesh(unittest.TestCase):
+    """Tests for the mesh solver against point-mass fields"""
+
+    def point_mass(self, mesh, law=None):
+        """Field of a unit-G point mass M = 1e4 deposited at the origin"""
+        pos = np.vstack([[0.0, 0.0], PROBES])
+        masses = np.r_[1e4, np.zeros(len(PROBES))]
+        if law is None:
+            return mesh.newtonian_accelerations(pos, masses)[1:]
+        return mesh.qumond_accelerations(pos, masses, law)[1:]
+
+    def test_newtonian_point_mass(self):
+        """Mesh field approaches GM/r^2 towards the centre, for both kernels"""
+        r = np.linalg.norm(PROBES, axis=1)
+        for assignment in ('cic', 'tsc'):
+            g = self.point_mass(ParticleMesh(1200.0, 64, assignment=assignment))
+            expected = -1e4 * PROBES / r[:, None]**3
+            np.testing.assert_allclose(g, expected, rtol=0.04, atol=1e-3 * 1e4 / r.max()**2)
+
+    def test_qumond_point_mass(self):
+        """QUMOND on the mesh reproduces the spherical entropic field"""
+        law = InterpolationLaw('simple', 0.5)
+        g = self.point_mass(ParticleMesh(1200.0, 64), law)
+        r = np.linalg.norm(PROBES, axis=1)
+        g_n = 1e4 / r**2
+        np.testing.assert_allclose(np.linalg.norm(g, axis=1), law(g_n), rtol=0.03)
+        # Noticeably stronger than Newton at these radii
+        self.assertTrue(np.all(law(g_n) > 1.5 * g_n))
+
+    def test_analytic_core(self):
+        """A core alone gives exactly law(g_core) along -r"""
+        law = InterpolationLaw('standard', 0.1)
+        mesh = ParticleMesh(1200.0, 32)
+        g = mesh.qumond_accelerations(PROBES, 0.0, law, core_mass=1e4)
+        r = np.linalg.norm(PROBES, axis=1)
+        np.testing.assert_allclose(g, -PROBES / r[:, None] * law(1e4 / r**2)[:, None], rtol=1e-12)
+
+    def test_mass_conservation_and_errors(self):
+        """Deposition conserves mass on the mesh; unknown kernels raise"""
+        mesh = ParticleMesh(100.0, 16, assignment='tsc')
+        pos = np.random.default_rng(0).uniform(-40, 40, (500, 3))
+        self.assertAlmostEqual(mesh.deposit(pos, 2.0).sum(), 1000.0)
+        with self.assertRaises(ValueError):
+            ParticleMesh(100.0, 16, assignment='ngp')
+
+
+if __name__ == '__main__':
+    unittest.main()
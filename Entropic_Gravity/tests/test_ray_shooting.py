@@ -0,0 +1,109 @@
+"""
+Tests for inverse ray shooting (ray_shooting)
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mass_profile import CumulativeMassProfile
+from ray_shooting import (RadialDeflection, GridDeflection, RayShooter, gaussian_source,
+                          image_source)
+
+
+def point_lens(**kwargs):
+    """Point mass with Einstein radius 1 for D = 1 (alpha = 1 / r)."""
+    radii = np.geomspace(1e-4, 10, 2000)
+    return RadialDeflection(radii, 1.0 / radii, keplerian_tail=True, **kwargs)
+
+
+class TestDeflections(unittest.TestCase):
+
+    def test_radial(self):
+        """Radial direction, interpolated profile, 1 / r tail and offset centre"""
+        lens = point_lens(center=(1.0, -2.0))
+        ax, ay = lens(np.array([4.0, 1.0, 1.0 + 30.0]), np.array([2.0, -2.5, -2.0]))
+        np.testing.assert_allclose(ax, [3 / 25, 0.0, 1 / 30], rtol=1e-4)
+        np.testing.assert_allclose(ay, [4 / 25, -2.0, 0.0], rtol=1e-4)
+        flat = RadialDeflection([1.0, 2.0], [0.5, 0.5])
+        np.testing.assert_allclose(flat(np.array([0.5, 5.0]), np.zeros(2))[0], [0.25, 0.5])
+
+    def test_from_mass_profile(self):
+        """alpha = 4 G M(<r) / (c^2 r) in GR, boosted by the law otherwise"""
+        rng = np.random.default_rng(1)
+        positions = rng.normal(size=(1000, 3))
+        profile = CumulativeMassProfile(positions, 2.0)
+        radii = np.linspace(0.5, 4, 8)
+        gr = RadialDeflection.from_mass_profile(profile, radii, G=1.0, c=1.0)
+        np.testing.assert_allclose(gr.alpha[1:], 4 * profile(radii) / radii)
+        boosted = RadialDeflection.from_mass_profile(profile, radii, lambda g: 2 * g, G=1.0, c=1.0)
+        np.testing.assert_allclose(boosted.alpha, 2 * gr.alpha)
+
+    def test_grid_bilinear(self):
+        """Linear deflection fields are reproduced exactly; outside, edge values"""
+        x_axis, y_axis = np.linspace(-2, 2, 9), np.linspace(-1, 3, 17)
+        X, Y = np.meshgrid(x_axis, y_axis, indexing='ij')
+        lens = GridDeflection(0.1 * X - 0.2 * Y, 0.3 * Y + 0.05, x_axis, y_axis)
+        x = np.array([-1.9, 0.13, 1.99, 0.0])
+        y = np.array([2.9, -0.77, 0.5, 1.0])
+        ax, ay = lens(x, y)
+        np.testing.assert_allclose(ax, 0.1 * x - 0.2 * y)
+        np.testing.assert_allclose(ay, 0.3 * y + 0.05)
+        ax, _ = lens(np.array([5.0]), np.array([-4.0]))
+        np.testing.assert_allclose(ax, 0.1 * 2 + 0.2 * 1)
+        with self.assertRaises(ValueError):
+            GridDeflection(X, X[:-1], x_axis, y_axis)
+
+
+class TestRayShooter(unittest.TestCase):
+
+    def test_trace(self):
+        """Point lens: beta = theta - 1 / theta; the Einstein ring maps to the origin"""
+        beta_x, beta_y = RayShooter(point_lens(), 1.0).trace([2.0, 1.0, 0.0], [0.0, 0.0, -0.5])
+        np.testing.assert_allclose(beta_x, [1.5, 0.0, 0.0], atol=1e-4)
+        np.testing.assert_allclose(beta_y, [0.0, 0.0, 1.5], atol=1e-4)
+
+    def test_no_lens(self):
+        """Without deflection every source pixel is magnified exactly once"""
+        shooter = RayShooter(RadialDeflection([1.0], [0.0]), 1.0)
+        result = shooter.magnification_map((-1, 1, -1, 1), (200, 200), (-1, 1, -1, 1), (20, 10))
+        np.testing.assert_allclose(result['magnification'], 1.0)
+        self.assertEqual(result['counts'].sum(), result['rays'])
+
+    def test_point_lens_magnification(self):
+        """Total point-lens magnification (u^2 + 2) / (u sqrt(u^2 + 4))"""
+        shooter = RayShooter(point_lens(), 1.0, chunk=1 << 16, n_threads=3)
+        result = shooter.magnification_map((-3, 3, -3, 3), (2000, 2000), (-1, 1, -1, 1), (20, 20))
+        centres = -1 + 0.1 * (np.arange(20) + 0.5)
+        u = np.hypot(centres[:, None], centres[None, :])
+        expected = (u**2 + 2) / (u * np.sqrt(u**2 + 4))
+        ring = (u > 0.3) & (u < 0.9)
+        np.testing.assert_allclose(result['magnification'][ring], expected[ring], rtol=0.05)
+        # Threads accumulate separately; the reduction loses no ray
+        serial = RayShooter(point_lens(), 1.0, n_threads=1)
+        single = serial.magnification_map((-3, 3, -3, 3), (2000, 2000), (-1, 1, -1, 1), (20, 20))
+        np.testing.assert_array_equal(single['counts'], result['counts'])
+        self.assertGreater(shooter.rays_per_second, 0)
+
+    def test_einstein_ring(self):
+        """A compact source behind the lens is imaged into a ring of radius 1"""
+        shooter = RayShooter(point_lens(), 1.0, chunk=5000)
+        image = shooter.lensed_image(gaussian_source((0.0, 0.0), 0.05), (-2, 2, -2, 2),
+                                     (80, 80), oversample=3)
+        x = -2 + 0.05 * (np.arange(80) + 0.5)
+        r = np.hypot(x[:, None], x[None, :])
+        self.assertAlmostEqual(r[np.unravel_index(np.argmax(image), image.shape)], 1.0, delta=0.05)
+        self.assertLess(image[r > 1.5].max(), 1e-3)
+        # Without lens the source is reproduced (brightness conservation)
+        flat = RayShooter(RadialDeflection([1.0], [0.0]), 1.0)
+        pixels = np.arange(12.0).reshape(4, 3)
+        image = flat.lensed_image(image_source(pixels, (0, 4, 0, 3)), (0, 4, 0, 3), (4, 3))
+        np.testing.assert_array_equal(image, pixels)
+
+
+if __name__ == '__main__':
+    unittest.main()
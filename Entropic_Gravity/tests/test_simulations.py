@@ -11,7 +11,8 @@ import numpy as np
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 # Import only the modules that exist
-from galactic_rotation import newtonian_force, verlinde_force, stable_orbital_velocity, simulate_orbit
+from galactic_rotation import (newtonian_force, verlinde_force, stable_orbital_velocity, simulate_orbit,
+                               simulate_orbits)
 
 
 class TestGalacticRotation(unittest.TestCase):
@@ -123,5 +124,65 @@ class TestPhysicalConstraints(unittest.TestCase):
         self.assertLess(abs(r_final - r_initial) / r_initial, 0.5)
 
 
+def scalar_euler_orbit(model, initial_radius, steps, dt=0.1):
+    """Reference copy of the original one-star Euler loop of simulate_orbit."""
+    x, y = initial_radius, 0.0
+    v_orbital = stable_orbital_velocity(initial_radius, model)
+    vx, vy = 0.0, v_orbital
+    trajectory_x, trajectory_y, velocities = [x], [y], [v_orbital]
+    for _ in range(steps):
+        r = np.sqrt(x**2 + y**2)
+        if model == 'newton':
+            total_acceleration = newtonian_force(r)
+        else:
+            total_acceleration = verlinde_force(r)
+        ax = -total_acceleration * (x / r)
+        ay = -total_acceleration * (y / r)
+        vx += ax * dt
+        vy += ay * dt
+        x += vx * dt
+        y += vy * dt
+        trajectory_x.append(x)
+        trajectory_y.append(y)
+        velocities.append(np.sqrt(vx**2 + vy**2))
+    return trajectory_x, trajectory_y, np.mean(velocities)
+
+
+class TestOrbitEnsemble(unittest.TestCase):
+    """Tests for the batched ensemble orbit integrator"""
+
+    def test_matches_scalar_loop(self):
+        """Each ensemble member follows the path of the original scalar Euler loop"""
+        radii = [10.0, 30.0, 50.0]
+        models = ['newton', 'verlinde', 'verlinde']
+        tx, ty, v_avg = simulate_orbits(radii, models, steps=200)
+
+        self.assertEqual(tx.shape, (201, 3))
+        for i, (r, model) in enumerate(zip(radii, models)):
+            sx, sy, sv = scalar_euler_orbit(model, r, 200)
+            np.testing.assert_allclose(tx[:, i], sx, atol=1e-9)
+            np.testing.assert_allclose(ty[:, i], sy, atol=1e-9)
+            self.assertAlmostEqual(v_avg[i], sv)
+            # The single-orbit wrapper returns the same path
+            np.testing.assert_allclose(simulate_orbit(model, r, 200)[0], sx, atol=1e-9)
+
+    def test_stride_and_parameters(self):
+        """Striding keeps every k-th step; a0 can vary per orbit"""
+        tx, ty, _ = simulate_orbits([50.0, 50.0], 'verlinde', steps=100, stride=10)
+        full_x, _, _ = simulate_orbits([50.0, 50.0], 'verlinde', steps=100)
+        self.assertEqual(tx.shape, (11, 2))
+        np.testing.assert_array_equal(tx, full_x[::10])
+
+        _, _, v_avg = simulate_orbits([100.0, 100.0], 'verlinde', steps=10, a0=[1.0, 4.0])
+        self.assertGreater(v_avg[1], v_avg[0])
+
+    def test_invalid_model(self):
+        """Unknown models raise errors"""
+        with self.assertRaises(ValueError):
+            simulate_orbits([10.0], 'invalid_model')
+        with self.assertRaises(ValueError):
+            simulate_orbit('invalid_model')
+
+
 if __name__ == '__main__':
     unittest.main()
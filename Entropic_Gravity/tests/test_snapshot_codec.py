@@ -0,0 +1,116 @@
+"""
+Tests for the compressed snapshot format (snapshot_codec)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from snapshot_codec import (SnapshotWriter, SnapshotReader, narrow_int_type, shuffle_bytes,
+                            unshuffle_bytes)
+from simulacao_galaxia import GalacticSimulation
+
+
+def orbit_frames(n=500, steps=20):
+    """Stars on circular orbits, saved every step"""
+    rng = np.random.default_rng(0)
+    r = rng.uniform(10, 500, n)
+    phase = rng.uniform(0, 2 * np.pi, n)
+    omega = 1.0 / r
+    frames = []
+    for k in range(steps):
+        angle = phase + omega * k
+        pos = np.column_stack([r * np.cos(angle), r * np.sin(angle)])
+        vel = np.column_stack([-r * omega * np.sin(angle), r * omega * np.cos(angle)])
+        frames.append((pos, vel))
+    return frames
+
+
+class TestSnapshotCodec(unittest.TestCase):
+    """Tests for quantization, delta encoding and chunked compression"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'run.egs')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, frames, **kwargs):
+        with SnapshotWriter(self.path, len(frames[0][0]), {'positions': 500.0, 'velocities': 1.0},
+                            **kwargs) as writer:
+            for k, (pos, vel) in enumerate(frames):
+                writer.append(10 * k, 0.1 * k, positions=pos, velocities=vel)
+        return writer
+
+    def test_error_bound_and_random_access(self):
+        """Every decoded value is within tolerance * scale, from any chunk"""
+        frames = orbit_frames()
+        for compressor in ('zlib', 'lzma'):
+            writer = self.write(frames, tolerance=1e-5, chunk_steps=6, compressor=compressor)
+            self.assertGreater(writer.ratio, 4)
+            reader = SnapshotReader(self.path)
+            self.assertEqual(len(reader), 20)
+            self.assertEqual(len(reader.chunks), 4)
+            for index in (0, 7, 13, -1):
+                pos, vel = frames[index]
+                self.assertLessEqual(np.abs(reader.read('positions', index) - pos).max(),
+                                     1e-5 * 500.0 * (1 + 1e-9))
+                self.assertLessEqual(np.abs(reader.read('velocities', index) - vel).max(), 1e-5)
+            np.testing.assert_array_equal(reader.read('positions', 9, particles=[1, 4]),
+                                          reader.read('positions', 9)[[1, 4]])
+            self.assertEqual(reader.find(130), 13)
+            self.assertAlmostEqual(reader.times[-1], 1.9)
+            decoded = [pos for pos, in reader.iter_snapshots('positions')]
+            self.assertEqual(len(decoded), 20)
+            np.testing.assert_array_equal(decoded[13], reader.read('positions', 13))
+
+    def test_delta_orders_decode_identically(self):
+        """Prediction only changes the size: decoded values are the same quantized grid"""
+        frames = orbit_frames()
+        sizes = []
+        decoded = []
+        for order in (0, 1, 2):
+            writer = self.write(frames, tolerance=1e-6, delta_order=order)
+            sizes.append(writer.compressed_bytes)
+            decoded.append(SnapshotReader(self.path).read('positions', -1))
+        np.testing.assert_array_equal(decoded[0], decoded[1])
+        np.testing.assert_array_equal(decoded[0], decoded[2])
+        self.assertLess(sizes[2], sizes[1])
+        self.assertLess(sizes[1], sizes[0])
+
+    def test_helpers_and_errors(self):
+        """Integer narrowing, byte shuffling and invalid input"""
+        self.assertEqual(narrow_int_type(np.array([-128, 127])), np.int8)
+        self.assertEqual(narrow_int_type(np.array([0, 40000])), np.int32)
+        values = np.arange(-5, 7, dtype=np.int32).reshape(6, 2)
+        np.testing.assert_array_equal(unshuffle_bytes(shuffle_bytes(values), np.int32, (6, 2)),
+                                      values)
+        with self.assertRaises(ValueError):
+            SnapshotWriter(self.path, 5, {'positions': 1.0}, compressor='bz2')
+        with SnapshotWriter(self.path, 5, {'positions': 1.0}) as writer:
+            with self.assertRaises(ValueError):
+                writer.append(0, positions=np.zeros((4, 2)))
+        with self.assertRaises(IndexError):
+            SnapshotReader(self.path).read('positions', 0)
+
+    def test_simulation_archive(self):
+        """GalacticSimulation can write straight into an archive"""
+        np.random.seed(0)
+        sim = GalacticSimulation('Entropic', n_stars=100)
+        with SnapshotWriter(self.path, 100, {'positions': 500.0, 'velocities': 10.0},
+                            every=4) as writer:
+            sim.run(steps=12, trajectory=writer)
+        reader = SnapshotReader(self.path)
+        np.testing.assert_array_equal(reader.steps, [4, 8, 12])
+        np.testing.assert_allclose(reader.read('positions', -1), sim.stars_pos, atol=500.0 * 1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the memory-mapped trajectory store (trajectory_store)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from trajectory_store import TrajectoryStore
+from simulacao_galaxia import GalacticSimulation
+
+
+class TestTrajectoryStore(unittest.TestCase):
+    """Tests for appending and random-access reads"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_roundtrip_across_chunks(self):
+        """Snapshots, steps and particle tracks read back exactly, across chunk files"""
+        rng = np.random.default_rng(0)
+        frames = rng.normal(size=(11, 50, 2))
+        with TrajectoryStore(self.path, 'w', 50, fields=('positions',), every=3,
+                             chunk_steps=4) as store:
+            for step in range(31):
+                store.record(step, 0.5 * step, positions=frames[step // 3])
+        self.assertEqual(len([f for f in os.listdir(self.path) if f.startswith('positions')]), 3)
+
+        store = TrajectoryStore(self.path)
+        self.assertEqual(len(store), 11)
+        np.testing.assert_array_equal(store.steps, np.arange(0, 31, 3))
+        self.assertEqual(store.time_of(-1), 15.0)
+        self.assertEqual(store.find(27), 9)
+        np.testing.assert_array_equal(store.read('positions', 5), frames[5])
+        np.testing.assert_array_equal(store.read('positions', -1, particles=[3, 7]), frames[10, [3, 7]])
+        np.testing.assert_array_equal(store.track('positions', slice(10, 13), start=2, stop=9),
+                                      frames[2:9, 10:13])
+        with self.assertRaises(IndexError):
+            store.read('positions', 11)
+        with self.assertRaises(KeyError):
+            store.find(4)
+        with self.assertRaises(ValueError):
+            store.append(99, positions=frames[0])
+
+    def test_append_mode_and_missing_fields(self):
+        """An existing store can be extended; every field is required"""
+        with TrajectoryStore(self.path, 'w', 5, dtype=np.float32, chunk_steps=2) as store:
+            store.append(0, positions=np.zeros((5, 2)), velocities=np.ones((5, 2)))
+            with self.assertRaises(ValueError):
+                store.append(1, positions=np.zeros((5, 2)))
+        with TrajectoryStore(self.path, 'a') as store:
+            for step in (1, 2):
+                store.append(step, positions=np.full((5, 2), step), velocities=np.ones((5, 2)))
+        store = TrajectoryStore(self.path)
+        self.assertEqual(store.dtype, np.float32)
+        np.testing.assert_array_equal(store.steps, [0, 1, 2])
+        self.assertEqual([pos[0, 0] for pos, _ in store.iter_snapshots()], [0, 1, 2])
+
+    def test_write_mode_keeps_foreign_files(self):
+        """Mode 'w' replaces the store's own files only"""
+        foreign = ('data.npy', 'positions_extra.npy', 'notes.txt')
+        for name in foreign:
+            np.save(os.path.join(self.path, name), np.arange(3))
+        for fields in (('positions', 'velocities'), ('positions',)):
+            with TrajectoryStore(self.path, 'w', 4, fields=fields, chunk_steps=2) as store:
+                for step in range(5):
+                    store.append(step, **{name: np.zeros((4, 2)) for name in fields})
+        self.assertFalse(any(f.startswith('velocities') for f in os.listdir(self.path)))
+        for name in foreign:
+            path = os.path.join(self.path, name if name.endswith('.npy') else name + '.npy')
+            np.testing.assert_array_equal(np.load(path), np.arange(3))
+        self.assertEqual(len(TrajectoryStore(self.path)), 5)
+
+        # Chunk-named files without a store index are left alone
+        other = tempfile.mkdtemp()
+        try:
+            np.save(os.path.join(other, 'positions_00000.npy'), np.arange(3))
+            with self.assertRaises(FileExistsError):
+                TrajectoryStore(other, 'w', 4)
+            self.assertTrue(os.path.exists(os.path.join(other, 'positions_00000.npy')))
+        finally:
+            shutil.rmtree(other)
+
+    def test_simulation_history(self):
+        """GalacticSimulation writes its history at the store's cadence"""
+        np.random.seed(0)
+        sim = GalacticSimulation('Entropic', n_stars=100)
+        with TrajectoryStore(self.path, 'w', 100, every=5) as store:
+            sim.run(steps=20, trajectory=store)
+        store = TrajectoryStore(self.path)
+        np.testing.assert_array_equal(store.steps, [5, 10, 15, 20])
+        np.testing.assert_array_equal(store.read('velocities', -1), sim.stars_vel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 import matplotlib
 matplotlib.use('Agg')
-import numpy as np
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from interpolation_laws import InterpolationLaw
+from particle_engine import central_disk
 
 # Configuração Estética "Sci-Fi"
 plt.style.use('dark_background')
@@ -21,61 +24,16 @@ R_MAX = 500.0
 A0 = 1.0e-3
 DT = 0.5
 STEPS = 300 
+ENTROPIC_LAW = InterpolationLaw('simple', A0)
 
-class GalacticSimulation:
-    def __init__(self, mode='Entropic'):
-        self.mode = mode
-        self.stars_pos = self._init_positions()
-        self.stars_vel = self._init_velocities()
-
-    def _init_positions(self):
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        z = np.random.normal(0, 5, N_STARS) # Add slight thickness to disk for 3D effect
-        return np.column_stack((x, y, z))
-
-    def _init_velocities(self):
-        # 2D projection for velocity calc
-        r = np.linalg.norm(self.stars_pos[:, :2], axis=1) 
-        
-        a_newton = G * M_CORE / (r**2)
-        a_entropic = 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        v_mag = np.sqrt(a_entropic * r)
-        
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        vz = np.zeros(N_STARS) # No vertical velocity, just thickness
-        return np.column_stack((vx, vy, vz))
-
-    def get_forces(self, positions):
-        # Force is purely radial in XY plane
-        r_xy = np.linalg.norm(positions[:, :2], axis=1)
-        r_xy = np.maximum(r_xy, 1e-5)
-        
-        a_n = G * M_CORE / (r_xy**2)
-        a_mag = 0.5 * (a_n + np.sqrt(a_n**2 + 4 * a_n * A0))
-        
-        acc_x = (-positions[:, 0] / r_xy) * a_mag
-        acc_y = (-positions[:, 1] / r_xy) * a_mag
-        acc_z = np.zeros(len(positions)) # No vertical force
-        
-        return np.column_stack((acc_x, acc_y, acc_z))
-
-    def step(self):
-        dt = DT
-        acc = self.get_forces(self.stars_pos)
-        self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-        new_acc = self.get_forces(self.stars_pos)
-        self.stars_vel += 0.5 * (acc + new_acc) * dt
-        return self.stars_pos
+def make_simulation():
+    """Entropic disk with a slight thickness for the 3D effect (no vertical force or motion)."""
+    return central_disk(N_STARS, R_MIN, R_MAX, ENTROPIC_LAW, M_CORE, G, DT, thickness=5.0, dim=3)
 
 # --- Rendering Logic ---
 
 def render_3d():
-    sim = GalacticSimulation(mode='Entropic')
+    sim = make_simulation()
     
     print(f"🚀 Iniciando 3D Cinematic Render ({STEPS} frames)...")
     
@@ -84,8 +42,7 @@ def render_3d():
     
     limits = 600
     
-    for i in range(STEPS):
-        pos = sim.step()
+    for i, (_, pos, _) in enumerate(sim.iter_steps(STEPS)):
         
         ax.clear()
         
@@ -1,8 +1,12 @@
 import matplotlib
 matplotlib.use('Agg') # Force non-interactive backend for speed
-import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from interpolation_laws import InterpolationLaw, NEWTON
+from particle_engine import central_disk
 
 # Configuração Estética "Sci-Fi"
 plt.style.use('dark_background')
@@ -22,87 +26,29 @@ R_MAX = 500.0
 A0 = 1.0e-3
 DT = 0.5
 STEPS = 400     # Duration of the clash
-
-class GalacticSimulation:
-    def __init__(self, mode='Newton'):
-        self.mode = mode
-        self.stars_pos = self._init_positions()
-        if mode == 'Newton_Fail':
-             # We want to start with Entropic velocities to show the crash, so we defer initialization or call specific one
-             self.stars_vel = None # Will assign below
-        else:
-             self.stars_vel = None
-
-        if self.mode == 'Newton_Fail':
-            # Initialize with Entropic (Fast) velocities to show it flying apart under Newton gravity
-            self.stars_vel = self._init_velocities_entropic()
-            self.true_mode_physics = 'Newton' 
-        else:
-            self.stars_vel = self._init_velocities_entropic() # Both start fast
-            self.true_mode_physics = 'Entropic'
-
-    def _init_positions(self):
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        return np.column_stack((x, y))
-
-    def _init_velocities_entropic(self):
-        """Calculate velocities required for a FLAT rotation curve (Entropic/Observed)."""
-        r = np.linalg.norm(self.stars_pos, axis=1)
-        
-        # Calculate Entropic Acceleration (which matches observation)
-        a_newton = G * M_CORE / (r**2)
-        a_entropic = 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        
-        v_mag = np.sqrt(a_entropic * r) # Fast velocities
-        
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        return np.column_stack((vx, vy))
-
-    def _calc_acceleration_magnitude(self, r):
-        a_newton = G * M_CORE / (r**2)
-        
-        if self.true_mode_physics == 'Newton':
-            return a_newton
-        elif self.true_mode_physics == 'Entropic':
-            return 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        else:
-            raise ValueError()
-
-    def get_forces(self, positions):
-        r_mag = np.linalg.norm(positions, axis=1)
-        r_mag = np.maximum(r_mag, 1e-5)
-        a_mag = self._calc_acceleration_magnitude(r_mag)
-        
-        # Vector pointing to center is -positions
-        acc_x = (-positions[:, 0] / r_mag) * a_mag
-        acc_y = (-positions[:, 1] / r_mag) * a_mag
-        return np.column_stack((acc_x, acc_y))
-
-    def step(self):
-        dt = DT
-        acc = self.get_forces(self.stars_pos)
-        
-        # Verlet
-        self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-        new_acc = self.get_forces(self.stars_pos)
-        self.stars_vel += 0.5 * (acc + new_acc) * dt
-        
-        return self.stars_pos
+MODE_LAWS = {'Newton': NEWTON, 'Entropic': InterpolationLaw('simple', A0)}
+
+def make_simulation(mode='Entropic'):
+    """
+    Disk started with the velocities of a flat (Entropic/Observed) rotation
+    curve. 'Newton_Fail' then evolves it under Newtonian gravity, so it flies
+    apart; 'Entropic' holds together.
+    """
+    physics = 'Newton' if mode == 'Newton_Fail' else mode
+    if physics not in MODE_LAWS:
+        raise ValueError(f"Unknown mode: {mode}")
+    return central_disk(N_STARS, R_MIN, R_MAX, MODE_LAWS[physics], M_CORE, G, DT,
+                        velocity_law=MODE_LAWS['Entropic'])
 
 # --- Rendering Logic ---
 
 def render_clash():
     # Initialize Simulations
     # 1. Newton Simulation initialized with Observation Velocities (Fast) -> Should fly apart
-    sim_newton = GalacticSimulation(mode='Newton_Fail')
+    sim_newton = make_simulation(mode='Newton_Fail')
     
     # 2. Entropic Simulation initialized with Observation Velocities (Fast) -> Should hold together
-    sim_entropic = GalacticSimulation(mode='Entropic')
+    sim_entropic = make_simulation(mode='Entropic')
 
     print(f"🚀 Iniciando Clash Render ({STEPS} frames)...")
     
@@ -111,10 +57,9 @@ def render_clash():
     # Static Setup
     limits = 800 # Zoom out a bit to see Newton expansion
     
-    for i in range(STEPS):
-        # Evolve physics
-        pos_n = sim_newton.step()
-        pos_e = sim_entropic.step()
+    # Evolve physics: both engines stream their live state in lockstep
+    frames = zip(sim_newton.iter_steps(STEPS), sim_entropic.iter_steps(STEPS))
+    for i, ((_, pos_n, _), (_, pos_e, _)) in enumerate(frames):
         
         # Draw
         for ax in axes:
@@ -4,6 +4,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from interpolation_laws import InterpolationLaw, NEWTON, newtonian_acceleration
+from particle_engine import central_disk
+from trajectory_store import TrajectoryStore
+from online_stats import RadialProfile
 
 # Configuração Estética "Sci-Fi"
 plt.style.use('dark_background')
@@ -12,6 +19,8 @@ plt.style.use('dark_background')
 OUTPUT_DIR = 'frames_dashboard'
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
+# Simulation history on disk (memory-mapped), read back frame by frame
+TRAJECTORY_DIR = 'trajectory_dashboard'
 
 # --- Simulation Logic (Same as before) ---
 
@@ -23,69 +32,29 @@ R_MAX = 500.0
 A0 = 1.0e-3
 DT = 0.5
 STEPS = 150
+PROFILE_BINS = 30
+MODE_LAWS = {'Newton': NEWTON, 'Entropic': InterpolationLaw('simple', A0)}
 
-class GalacticSimulation:
-    def __init__(self, mode='Entropic'):
-        self.mode = mode
-        self.stars_pos = self._init_positions()
-        self.stars_vel = self._init_velocities()
-        # History now stores (pos, vel) tuple
-        self.history = [] 
-
-    def _init_positions(self):
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        return np.column_stack((x, y))
-
-    def _init_velocities(self):
-        r = np.linalg.norm(self.stars_pos, axis=1)
-        a = self._calc_acceleration_magnitude(r)
-        v_mag = np.sqrt(a * r)
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        return np.column_stack((vx, vy))
-
-    def _calc_acceleration_magnitude(self, r):
-        a_newton = G * M_CORE / (r**2)
-        if self.mode == 'Newton':
-            return a_newton
-        elif self.mode == 'Entropic':
-            return 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        else:
-            raise ValueError()
-
-    def get_forces(self, positions):
-        r_vec = -positions
-        r_mag = np.linalg.norm(positions, axis=1)
-        r_mag = np.maximum(r_mag, 1e-5)
-        a_mag = self._calc_acceleration_magnitude(r_mag)
-        acc_x = (r_vec[:, 0] / r_mag) * a_mag
-        acc_y = (r_vec[:, 1] / r_mag) * a_mag
-        return np.column_stack((acc_x, acc_y))
-
-    def run(self):
-        dt = DT
-        acc = self.get_forces(self.stars_pos)
-        
-        print(f"[INFO] Running Simulation ({self.mode})...")
+def run_simulation(mode='Entropic', path=TRAJECTORY_DIR):
+    """Integrate the disk with the shared engine; returns the (pos, vel) history on disk."""
+    if mode not in MODE_LAWS:
+        raise ValueError(f"Unknown mode: {mode}")
+    sim = central_disk(N_STARS, R_MIN, R_MAX, MODE_LAWS[mode], M_CORE, G, DT)
+
+    print(f"[INFO] Running Simulation ({mode})...")
+    with TrajectoryStore(path, 'w', N_STARS) as history:
         for step in range(STEPS):
-            self.history.append((self.stars_pos.copy(), self.stars_vel.copy()))
-            
-            self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-            new_acc = self.get_forces(self.stars_pos)
-            self.stars_vel += 0.5 * (acc + new_acc) * dt
-            acc = new_acc
+            history.append(step, sim.time, positions=sim.store.positions,
+                           velocities=sim.store.velocities)
+            sim.step()
 
-        return self.history # List of tuples
+    return TrajectoryStore(path)
 
 # --- Dashboard Rendering Logic ---
 
 def render_dashboard(history, limits=600):
     """
-    history: List of (positions, velocities)
+    history: TrajectoryStore of positions and velocities
     """
     # Setup Figure with GridSpec (1 row, 2 cols, different widths)
     # Reduced DPI for speed (100 -> 60)
@@ -102,17 +71,20 @@ def render_dashboard(history, limits=600):
     r_grid = np.linspace(R_MIN, limits, 200)
     
     # Newton Analytical
-    a_n = G * M_CORE / r_grid**2
+    a_n = newtonian_acceleration(r_grid, M_CORE, G)
     v_n = np.sqrt(a_n * r_grid)
     
     # Entropic Analytical
-    a_e = 0.5 * (a_n + np.sqrt(a_n**2 + 4 * a_n * A0))
+    a_e = MODE_LAWS['Entropic'](a_n)
     v_e = np.sqrt(a_e * r_grid)
 
+    # Binned rotation curve, one bincount pass per frame
+    profile = RadialProfile(np.linspace(0, limits, PROFILE_BINS + 1))
+
     total_frames = len(history)
     print(f"🚀 Iniciando Dashboard Render ({total_frames} frames)...")
 
-    for i, (pos_step, vel_step) in enumerate(history):
+    for i, (pos_step, vel_step) in enumerate(history.iter_snapshots('positions', 'velocities')):
         # --- LEFT PANEL: GALAXY ---
         ax_sim.clear()
         
@@ -131,17 +103,20 @@ def render_dashboard(history, limits=600):
         # --- RIGHT PANEL: ROTATION CURVE ---
         ax_plot.clear()
         
-        # Calculate R and V for current particles
-        r = np.linalg.norm(pos_step, axis=1)
-        v = np.linalg.norm(vel_step, axis=1)
+        # Mean circular velocity per radial bin: this frame and averaged so far
+        profile.update(pos_step, vel_step)
+        live = profile.profile(time_average=False)
+        mean = profile.profile()
 
         # Plot Analytical Reference Lines
         ax_plot.plot(r_grid, v_n, color='gray', linestyle='--', alpha=0.5, label='Newtonian Prediction')
         ax_plot.plot(r_grid, v_e, color='cyan', linestyle='-', linewidth=2, alpha=0.8, label='Entropic Prediction')
         
-        # Plot Live Data
-        # We plot scatter of current status
-        ax_plot.scatter(r, v, s=3, c='white', alpha=0.6)
+        # Plot Live Data: <v_phi> with a +-sigma_phi band
+        ax_plot.fill_between(live['r'], live['v_circ'] - live['sigma_phi'],
+                             live['v_circ'] + live['sigma_phi'], color='white', alpha=0.2)
+        ax_plot.plot(live['r'], live['v_circ'], 'o-', ms=3, color='white', alpha=0.9)
+        ax_plot.plot(mean['r'], mean['v_circ'], color='yellow', linewidth=1, alpha=0.6)
         
         ax_plot.set_xlim(0, limits)
         ax_plot.set_ylim(0, np.max(v_e)*1.5)
@@ -164,8 +139,7 @@ def render_dashboard(history, limits=600):
 
 if __name__ == "__main__":
     # 1. Run Physics
-    sim = GalacticSimulation(mode='Entropic')
-    hist = sim.run()
+    hist = run_simulation(mode='Entropic')
     
     # 2. Render Dashboard
     render_dashboard(hist)
@@ -1,6 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from interpolation_laws import InterpolationLaw, NEWTON
+from particle_engine import central_disk
 
 # Configuração Estética "Sci-Fi"
 plt.style.use('dark_background')
@@ -20,64 +25,21 @@ R_MAX = 500.0
 A0 = 1.0e-3
 DT = 0.5        # Adjusted for smoother animation vs long waits
 STEPS = 600     # Sufficient for a 20s video at 30fps
+MODE_LAWS = {'Newton': NEWTON, 'Entropic': InterpolationLaw('simple', A0)}
 
-class GalacticSimulation:
-    def __init__(self, mode='Entropic'):
-        self.mode = mode
-        self.stars_pos = self._init_positions()
-        self.stars_vel = self._init_velocities()
-        self.position_history = [] 
-
-    def _init_positions(self):
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        return np.column_stack((x, y))
-
-    def _init_velocities(self):
-        r = np.linalg.norm(self.stars_pos, axis=1)
-        a = self._calc_acceleration_magnitude(r)
-        v_mag = np.sqrt(a * r)
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        return np.column_stack((vx, vy))
-
-    def _calc_acceleration_magnitude(self, r):
-        a_newton = G * M_CORE / (r**2)
-        if self.mode == 'Newton':
-            return a_newton
-        elif self.mode == 'Entropic':
-            # Entropic / MOND interpolation
-            return 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        else:
-            raise ValueError(f"Unknown mode: {self.mode}")
-
-    def get_forces(self, positions):
-        r_vec = -positions
-        r_mag = np.linalg.norm(positions, axis=1)
-        r_mag = np.maximum(r_mag, 1e-5)
-        a_mag = self._calc_acceleration_magnitude(r_mag)
-        acc_x = (r_vec[:, 0] / r_mag) * a_mag
-        acc_y = (r_vec[:, 1] / r_mag) * a_mag
-        return np.column_stack((acc_x, acc_y))
-
-    def run(self):
-        dt = DT
-        acc = self.get_forces(self.stars_pos)
-        
-        print(f"[INFO] Running Simulation ({self.mode})...")
-        for step in range(STEPS):
-            self.position_history.append(self.stars_pos.copy())
-            
-            # Verlet Integration
-            self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-            new_acc = self.get_forces(self.stars_pos)
-            self.stars_vel += 0.5 * (acc + new_acc) * dt
-            acc = new_acc
-
-        return np.array(self.position_history)
+def run_simulation(mode='Entropic'):
+    """Integrate the disk with the shared engine; returns the position history."""
+    if mode not in MODE_LAWS:
+        raise ValueError(f"Unknown mode: {mode}")
+    sim = central_disk(N_STARS, R_MIN, R_MAX, MODE_LAWS[mode], M_CORE, G, DT)
+    history = np.empty((STEPS, N_STARS, 2))
+
+    print(f"[INFO] Running Simulation ({mode})...")
+    for step in range(STEPS):
+        history[step] = sim.store.positions
+        sim.step()
+
+    return history
 
 # --- Rendering Logic ---
 
@@ -130,8 +92,7 @@ def render_simulation(positions, limits=600):
 
 if __name__ == "__main__":
     # 1. Run Physics
-    sim = GalacticSimulation(mode='Entropic')
-    history = sim.run()
+    history = run_simulation(mode='Entropic')
     
     # 2. Render Video Frames
     render_simulation(history)
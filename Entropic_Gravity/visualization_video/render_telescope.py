@@ -1,8 +1,12 @@
 import matplotlib
 matplotlib.use('Agg')
-import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from interpolation_laws import InterpolationLaw
+from particle_engine import central_disk
 
 # Configuração Estética "Radio Telescope"
 plt.style.use('dark_background')
@@ -20,56 +24,16 @@ R_MAX = 500.0
 A0 = 1.0e-3
 DT = 0.5
 STEPS = 300
+ENTROPIC_LAW = InterpolationLaw('simple', A0)
 
-class GalacticSimulation:
-    def __init__(self, mode='Entropic'):
-        self.mode = mode
-        self.stars_pos = self._init_positions()
-        self.stars_vel = self._init_velocities()
-
-    def _init_positions(self):
-        theta = np.random.uniform(0, 2*np.pi, N_STARS)
-        # Higher density in center typically, but uniform disk is fine
-        u = np.random.uniform(R_MIN**2, R_MAX**2, N_STARS)
-        r = np.sqrt(u)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        return np.column_stack((x, y))
-
-    def _init_velocities(self):
-        r = np.linalg.norm(self.stars_pos, axis=1)
-        a_newton = G * M_CORE / (r**2)
-        # Entropic Calculation
-        a_entropic = 0.5 * (a_newton + np.sqrt(a_newton**2 + 4 * a_newton * A0))
-        v_mag = np.sqrt(a_entropic * r)
-        
-        vx = -self.stars_pos[:, 1] / r * v_mag
-        vy =  self.stars_pos[:, 0] / r * v_mag
-        return np.column_stack((vx, vy))
-
-    def get_forces(self, positions):
-        r_mag = np.linalg.norm(positions, axis=1)
-        r_mag = np.maximum(r_mag, 1e-5)
-        # Entropic acceleration magnitude
-        a_n = G * M_CORE / (r_mag**2)
-        a_mag = 0.5 * (a_n + np.sqrt(a_n**2 + 4 * a_n * A0))
-        
-        acc_x = (-positions[:, 0] / r_mag) * a_mag
-        acc_y = (-positions[:, 1] / r_mag) * a_mag
-        return np.column_stack((acc_x, acc_y))
-
-    def step(self):
-        dt = DT
-        acc = self.get_forces(self.stars_pos)
-        self.stars_pos += self.stars_vel * dt + 0.5 * acc * dt**2
-        new_acc = self.get_forces(self.stars_pos)
-        self.stars_vel += 0.5 * (acc + new_acc) * dt
-        return self.stars_pos
+def make_simulation():
+    """Entropic disk on circular orbits, integrated by the shared engine."""
+    return central_disk(N_STARS, R_MIN, R_MAX, ENTROPIC_LAW, M_CORE, G, DT)
 
 # --- Rendering Logic (Heatmap/Density) ---
 
 def render_telescope():
-    sim = GalacticSimulation(mode='Entropic')
+    sim = make_simulation()
     
     print(f"🚀 Iniciando Telescope Render ({STEPS} frames)...")
     
@@ -78,8 +42,7 @@ def render_telescope():
     
     limits = 600
     
-    for i in range(STEPS):
-        pos = sim.step()
+    for i, (_, pos, _) in enumerate(sim.iter_steps(STEPS)):
         
         ax.clear()
         